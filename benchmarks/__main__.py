@@ -0,0 +1,101 @@
+"""
+Offline benchmark suite.
+
+    python -m benchmarks run [--only simulation,storage] [--output results.json]
+    python -m benchmarks run --compare baseline.json [--threshold 0.1]
+    python -m benchmarks compare baseline.json results.json [--threshold 0.1]
+
+Results are written as JSON ({"meta": ..., "results": {name: {...}}}).
+Compare exits with status 1 when any benchmark regressed by more than the
+threshold (relative change in the unfavourable direction).
+"""
+from __future__ import annotations
+from datetime import datetime
+from typing import List
+import contextlib
+import argparse
+import platform
+import json
+import sys
+
+from benchmarks.harness import registered_groups, results_to_json, compare
+# importing the modules registers their benchmark groups
+from benchmarks import simulation, features, inference, storage  # noqa: F401
+
+
+def run(only: List[str] | None) -> dict:
+    groups = registered_groups()
+    selected = only or list(groups)
+    unknown = set(selected) - set(groups)
+    if unknown:
+        raise ValueError(f"unknown benchmark groups: {sorted(unknown)}, available: {sorted(groups)}")
+
+    results = []
+    # repositories print progress messages, keep stdout clean for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        for group in selected:
+            print(f'running {group}...')
+            results.extend(groups[group]())
+
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'groups': selected
+        },
+        'results': results_to_json(results)
+    }
+
+
+def report_comparison(baseline: dict, current: dict, threshold: float) -> int:
+    rows = compare(baseline['results'], current['results'], threshold)
+    for row in rows:
+        flag = 'REGRESSION' if row['regression'] else 'ok'
+        print(f"{row['name']:<60} {row['baseline']:>14.2f} -> {row['current']:>14.2f} {row['unit']:<8} {row['change']:>+8.1%}  {flag}", file=sys.stderr)
+
+    regressions = [row for row in rows if row['regression']]
+    print(f'{len(regressions)} regression(s) out of {len(rows)} benchmark(s)', file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def load_json(path: str) -> dict:
+    with open(path, 'r', encoding='utf-8') as json_file:
+        return json.load(json_file)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='run benchmarks and emit JSON')
+    run_parser.add_argument('--only', help='comma separated benchmark groups')
+    run_parser.add_argument('--output', help='write JSON here instead of stdout')
+    run_parser.add_argument('--compare', help='baseline JSON to compare against')
+    run_parser.add_argument('--threshold', type=float, default=0.1)
+
+    compare_parser = subparsers.add_parser('compare', help='compare two JSON result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        return report_comparison(load_json(args.baseline), load_json(args.current), args.threshold)
+
+    report = run(args.only.split(',') if args.only else None)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as json_file:
+            json.dump(report, json_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        return report_comparison(load_json(args.compare), report, args.threshold)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
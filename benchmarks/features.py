@@ -0,0 +1,54 @@
+from __future__ import annotations
+from typing import List
+
+from benchmarks.harness import BenchmarkResult, benchmark, median_seconds, latency
+
+from duel_game.core.helpers import compute_imminent_attack_likely, estimate_attack_likelihood
+from duel_game.core.essential_types import Action
+from duel_game.dataset.data_processor import Tracker
+from duel_game.dataset.generation import play_seeded_match
+
+SEED = 20240602
+GAMES = 30
+MAX_TURNS = 50
+REPEATS = 5
+THREAT_CALLS = 20000
+
+
+@benchmark('features')
+def bench_feature_extraction() -> List[BenchmarkResult]:
+    """
+    Tracker.record cost per sample, compute_imminent_attack_likely cost per call
+    (a memoized lookup after the first call of a turn) and the uncached estimate
+    """
+    # record real game states once, then replay them into fresh trackers
+    played = [play_seeded_match('Balanced', 'Aggressive', MAX_TURNS, SEED, game_index) for game_index in range(GAMES)]
+    sample_count = sum(len(tracker.records) for tracker in played)
+
+    def record_all():
+        for source in played:
+            tracker = Tracker(source.game_ref)
+            for game_state in source.records:
+                tracker.record(game_state)
+
+    record_seconds = median_seconds(record_all, REPEATS)
+
+    player = played[0].game_ref.player_1
+
+    def threat_calls():
+        for _ in range(THREAT_CALLS):
+            compute_imminent_attack_likely(player, 5)
+
+    threat_seconds = median_seconds(threat_calls, REPEATS)
+
+    def estimate_calls():
+        for _ in range(THREAT_CALLS):
+            estimate_attack_likelihood(2, 5, 80, 60, 40, False, Action.ATTACK)
+
+    estimate_seconds = median_seconds(estimate_calls, REPEATS)
+
+    return [
+        latency('features.tracker_record', sample_count, record_seconds, REPEATS),
+        latency('features.compute_imminent_attack_likely', THREAT_CALLS, threat_seconds, REPEATS),
+        latency('features.estimate_attack_likelihood', THREAT_CALLS, estimate_seconds, REPEATS),
+    ]
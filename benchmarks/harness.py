@@ -0,0 +1,95 @@
+from __future__ import annotations
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Any
+from pathlib import Path
+import statistics
+import time
+import sys
+
+# benchmarks run from a source checkout, the same way the notebooks do
+SRC_PATH = Path(__file__).resolve().parents[1] / 'src'
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+    repeats: int
+
+
+# name -> function returning a list of results
+_REGISTRY: Dict[str, Callable[[], List[BenchmarkResult]]] = {}
+
+
+def benchmark(group: str):
+    """Register a benchmark group. The decorated function returns a list of BenchmarkResult."""
+    def decorator(func):
+        _REGISTRY[group] = func
+        return func
+    return decorator
+
+
+def registered_groups() -> Dict[str, Callable[[], List[BenchmarkResult]]]:
+    return dict(_REGISTRY)
+
+
+def median_seconds(func: Callable[[], Any], repeats: int = 5, setup: Callable[[], Any] | None = None) -> float:
+    """
+    Run `func` `repeats` times and return the median wall time in seconds.
+    `setup` runs before every repetition and is not timed.
+    """
+    timings = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    return statistics.median(timings)
+
+
+def rate(name: str, count: int, seconds: float, unit: str, repeats: int) -> BenchmarkResult:
+    """Throughput result (count per second)"""
+    return BenchmarkResult(name, count / seconds if seconds > 0 else float('inf'), unit, True, repeats)
+
+
+def latency(name: str, count: int, seconds: float, repeats: int) -> BenchmarkResult:
+    """Latency result in microseconds per operation"""
+    return BenchmarkResult(name, seconds / count * 1e6, 'us/op', False, repeats)
+
+
+def results_to_json(results: List[BenchmarkResult]) -> Dict[str, Dict[str, Any]]:
+    return {result.name: asdict(result) for result in results}
+
+
+def compare(baseline: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compare two result sets and return one row per benchmark present in both.
+    A row is a regression when the metric got worse by more than `threshold` (relative).
+    """
+    rows = []
+    for name in sorted(set(baseline) & set(current)):
+        old, new = baseline[name]['value'], current[name]['value']
+        higher_is_better = current[name]['higher_is_better']
+
+        if old == 0:
+            change = 0.0
+        else:
+            change = (new - old) / old
+
+        worse_by = -change if higher_is_better else change
+        rows.append({
+            'name': name,
+            'baseline': old,
+            'current': new,
+            'unit': current[name]['unit'],
+            'change': change,
+            'regression': worse_by > threshold
+        })
+
+    return rows
@@ -0,0 +1,49 @@
+from __future__ import annotations
+from typing import List
+import json
+
+from benchmarks.harness import BenchmarkResult, benchmark, median_seconds, latency
+
+from duel_game.core.helpers import get_base_path
+from duel_game.core.ml_model import ShadowScorer, TrainedModel
+from duel_game.dataset.feature_schema import model_from_artifact
+from duel_game.dataset.generation import play_seeded_match
+
+SEED = 20240603
+GAMES = 20
+MAX_TURNS = 50
+REPEATS = 5
+SHADOW_MODELS = 3
+
+
+def load_default_model() -> TrainedModel:
+    with open(get_base_path() / 'default_model.json', 'r', encoding='utf-8') as json_file:
+        return model_from_artifact(json.load(json_file))
+
+
+@benchmark('inference')
+def bench_predict() -> List[BenchmarkResult]:
+    """TrainedModel.predict latency over realistic feature vectors"""
+    model = load_default_model()
+    inputs = [
+        sample.features
+        for game_index in range(GAMES)
+        for sample in play_seeded_match('Opportunist', 'Healer', MAX_TURNS, SEED, game_index).get_samples()
+    ]
+
+    def predict_all():
+        for features in inputs:
+            model.predict(features)
+
+    shadow = ShadowScorer([TrainedModel(model.weights) for _ in range(SHADOW_MODELS)], keep_records=False)
+
+    def predict_all_shadowed():
+        for turn, features in enumerate(inputs):
+            shadow.predict(model, features, turn)
+
+    seconds = median_seconds(predict_all, REPEATS)
+    shadowed_seconds = median_seconds(predict_all_shadowed, REPEATS)
+    return [
+        latency('inference.trained_model_predict', len(inputs), seconds, REPEATS),
+        latency(f'inference.shadow_predict_{SHADOW_MODELS}_shadows', len(inputs), shadowed_seconds, REPEATS),
+    ]
@@ -0,0 +1,56 @@
+from __future__ import annotations
+from typing import List
+import io
+import random
+
+from benchmarks.harness import BenchmarkResult, benchmark, median_seconds, rate
+
+from duel_game.core.helpers import get_base_path
+from duel_game.core.input_source import PolicyInput, ScriptedInput, feasible_actions
+from duel_game.dataset.generation import ARCHETYPE_ORDER, play_seeded_match
+from duel_game.main import play_sessions
+from duel_game.ml_model.model_provider import ArtifactModelProvider
+
+SEED = 20240601
+GAMES_PER_PAIRING = 20
+MAX_TURNS = 50
+REPEATS = 3
+INTERACTIVE_SESSIONS = 50
+
+
+@benchmark('simulation')
+def bench_play_game() -> List[BenchmarkResult]:
+    """Headless DuelGame.play_game turns per second for every archetype pairing"""
+    results = []
+
+    for policy_name in ARCHETYPE_ORDER:
+        for opponent_name in ARCHETYPE_ORDER:
+            turns = 0
+
+            def play_games():
+                nonlocal turns
+                turns = 0
+                for game_index in range(GAMES_PER_PAIRING):
+                    tracker = play_seeded_match(policy_name, opponent_name, MAX_TURNS, SEED, game_index)
+                    turns += len(tracker.records)
+
+            seconds = median_seconds(play_games, REPEATS)
+            results.append(rate(f'simulation.turns_per_sec[{policy_name}-vs-{opponent_name}]', turns, seconds, 'turns/s', REPEATS))
+
+    return results
+
+
+@benchmark('interactive')
+def bench_interactive_sessions() -> List[BenchmarkResult]:
+    """Scripted interactive sessions (menu, language switch, one game, exit) through Presenter per second"""
+    model_provider = ArtifactModelProvider(str(get_base_path() / 'default_model.json'))
+
+    def play_sessions_scripted():
+        rng = random.Random(SEED)
+        for _ in range(INTERACTIVE_SESSIONS):
+            menus = ScriptedInput(['3', '2', '1', '4'])
+            player_input = PolicyInput(lambda state: rng.choice(feasible_actions(state)), menus)
+            play_sessions(model_provider, player_input, io.StringIO(), delays=False)
+
+    seconds = median_seconds(play_sessions_scripted, REPEATS)
+    return [rate('interactive.sessions_per_sec', INTERACTIVE_SESSIONS, seconds, 'sessions/s', REPEATS)]
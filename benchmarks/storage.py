@@ -0,0 +1,93 @@
+from __future__ import annotations
+from typing import List
+from pathlib import Path
+import tempfile
+
+from benchmarks.harness import BenchmarkResult, benchmark, median_seconds, rate, latency
+from benchmarks.inference import load_default_model
+
+from duel_game.dataset.dataset_repo import DatasetRepository
+from duel_game.dataset.generation import play_seeded_match
+from duel_game.ml_model.model_repo import ModelRepository
+
+SEED = 20240604
+GAMES = 100
+MAX_TURNS = 50
+REPEATS = 3
+GET_MODEL_CALLS = 200
+
+
+def _games():
+    return [
+        play_seeded_match('Defensive', 'RandomBiased', MAX_TURNS, SEED, game_index).get_samples()
+        for game_index in range(GAMES)
+    ]
+
+
+@benchmark('storage')
+def bench_storage() -> List[BenchmarkResult]:
+    """
+    DatasetRepository write/read rows per second (one batch, and one store per
+    game in default and high throughput mode), archived vs live streaming
+    reads and archive compression, and ModelRepository.get_model latency
+    """
+    games = _games()
+    samples = [sample for game in games for sample in game]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / 'bench.db'
+        repo = DatasetRepository(str(db_path))
+        template_id = repo.create_config_template('{"benchmark": true}', 1, 'benchmark')
+        run_ids = []
+
+        def new_run():
+            run_ids.append(repo.create_run(template_id, 'benchmark', seed=SEED))
+
+        # one store (and commit) per finished game, as generation and human capture do
+        def store_games(target_repo, run_id):
+            for game in games:
+                target_repo.store_samples(game, run_id)
+            target_repo.flush()
+
+        per_game_seconds = median_seconds(lambda: store_games(repo, run_ids[-1]), REPEATS, setup=new_run)
+        store_seconds = median_seconds(lambda: repo.store_samples(samples, run_ids[-1]), REPEATS, setup=new_run)
+        read_seconds = median_seconds(lambda: repo.get_run_samples(run_ids[-1]), REPEATS)
+
+        # streaming reads of the same run, live and archived
+        def read_batches():
+            for _ in repo.iter_run_batches(run_ids[-1]):
+                pass
+
+        live_batches_seconds = median_seconds(read_batches, REPEATS)
+        archive_report = repo.archive_run(run_ids[-1])
+        archived_batches_seconds = median_seconds(read_batches, REPEATS)
+        repo.close()
+
+        wal_repo = DatasetRepository(str(Path(tmp_dir) / 'bench_wal.db'), high_throughput=True)
+        wal_template_id = wal_repo.create_config_template('{"benchmark": "wal"}', 1, 'benchmark')
+        wal_run_ids = []
+        wal_store_seconds = median_seconds(
+            lambda: store_games(wal_repo, wal_run_ids[-1]), REPEATS,
+            setup=lambda: wal_run_ids.append(wal_repo.create_run(wal_template_id, 'benchmark', seed=SEED))
+        )
+        wal_repo.close()
+
+        model_repo = ModelRepository(str(db_path))
+        model_id = model_repo.save_model(run_ids[-1], load_default_model().weights, 0.0)
+
+        def get_models():
+            for _ in range(GET_MODEL_CALLS):
+                model_repo.get_model(model_id)
+
+        get_model_seconds = median_seconds(get_models, REPEATS)
+
+    return [
+        rate('storage.store_samples', len(samples), store_seconds, 'rows/s', REPEATS),
+        rate('storage.store_samples_per_game', len(samples), per_game_seconds, 'rows/s', REPEATS),
+        rate('storage.store_samples_high_throughput', len(samples), wal_store_seconds, 'rows/s', REPEATS),
+        rate('storage.get_run_samples', len(samples), read_seconds, 'rows/s', REPEATS),
+        rate('storage.iter_run_batches_live', len(samples), live_batches_seconds, 'rows/s', REPEATS),
+        rate('storage.iter_run_batches_archived', len(samples), archived_batches_seconds, 'rows/s', REPEATS),
+        BenchmarkResult('storage.archive_compression_ratio', archive_report['compression_ratio'], 'x', True, 1),
+        latency('storage.model_repository_get_model', GET_MODEL_CALLS, get_model_seconds, REPEATS),
+    ]
@@ -2,6 +2,8 @@ from duel_game.core.player import Player
 from duel_game.dataset.data_processor import Tracker
 from duel_game.core.essential_types import Action, GameState
 from duel_game.core.presenter import Presenter
+from duel_game.core import instrumentation
+from time import perf_counter
 from enum import Enum
 import random
 import math
@@ -15,14 +17,17 @@ class DuelGame:
     dodge_probability = 0.5
 
     # rng -> Random Number Generator
-    def __init__(self, player_1: Player, player_2: Player, max_turns: int = math.inf, rng=random.Random(), headless=True, presenter: Presenter=None) -> None:
+    # dodge_rng -> stream used only for resolving dodges (falls back to rng)
+    def __init__(self, player_1: Player, player_2: Player, max_turns: int = math.inf, rng: random.Random|None = None, headless=True, presenter: Presenter=None, dodge_rng: random.Random|None = None) -> None:
         self.player_1, self.player_2 = player_1, player_2
         self.winner = None
         self.records = []
         self.turn = 0
         self.max_turns = max_turns
-        self.rng = rng
+        self.rng = rng if rng is not None else random.Random()
+        self.dodge_rng = dodge_rng if dodge_rng is not None else self.rng
         self.tracker:Tracker
+        self.recorder = None
         self.headless = headless
         if not headless:
             self.presenter = presenter
@@ -30,6 +35,20 @@ class DuelGame:
     def set_tracker(self, tracker: Tracker):
         self.tracker = tracker
 
+    # recorder -> receives on_turn(player_1_action, player_2_action, dodge_works) and on_game_end(game),
+    # e.g. duel_game.core.replay.MatchRecorder
+    def set_recorder(self, recorder):
+        self.recorder = recorder
+
+    def _after_resolution_notification(self, player_1_action: Action, player_2_action: Action, player_1_detail, player_2_detail):
+        if self.recorder is None:
+            return
+
+        # at most one player dodges an attack in a turn
+        dodge_works = player_1_detail["is_dodge_works"] if player_1_detail["is_dodge_works"] is not None \
+            else player_2_detail["is_dodge_works"]
+        self.recorder.on_turn(player_1_action, player_2_action, dodge_works)
+
     def _after_decisions_notification(self):
         if not self.tracker:
             return
@@ -57,18 +76,36 @@ class DuelGame:
                 if whether_game_ends:
                     break
 
+        if self.recorder is not None:
+            self.recorder.on_game_end(self)
+
     def _play_turn(self):
+        probe = instrumentation.active
         if self.headless:
             self.turn += 1
             self._update_player_state_before_turn(self.player_1)
             self._update_player_state_before_turn(self.player_2)
 
+            if probe is not None:
+                started = perf_counter()
             player_1_action = self.player_1.action_in_turn = self.player_1.choose_action()
+            if probe is not None:
+                probe.observe('choose_action', instrumentation.player_label(self.player_1), perf_counter() - started)
+                started = perf_counter()
             player_2_action = self.player_2.action_in_turn = self.player_2.choose_action()
+            if probe is not None:
+                probe.observe('choose_action', instrumentation.player_label(self.player_2), perf_counter() - started)
+
             self._after_decisions_notification()
 
-            self._update_player_state_based_on_actions(self.player_1, player_1_action, player_2_action)
-            self._update_player_state_based_on_actions(self.player_2, player_2_action, player_1_action)
+            if probe is not None:
+                started = perf_counter()
+            player_1_detail = self._update_player_state_based_on_actions(self.player_1, player_1_action, player_2_action)
+            player_2_detail = self._update_player_state_based_on_actions(self.player_2, player_2_action, player_1_action)
+            if probe is not None:
+                probe.observe('state_resolution', 'headless', perf_counter() - started)
+
+            self._after_resolution_notification(player_1_action, player_2_action, player_1_detail, player_2_detail)
 
         else:
             self.turn += 1
@@ -85,12 +122,22 @@ class DuelGame:
             self.player_1.action_in_turn = player_1_action
             self.presenter.after_player_decision(player_1_action)
 
+            if probe is not None:
+                started = perf_counter()
             player_2_action = self.player_2.action_in_turn = self.player_2.choose_action()
+            if probe is not None:
+                probe.observe('choose_action', instrumentation.player_label(self.player_2), perf_counter() - started)
 
             self._after_decisions_notification()
 
+            if probe is not None:
+                started = perf_counter()
             player_result_detail = self._update_player_state_based_on_actions(self.player_1, player_1_action, player_2_action)
             opponent_result_detail = self._update_player_state_based_on_actions(self.player_2, player_2_action, player_1_action)
+            if probe is not None:
+                probe.observe('state_resolution', 'interactive', perf_counter() - started)
+
+            self._after_resolution_notification(player_1_action, player_2_action, player_result_detail, opponent_result_detail)
             
             self.presenter.after_decisions(player_1_action, player_2_action, player_result_detail, opponent_result_detail)
 
@@ -130,7 +177,7 @@ class DuelGame:
                 player.is_shield_available = False
                 player.shield_cd = self.sheild_spawn_duration
             elif player_action == Action.DODGE:
-                is_dodge_works = random.random() > self.dodge_probability
+                is_dodge_works = self.dodge_rng.random() > self.dodge_probability
                 if not is_dodge_works:
                     player.health = max(0, player.health - self.attack_damage)    
             else:
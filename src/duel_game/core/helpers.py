@@ -58,24 +58,24 @@ def break_down_probability(prob_dict: Dict[Enum, float], target_value: Enum, rem
 def compute_imminent_attack_likely(player: DummyPlayer, history_length):
         """
         Returns a float in [0, 1] representing likelihood of an incoming attack.
+
+        The value is memoized by the game's tracker per (turn, perspective, history_length)
+        so every consumer in the same turn shares one evaluation.
         """
-        
-        opponent_actions_history = player.get_opponent_recent_actions(history_length)
-        opponent_stamina = player.opponent.stamina
-        opponent_hp = player.opponent.health
-        your_hp = player.health
-        your_shield_available = player.is_shield_available
-        opponent_last_action = player.opponent.action_in_turn
+        return player.game.tracker.attack_likelihood(player, history_length)
 
 
+def estimate_attack_likelihood(opponent_attack_count: int, history_length, opponent_stamina: int, opponent_hp: int,
+                               your_hp: int, your_shield_available: bool, opponent_last_action: Action|None) -> float:
+        """
+        Returns a float in [0, 1] representing likelihood of an incoming attack,
+        given how many of the opponent's last `history_length` actions were attacks.
+        """
+
         # -----------------------------
         # 1. Behavioral Threat (history-based)
         # -----------------------------
-        attack_count = sum(
-            1 for a in opponent_actions_history
-            if a == Action.ATTACK
-        )
-        behavioral_threat = attack_count / history_length
+        behavioral_threat = opponent_attack_count / history_length
 
         # -----------------------------
         # 2. Capability Score (HARD CONSTRAINT)
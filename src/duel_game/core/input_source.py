@@ -0,0 +1,112 @@
+"""
+Input sources for the interactive Presenter.
+
+Presenter asks its input source for every line a human would type. Each
+prompt has a kind: 'menu' (main menu choice), 'language' (language
+selection), 'action' (the player's action, with the GameState) or
+'continue' (press Enter). Sources other than the console let the
+interactive path run unattended and at full speed:
+
+    output = io.StringIO()
+    presenter = Presenter('en', ScriptedInput.from_file('session.txt'), output, delays=False)
+
+A decision file has one answer per line, exactly as typed; lines starting
+with '#' are comments. RecordingInput writes the answers of any source (a
+human at the console included) in that format, so recorded sessions can be
+replayed with ScriptedInput.
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO
+
+from duel_game.core.essential_types import Action, GameState
+
+class ScriptExhausted(EOFError):
+    """A scripted source was asked for more lines than it holds"""
+
+
+class InputSource(ABC):
+    # interactive sources show the prompt and the typed answer themselves,
+    # for the others Presenter writes both to its output as a transcript
+    interactive = False
+
+    @abstractmethod
+    def read_line(self, prompt: str, kind: str, game_state: Optional[GameState] = None) -> str:
+        """The answer to `prompt`, without the trailing newline"""
+        pass
+
+
+class ConsoleInput(InputSource):
+    interactive = True
+
+    def read_line(self, prompt: str, kind: str, game_state: Optional[GameState] = None) -> str:
+        return input(prompt)
+
+
+class ScriptedInput(InputSource):
+    def __init__(self, lines: Iterable[str]):
+        self._lines: Iterator[str] = iter(lines)
+        self.lines_read = 0
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ScriptedInput':
+        with open(path, 'r', encoding='utf-8') as script_file:
+            lines = [line.rstrip('\n') for line in script_file if not line.startswith('#')]
+        return cls(lines)
+
+    def read_line(self, prompt: str, kind: str, game_state: Optional[GameState] = None) -> str:
+        try:
+            line = next(self._lines)
+        except StopIteration:
+            raise ScriptExhausted(f"Script ended after {self.lines_read} lines, at a {kind!r} prompt") from None
+        self.lines_read += 1
+        return line
+
+
+class PolicyInput(InputSource):
+    """
+    Chooses actions with `choose_action(game_state)`, presses Enter at every
+    'continue' prompt and answers the menus from `fallback` (e.g. a
+    ScriptedInput holding the menu navigation).
+    """
+
+    def __init__(self, choose_action: Callable[[GameState], Action], fallback: Optional[InputSource] = None):
+        self.choose_action = choose_action
+        self.fallback = fallback
+
+    def read_line(self, prompt: str, kind: str, game_state: Optional[GameState] = None) -> str:
+        if kind == 'action':
+            return str(int(self.choose_action(game_state)))
+        if kind == 'continue':
+            return ''
+        if self.fallback is None:
+            raise ScriptExhausted(f"PolicyInput has no fallback to answer a {kind!r} prompt")
+        return self.fallback.read_line(prompt, kind, game_state)
+
+
+class RecordingInput(InputSource):
+    """Passes the answers of `source` through and appends each one to `record` as a decision file line"""
+
+    def __init__(self, source: InputSource, record: TextIO):
+        self.source = source
+        self.record = record
+        self.interactive = source.interactive
+
+    def read_line(self, prompt: str, kind: str, game_state: Optional[GameState] = None) -> str:
+        line = self.source.read_line(prompt, kind, game_state)
+        self.record.write(line + '\n')
+        self.record.flush()
+        return line
+
+
+def feasible_actions(game_state: GameState) -> List[Action]:
+    """Actions the Presenter accepts from player 1 in `game_state`"""
+    player = game_state.player_1
+    actions = [Action.DODGE, Action.NONE]
+    if player.stamina >= Action.ATTACK.stamina_cost():
+        actions.append(Action.ATTACK)
+    if player.is_shield_available:
+        actions.append(Action.DEFENSE)
+    if player.stamina >= Action.HEAL.stamina_cost() and player.health < 100:
+        actions.append(Action.HEAL)
+    return sorted(actions)
@@ -0,0 +1,138 @@
+"""
+Optional hot-path instrumentation.
+
+Instrumented code reads the module level `active` probe and only takes
+timings when it is not None, so the disabled cost is a single null check:
+
+    probe = instrumentation.active
+    if probe is not None:
+        started = perf_counter()
+    ...
+    if probe is not None:
+        probe.observe('tracker_record', '', perf_counter() - started)
+"""
+from __future__ import annotations
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Tuple, Sequence, Any
+
+# upper bounds in seconds, from 1us to 100ms
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    1e-6, 2e-6, 5e-6,
+    1e-5, 2e-5, 5e-5,
+    1e-4, 2e-4, 5e-4,
+    1e-3, 2e-3, 5e-3,
+    1e-2, 2e-2, 5e-2,
+    1e-1
+)
+
+METRIC_PREFIX = 'duel_game'
+
+# label name used for each metric in the Prometheus export
+METRIC_LABELS = {
+    'choose_action': 'player',
+    'tracker_record': 'stage',
+    'model_predict': 'model',
+    'state_resolution': 'mode',
+}
+
+
+class Histogram:
+    """Fixed-bucket latency histogram, the last count is the +Inf bucket"""
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'buckets': dict(zip([*map(str, self.bounds), '+Inf'], self.counts)),
+            'sum': self.total,
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0
+        }
+
+
+class Instrumentation:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # (metric, label value) -> histogram
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+
+    def observe(self, metric: str, label: str, seconds: float):
+        histogram = self.histograms.get((metric, label))
+        if histogram is None:
+            histogram = self.histograms[(metric, label)] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def reset(self):
+        self.histograms.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Return {metric: {label: histogram dict}}"""
+        snapshot: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (metric, label), histogram in sorted(self.histograms.items()):
+            snapshot.setdefault(metric, {})[label] = histogram.to_dict()
+        return snapshot
+
+    def to_prometheus(self) -> str:
+        """Render all histograms in the Prometheus text exposition format"""
+        lines = []
+        current_metric = None
+
+        for (metric, label), histogram in sorted(self.histograms.items()):
+            name = f'{METRIC_PREFIX}_{metric}_seconds'
+            if metric != current_metric:
+                lines.append(f'# TYPE {name} histogram')
+                current_metric = metric
+
+            label_name = METRIC_LABELS.get(metric, 'label')
+            label_pair = f'{label_name}="{label}"' if label else ''
+            separator = ',' if label_pair else ''
+
+            cumulative = 0
+            for bound, count in zip([*map(repr, histogram.bounds), '+Inf'], histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{label_pair}{separator}le="{bound}"}} {cumulative}')
+
+            braces = f'{{{label_pair}}}' if label_pair else ''
+            lines.append(f'{name}_sum{braces} {histogram.total!r}')
+            lines.append(f'{name}_count{braces} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, file_path: str | Path):
+        """Write the Prometheus text file atomically (for the node exporter textfile collector)"""
+        file_path = Path(file_path)
+        tmp_path = file_path.with_suffix(file_path.suffix + '.tmp')
+        tmp_path.write_text(self.to_prometheus(), encoding='utf-8')
+        tmp_path.replace(file_path)
+
+
+# the probe used by instrumented code, None when instrumentation is disabled
+active: Instrumentation | None = None
+
+
+def enable(instrumentation: Instrumentation | None = None) -> Instrumentation:
+    global active
+    active = instrumentation if instrumentation is not None else Instrumentation()
+    return active
+
+
+def disable() -> Instrumentation | None:
+    """Stop collecting and return the probe that was active"""
+    global active
+    previous, active = active, None
+    return previous
+
+
+def player_label(player) -> str:
+    return getattr(player, 'archtype', None) or type(player).__name__
@@ -0,0 +1,387 @@
+"""
+Presenter message catalog.
+
+Every text the interactive Presenter shows, per language ('en', 'fa'),
+looked up instead of branching on the language at every call. The turn
+narration is keyed by (player action, AI action, dodge worked), where dodge
+worked is None unless one side dodged an attack. The texts that never
+change (the help page, the narration of every outcome with its action
+summary) are assembled once at import, in CATALOGS, so a Presenter only
+formats the numbers of the turn.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from duel_game.core.essential_types import Action
+
+LANGUAGES = ('en', 'fa')
+
+MESSAGES: Dict[str, Dict[str, str]] = {
+    'en': {
+        'intro': 'Welcome to Duel Game',
+        'main_menu': 'MAIN MENU',
+        'main_menu_options': '1. Play New Game\n2. How to Play\n3. Change Language\n4. Exit',
+        'menu_prompt': 'what is your choice?\t',
+        'invalid_choice': 'Invalid Choice',
+        'language_selection': 'LANGUAGE SELECTION',
+        'language_prompt': 'Select your language:\t',
+        'invalid_language': 'Invalid choice\nPlease enter 1 for English or 2 for Persian',
+        'language_set': 'Language set to English',
+        'help_prompt': '\nPress Enter to return to the main menu...',
+        'game_starts': 'so Get Ready, DUEL is About to Begin...',
+
+        'turn': 'Turn {turn}',
+        'players': '{:<17} {:<20}'.format('You', 'AI'),
+        'health': 'Health',
+        'stamina': 'Stamina',
+        'has_shield': 'Has Shield',
+        'yes': 'Yes',
+        'no': 'No',
+        'actions': 'Actions:',
+        'attack_option': '1. Attack ',
+        'defense_option': '2. Defense ',
+        'dodge_option': '3. Dodge',
+        'heal_option': '4. Heal ',
+        'none_option': '5. Do Nothing!',
+        'option_not_feasible': '(not Feasible because {reason})',
+        'low_stamina': 'Stamina < {cost}',
+        'shield_cooldown': 'Shield not Available, {turns} Turns Remained',
+        'health_full': 'Health is full',
+        'action_prompt': 'What is your Action?\t',
+        'action_not_feasible': 'chosen Action is not Feasible because {reason}',
+        'invalid_option': 'Invalid Option!',
+
+        'decision_attack': 'You commit to an aggressive strike, preparing to deal direct damage.',
+        'decision_defense': 'You raise your guard, focusing on reducing incoming damage.',
+        'decision_heal': 'You concentrate briefly, attempting to recover lost health.',
+        'decision_dodge': "You shift your stance, ready to evade the opponent's next move.",
+        'decision_none': 'wow, Nothing!\nEither you are very confident that your opponent will not attack or you are really hesitate about what Action to take.',
+        'wait_for_opponent': 'wait for Opponent to Take his Action too...',
+
+        'action_summary': 'Your action: {player_action} | Opponent action: {ai_action}',
+        'no_action': 'None',
+
+        'player_wins': 'You delivered the final blow — the opponent falls, and victory is yours.',
+        'player_loses': 'The opponent overwhelms you with a decisive strike — you have been defeated.',
+        'draw': 'Both fighters land their final blows at the same time and die on the battlefield — there is no victor, the battle ends in a draw.',
+        'good_game': 'Was a Good Game, GG...',
+        'next_turn': 'Next turn is about to begin. Both Players Stamina will Increase by 30',
+        'shield_in_turns': 'Shield will become available in {turns} Turns',
+        'shield_now': 'Shield will be Available Now',
+        'press_enter': 'Press Enter when you are ready.',
+    },
+    'fa': {
+        'intro': 'Be baazi duel khosh aamadid',
+        'main_menu': 'Menoo-ye asli',
+        'main_menu_options': '1. Shoroo-e baazi jadid\n2. Rahanamaye Bazi\n3. Taghir zaboon\n4. Khorooj',
+        'menu_prompt': 'Entekhab-e shoma chist?\t',
+        'invalid_choice': 'Entekhab-e naamotabar',
+        'language_selection': 'Entekhab zaboon',
+        'language_prompt': 'Zaboon-e khod ra entekhab konid:\t',
+        'invalid_language': 'Entekhab-e naamotabar\nLotfan 1 baraye English ya 2 baraye Farsi ra vared konid',
+        'language_set': 'Zaboon be Farsi tanzim shod',
+        'help_prompt': '\nEnter ra bezanid ta be menoo-ye asli baazgardid...',
+        'game_starts': 'Aamadeh shavid, duel dar sharof-e shoroo ast...',
+
+        'turn': 'Nobat {turn}',
+        'players': '{:<17} {:<20}'.format('Shoma', 'Hoosh-e masnooee'),
+        'health': 'Salaamat',
+        'stamina': 'Esteghaamat',
+        'has_shield': 'Daaraye separ',
+        'yes': 'Bale',
+        'no': 'Kheyr',
+        'actions': 'Aamaal:',
+        'attack_option': '1. Hamleh ',
+        'defense_option': '2. Defaa ',
+        'dodge_option': '3. Faraar',
+        'heal_option': '4. Darman ',
+        'none_option': '5. Hich kari nakon!',
+        'option_not_feasible': '(emkan pazir nist choon {reason})',
+        'low_stamina': 'Esteghaamat < {cost}',
+        'shield_cooldown': 'Separ dar dastres nist, {turns} nobat baagimaandeh',
+        'health_full': 'Salaamat kaamel ast',
+        'action_prompt': 'Amal-e shoma chist?\t',
+        'action_not_feasible': 'Amal-e entekhab shodeh emkan pazir nist choon {reason}',
+        'invalid_option': 'Gozineh naamotabar!',
+
+        'decision_attack': 'Shoma baraye yek zarbeye tahajomi motahed mishavid, aamade vared kardan aasib-e mostaghim.',
+        'decision_defense': 'Shoma negahbani-ye khod ra baala mibarid, tamarkoz bar kahesh-e aasib-e voroodi.',
+        'decision_heal': 'Shoma be toor-e mokhtasar tamarkoz mikonid, talash baraye baazyabi-e salaamat-e az dast rafteh.',
+        'decision_dodge': 'Shoma vaziyyat-e khod ra taghir midahid, aamade baraye faraar az harekat-e baadi-ye harif.',
+        'decision_none': 'Vaay, hichi!\nYa kheili motmaeenid ke harif hamleh nemikonad ya vaghean dar mored-e inke che amali anjam dahid mardod hastid.',
+        'wait_for_opponent': 'Montazer bemoonid ta harif ham amal-e khod ra anjaam dahad...',
+
+        'action_summary': 'Amal-e shoma: {player_action} | Amal-e harif: {ai_action}',
+        'no_action': 'Hich',
+
+        'player_wins': 'Shoma zarbeye nahayi ra vaared kardid — harif soghoot mikonad va piroozi az aan-e shomast.',
+        'player_loses': 'Harif shoma ra ba yek zarbeye ghaate maghloob mikonad — shoma shekast khordeh-id.',
+        'draw': 'Har do jangavar hamzamaan ba zarbeye akhar jaan baakhtand — hich barandehi vojud nadarad va nabard ba tasavi payan miyaabad.',
+        'good_game': 'Baazi-e khoobi bood, Aafarin...',
+        'next_turn': 'Nobat-e baadi dar sharof-e shoroo ast. Esteghaamat-e har do baazikon 20 vahed afzaayesh miyabad',
+        'shield_in_turns': 'Separ dar {turns} nobat digar dar dastres khahad bood',
+        'shield_now': 'Separ aknoon dar dastres khahad bood',
+        'press_enter': 'Vaghti aamadeh hastid Enter ra bezanid.',
+    },
+}
+
+# the narration of a turn, keyed by (player action, AI action, dodge worked)
+OUTCOMES: Dict[str, Dict[Tuple[Action, Action, Optional[bool]], str]] = {
+    'en': {
+        (Action.ATTACK, Action.ATTACK, None): 'Steel meets steel! You both strike at the same time — both take 20 damage.',
+        (Action.ATTACK, Action.DEFENSE, None): 'You swing boldly, but the opponent stands firm. Your strike finds no opening.',
+        (Action.ATTACK, Action.HEAL, None): 'You attack while the opponent tries to recover. A risky move… and you make them pay.',
+        (Action.ATTACK, Action.DODGE, True): 'You strike fast — but the opponent slips away just in time. Clean escape.',
+        (Action.ATTACK, Action.DODGE, False): 'The opponent tries to dodge… not fast enough. Your blade lands true.',
+        (Action.ATTACK, Action.NONE, None): 'You attack. No answer from the other side. That must hurt.',
+        (Action.DEFENSE, Action.ATTACK, None): 'You brace yourself. The opponent attacks — but you are ready for it.',
+        (Action.DEFENSE, Action.DEFENSE, None): 'Both of you hold your ground. A quiet moment… but tension grows.',
+        (Action.DEFENSE, Action.HEAL, None): 'You defend calmly while the opponent gathers strength. A careful turn.',
+        (Action.DEFENSE, Action.DODGE, None): 'You stay guarded. The opponent moves lightly, watching for a chance.',
+        (Action.DEFENSE, Action.NONE, None): 'You defend. Silence from the other side… interesting.',
+        (Action.HEAL, Action.ATTACK, None): 'You try to recover — but the opponent attacks! Healing under pressure… bold choice.',
+        (Action.HEAL, Action.DEFENSE, None): 'You regain strength while the opponent stands guarded. A steady recovery.',
+        (Action.HEAL, Action.HEAL, None): 'Both of you step back and recover. A short pause before the storm.',
+        (Action.HEAL, Action.DODGE, None): 'You heal. The opponent keeps moving, cautious and light on their feet.',
+        (Action.HEAL, Action.NONE, None): 'You take the moment to heal. No one stops you.',
+        (Action.DODGE, Action.ATTACK, True): 'The opponent attacks — but you vanish from harm. Nicely done.',
+        (Action.DODGE, Action.ATTACK, False): 'You try to dodge… but the strike catches you. That one stings.',
+        (Action.DODGE, Action.DEFENSE, None): 'You move swiftly while the opponent stands firm. Testing each other.',
+        (Action.DODGE, Action.HEAL, None): 'You keep moving. The opponent uses the moment to recover.',
+        (Action.DODGE, Action.DODGE, None): 'Both of you dance around the arena. No hits — just footwork.',
+        (Action.DODGE, Action.NONE, None): 'You dodge lightly. No threat comes your way.',
+        (Action.NONE, Action.ATTACK, None): 'The opponent attacks without hesitation. You stand still — not your best idea.',
+        (Action.NONE, Action.DEFENSE, None): 'The opponent defends patiently. Waiting… perhaps for you to move.',
+        (Action.NONE, Action.HEAL, None): 'The opponent restores their strength. You let them.',
+        (Action.NONE, Action.DODGE, None): 'The opponent moves lightly, watching you closely.',
+        (Action.NONE, Action.NONE, None): 'Both of you pause cautiously, neither willing to make the first move this turn.',
+    },
+    'fa': {
+        (Action.ATTACK, Action.ATTACK, None): 'Foolad be foolad! Har do hamzaman zarbe mizanid — har do 20 aasib mibinid.',
+        (Action.ATTACK, Action.DEFENSE, None): 'Shoma jasooreh zarbe mizanid, amma harif mohkam miistad. Zarbe shoma raahi peyda nemikonad.',
+        (Action.ATTACK, Action.HEAL, None): 'Shoma hamleh mikonid dar hali ke harif talash mikonad behbood yabad. Yek harekat-e por-reesk... va shoma oo ra vadar be pardakht-e hazineh mikonid.',
+        (Action.ATTACK, Action.DODGE, True): 'Shoma sari zarbe mizanid — amma harif be mooghe migrizad. Faraar-e tamiz.',
+        (Action.ATTACK, Action.DODGE, False): 'Harif talash mikonad faraar konad... be andazeh kaafi sari nist. Tighe shoma be hadaf mikhord.',
+        (Action.ATTACK, Action.NONE, None): 'Shoma hamleh mikonid. Pasokhi az taraf-e digar nist. Baayad dardnaak baashad.',
+        (Action.DEFENSE, Action.ATTACK, None): 'Shoma khod ra aamade mikonid. Harif hamleh mikonad — amma shoma baraye aan aamade hastid.',
+        (Action.DEFENSE, Action.DEFENSE, None): 'Har doye shoma moze-e khod ra hefz mikonid. Yek lahzeh-ye aaram... amma tanaffoz afzaayesh miyabad.',
+        (Action.DEFENSE, Action.HEAL, None): 'Shoma aaram defaa mikonid dar hali ke harif ghodrat jam mikonad. Yek nobat-e mohtaataneh.',
+        (Action.DEFENSE, Action.DODGE, None): 'Shoma mohaafezekaar mimanid. Harif sabok harekat mikonad, montazer-e yek forsat.',
+        (Action.DEFENSE, Action.NONE, None): 'Shoma defaa mikonid. Sokoot az taraf-e digar... jaaleb ast.',
+        (Action.HEAL, Action.ATTACK, None): 'Shoma talash mikonid behbood yabid — amma harif hamleh mikonad! Darman taht-e feshaar... entekhab-e shojaaaneh.',
+        (Action.HEAL, Action.DEFENSE, None): 'Shoma ghodrat ra baazyabi mikonid dar hali ke harif mohaafezekaar miistad. Yek baazyabi-e paayedar.',
+        (Action.HEAL, Action.HEAL, None): 'Har doye shoma aghab miravid va behbood miyabid. Yek maks-e kootah ghabl az toofan.',
+        (Action.HEAL, Action.DODGE, None): 'Shoma darman mikonid. Harif dar hale harekat ast, mohtaat va sabok bar rooye paahaay-e khod.',
+        (Action.HEAL, Action.NONE, None): 'Shoma lahzeh ra baraye darman ghanimat mishomorid. Hichkas shoma ra motavaqef nemikonad.',
+        (Action.DODGE, Action.ATTACK, True): 'Harif hamleh mikonad — amma shoma az khatar naapeed mishavid. Aafarin.',
+        (Action.DODGE, Action.ATTACK, False): 'Shoma talash mikonid faraar konid... amma zarbe shoma ra migirad. In yeki misuzad.',
+        (Action.DODGE, Action.DEFENSE, None): 'Shoma sari harekat mikonid dar hali ke harif mohkam miistad. Aazmayesh-e yekdigar.',
+        (Action.DODGE, Action.HEAL, None): 'Shoma be harekat edame midahid. Harif az lahzeh baraye behbood estefade mikonad.',
+        (Action.DODGE, Action.DODGE, None): 'Har doye shoma dar atraf-e meydan miraghsid. Bedoone zarbah — faaghat kaar ba pa.',
+        (Action.DODGE, Action.NONE, None): 'Shoma sabok faraar mikonid. Hich tahdidi be sooy-e shoma nemiayad.',
+        (Action.NONE, Action.ATTACK, None): 'Harif bedoone tardedid hamleh mikonad. Shoma biharekat miistid — behtarin ide-ye shoma nist.',
+        (Action.NONE, Action.DEFENSE, None): 'Harif sabooraaneh defaa mikonad. Montazer... shayad baraye harekat-e shoma.',
+        (Action.NONE, Action.HEAL, None): 'Harif ghodrat-e khod ra baazyabi mikonad. Shoma be oo ejaazeh midahid.',
+        (Action.NONE, Action.DODGE, None): 'Harif sabok harekat mikonad, shoma ra az nazdik zire nazar darad.',
+        (Action.NONE, Action.NONE, None): 'Har doye shoma mohtaataneh maks mikonid, hichkodam maayel be anjaam-e avvalin harekat dar in nobat nistid.',
+    },
+}
+
+HELP: Dict[str, str] = {
+    'en': """\
+======================================================================
+HOW TO PLAY — DUEL GAME
+======================================================================
+
+ABOUT THE GAME
+----------------------------------------------------------------------
+This is a turn-based 1v1 duel between You and an AI opponent.
+Your goal is simple: reduce the opponent's Health to 0 before yours reaches 0.
+Every turn, both players secretly choose one action.
+Then the actions resolve simultaneously.
+
+CORE RESOURCES
+----------------------------------------------------------------------
+• Health: Starts at 100. If it reaches 0, you lose.
+• Stamina: Starts at 100. Used to perform actions.
+• At the end of every turn, BOTH players regain +30 stamina.
+• Maximum Health and Stamina are capped at 100.
+
+AVAILABLE ACTIONS
+----------------------------------------------------------------------
+1. ATTACK  (Cost: 50 Stamina)
+   - Deals 20 damage if not defended or dodged.
+   - High impact, but expensive.
+
+2. DEFENSE (Cost: 0 Stamina)
+   - Requires a Shield.
+   - Shield becomes available every 5 turns.
+   - Blocks incoming attack damage completely.
+   - Cannot be used if Shield is on cooldown.
+
+3. DODGE   (Cost: 10 Stamina)
+   - 50% chance to completely avoid an incoming attack.
+   - Cheap and risky.
+
+4. HEAL    (Cost: 60 Stamina)
+   - Restores 20 Health.
+   - Cannot exceed 100 Health.
+   - Very powerful but extremely costly.
+
+5. DO NOTHING (Cost: 0 Stamina)
+   - You skip your action.
+   - Useful for saving stamina.
+   - If both of you does not have enough stamina to attack,
+     doing nothing is often the smartest move.
+
+IMPORTANT STRATEGY NOTES
+----------------------------------------------------------------------
+• You cannot spam Attack — stamina limits you.
+• You cannot spam Heal — it is expensive.
+• Defense depends on Shield timing.
+• Managing stamina is often more important than raw aggression.
+• Sometimes waiting is stronger than attacking.
+
+WIN CONDITION
+----------------------------------------------------------------------
+Reduce the opponent's Health to 0 to win.
+If your Health reaches 0 first, you lose.
+
+======================================================================
+Tip: Watch stamina carefully. The duel is not about who attacks more —
+it is about who chooses the right moment.
+======================================================================
+""",
+    'fa': """\
+======================================================================
+Nahoeye baazi — Duel
+======================================================================
+
+Darbareye baazi
+----------------------------------------------------------------------
+In yek duel-e nobati yek be yek bein-e shoma va harif-e hoosh-e masnooee ast.
+Hadaf-e shoma sade ast: salaamat-e harif ra ghabl az inke salaamat-e shoma be sefr beresad, be sefr beresoonid.
+Har nobat, har do baazikon makhfian yek amal ra entekhab mikonand.
+Sepas a'amaal be toor-e hamzaman ejra mishavand.
+
+Manabe-e asli
+----------------------------------------------------------------------
+• Salaamat: Az 100 shoroo mishavad. Agar be sefr beresad, mibaazid.
+• Esteghaamat: Az 100 shoroo mishavad. Baraye anjaam-e a'amaal estefade mishavad.
+• Dar payan-e har nobat, har do baazikon 20 esteghaamat bazyabi mikonand.
+• Haddaksar-e salaamat va esteghaamat 100 ast.
+
+A'amaal-e mojood
+----------------------------------------------------------------------
+1. Hamleh (Hazineh: 50 esteghaamat)
+   - Agar defaa ya faraar nashavad, 20 aasib vared mikonad.
+   - Ta'sir-e baala, amaa por-hazineh.
+
+2. Defaa (Hazineh: 0 esteghaamat)
+   - Niaaz be separ darad.
+   - Separ har 5 nobat yekbaar dar dastres mishavad.
+   - Aasib-e hamleh-ye voroodi ra kaamela masdood mikonad.
+   - Agar separ dar haalat-e aamade-baash nabashad, ghabele estefade nist.
+
+3. Faraar (Hazineh: 10 esteghaamat)
+   - 50% shaans baraye jelogiri-ye kaamel az hamleh-ye voroodi.
+   - Arzaan va reeski.
+
+4. Darman (Hazineh: 60 esteghaamat)
+   - 20 salaamat ra baazyabi mikonad.
+   - Nemitavanad az 100 salaamat bishtar shavad.
+   - Besyaar ghodratmand amaa besyaar por-hazineh.
+
+5. Hich kari nakon (Hazineh: 0 esteghaamat)
+   - Nobat-e khod ra migozarid.
+   - Mofid baraye zakhireh-ye esteghaamat.
+   - Agar har do esteghaamat-e kaafi baraye hamleh nadashteh baashand,
+     anjaam nadadan-e kar aghlan hoomandaneh-tarin harekat ast.
+
+Nokaat-e mohem-e esteratezhi
+----------------------------------------------------------------------
+• Nemitavanid hamleh ra espam konid — esteghaamat shoma ra mahdud mikonad.
+• Nemitavanid darman ra espam konid — por-hazineh ast.
+• Defaa be zamoonbandi-ye separ bastegi darad.
+• Modiriyyat-e esteghaamat aghlan mohemtar az por-khashgari-ye khaam ast.
+• Gahi sabr kardan ghavitar az hamleh kardan ast.
+
+Sharaayet-e piroozi
+----------------------------------------------------------------------
+Salaamat-e harif ra be sefr beresoonid ta pirooz shavid.
+Agar salaamat-e shoma zoodtar be sefr beresad, mibaazid.
+
+======================================================================
+Nokteh: Moraqeb-e esteghaamat baashid. Duel dar mored-e kasi nist ke bishtar hamleh mikonad —
+dar mored-e kasi ast ke lahzeh-ye mounaseb ra entekhab mikonad.
+======================================================================
+""",
+}
+
+
+# ----------------------------
+# Compiled frames
+# ----------------------------
+@dataclass(frozen=True)
+class MessageCatalog:
+    language: str
+    text: Dict[str, str]
+    main_menu: str                                            # the menu, up to the first prompt
+    language_menu: str
+    help: str
+    status: str                                               # the turn's status table and action header
+    decisions: Dict[Action, str]                              # after_player_decision, keyed by the player's action
+    outcomes: Dict[Tuple[Action, Optional[Action], Optional[bool]], str]  # after_decisions, keyed by outcome_key()
+
+
+def outcome_key(player_action: Action, ai_action: Optional[Action], player_result_detail: dict,
+                ai_result_detail: dict) -> Tuple[Action, Optional[Action], Optional[bool]]:
+    """(player action, AI action, dodge worked), the dodge is only looked at when the other side attacked"""
+    if player_action == Action.ATTACK and ai_action == Action.DODGE:
+        return player_action, ai_action, bool(ai_result_detail['is_dodge_works'])
+    if player_action == Action.DODGE and ai_action == Action.ATTACK:
+        return player_action, ai_action, bool(player_result_detail['is_dodge_works'])
+    return player_action, ai_action, None
+
+
+def _compile_outcomes(language: str) -> Dict[Tuple[Action, Optional[Action], Optional[bool]], str]:
+    text = MESSAGES[language]
+    outcomes = {}
+    for player_action in Action:
+        # no AI action, nothing to narrate
+        outcomes[(player_action, None, None)] = '\n'
+        for ai_action in Action:
+            summary = text['action_summary'].format(player_action=player_action.name, ai_action=ai_action.name)
+            for dodge in (None, True, False):
+                narration = OUTCOMES[language].get((player_action, ai_action, dodge))
+                if narration is not None:
+                    outcomes[(player_action, ai_action, dodge)] = f'\n{summary}\n{narration}\n'
+    return outcomes
+
+
+def compile_catalog(language: str) -> MessageCatalog:
+    text = MESSAGES[language]
+    rule = 20 * '-'
+    return MessageCatalog(
+        language=language,
+        text=text,
+        main_menu=f"{rule}\n{text['main_menu']}\n\n{text['main_menu_options']}\n{rule}\n\n",
+        language_menu=(f"{rule}\n{text['language_selection']}\n{rule}\n\n"
+                       f"1. English\n2. Finglish (Farsi with English Characters)\n{rule}\n\n"),
+        help=HELP[language],
+        status=(
+            f"{text['turn']}\n\n{60 * '-'}\n{20 * ' '}{text['players']}\n\n"
+            f"{text['health']:<20} {{player_1.health!s:<15}} {{player_2.health!s:<15}}\n"
+            f"{text['stamina']:<20} {{player_1.stamina!s:<15}} {{player_2.stamina!s:<15}}\n"
+            f"{text['has_shield']:<20} {{shield_1:<15}} {{shield_2:<15}}\n"
+            f"{60 * '-'}\n\n{text['actions']}\n"
+        ),
+        decisions={
+            action: f"{text['decision_' + action.name.lower()]}\n\n{text['wait_for_opponent']}\n" for action in Action
+        },
+        outcomes=_compile_outcomes(language),
+    )
+
+
+CATALOGS: Dict[str, MessageCatalog] = {language: compile_catalog(language) for language in LANGUAGES}
@@ -1,19 +1,141 @@
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
 import random
 import numpy as np
 
 from duel_game.core.essential_types import Action
+from duel_game.core import instrumentation
+from time import perf_counter
 
 class TrainedModel:
+    """
+    Linear policy over the feature vector, one intercept-first weight vector
+    per action class. The weights are compiled into one (classes x features)
+    matrix when the model is built, so predict is a single matmul. They are
+    read-only: editing the `weights` dict in place does not change the
+    predictions, build a new TrainedModel instead (as ModelProvider does).
+    """
     def __init__(self, weights: Dict[int, List[float]]):
-        self.weights = weights
+        self._weights = weights
+        self._classes = list(weights.keys())
+        matrix = np.array([weights[c] for c in self._classes], dtype=float)
+        self._intercepts = matrix[:, 0]
+        self._coefficients = matrix[:, 1:]
+
+    @property
+    def weights(self) -> Dict[int, List[float]]:
+        return self._weights
+
+    def predict(self, input: List[float|int]|None, rng: random.Random|None = None):
+        probe = instrumentation.active
+        if probe is not None:
+            started = perf_counter()
 
-    def predict(self, input: List[float|int]|None):
-        classes = list(self.weights.keys())
         if input is None:
-            predicted_class = random.choice([Action.ATTACK, Action.DODGE, Action.DEFENSE]).value
+            action = Action((rng or random).choice([Action.ATTACK, Action.DODGE, Action.DEFENSE]).value)
         else:
-            compute_score = lambda c: self.weights[c][0] + np.dot(input, self.weights[c][1:])
-            predicted_class = max(classes, key=compute_score)
+            scores = self._intercepts + self._coefficients @ np.asarray(input, dtype=float)
+            action = Action(int(self._classes[int(np.argmax(scores))]))
+
+        if probe is not None:
+            probe.observe('model_predict', 'trained_model', perf_counter() - started)
+
+        return action
+
+
+@dataclass(frozen=True)
+class ShadowRecord:
+    turn: int
+    primary: Action
+    shadows: Tuple[Action, ...]
+
+
+class ShadowScorer:
+    """
+    Scores shadow models next to the model an ArtificialPlayer plays with.
+
+    The compiled weights of the primary and every shadow model are stacked
+    into one ((1 + N) * classes x features) matrix, so a single matmul per
+    turn predicts for all of them. Only the primary prediction is returned;
+    the shadow predictions are kept in `records` (one ShadowRecord per
+    scored turn) and summarized by stats(). The stack is rebuilt when the
+    primary model is replaced (TrainedModel weights are read-only). One
+    scorer can be shared by many players to accumulate statistics over many
+    matches.
+    """
+    def __init__(self, shadow_models: Sequence[TrainedModel], labels: Sequence[str]|None = None,
+                 keep_records: bool = True):
+        if not shadow_models:
+            raise ValueError("ShadowScorer needs at least one shadow model")
+        if labels is not None and len(labels) != len(shadow_models):
+            raise ValueError(f"{len(labels)} labels for {len(shadow_models)} shadow models")
+        self.shadow_models = list(shadow_models)
+        self.labels = list(labels) if labels is not None else [f'shadow_{i}' for i in range(len(shadow_models))]
+        self.keep_records = keep_records
+        self.records: List[ShadowRecord] = []
+
+        self.turns = 0
+        self.agreements = [0] * len(shadow_models)
+        # predicted action counts per shadow model, indexed by Action value
+        self.action_counts = [[0] * (max(Action) + 1) for _ in shadow_models]
+
+        # the models the stack was built from, held so a replaced model is never mistaken for a new one
+        self._stacked_models: Tuple[TrainedModel, ...] = ()
+
+    def _stack(self, primary: TrainedModel) -> None:
+        models = (primary, *self.shadow_models)
+        if len(models) == len(self._stacked_models) and all(
+                model is stacked for model, stacked in zip(models, self._stacked_models)):
+            return
+
+        self._intercepts = np.concatenate([model._intercepts for model in models])
+        self._coefficients = np.vstack([model._coefficients for model in models])
+        self._actions = [[Action(int(c)) for c in model._classes] for model in models]
+        class_counts = {len(model._classes) for model in models}
+        self._class_count = class_counts.pop() if len(class_counts) == 1 else None
+        self._bounds = np.cumsum([0] + [len(model._classes) for model in models])
+        self._stacked_models = models
+
+    def predict(self, primary: TrainedModel, features: List[float|int], turn: int) -> Action:
+        """The primary model's prediction, scoring and recording every shadow model on the way"""
+        probe = instrumentation.active
+        if probe is not None:
+            started = perf_counter()
+
+        self._stack(primary)
+        scores = self._intercepts + self._coefficients @ np.asarray(features, dtype=float)
+        if self._class_count is not None:
+            best = scores.reshape(-1, self._class_count).argmax(axis=1).tolist()
+        else:
+            best = [int(np.argmax(scores[start:end])) for start, end in zip(self._bounds[:-1], self._bounds[1:])]
+
+        primary_action = self._actions[0][best[0]]
+        shadow_actions = []
+        for index, (actions, class_index) in enumerate(zip(self._actions[1:], best[1:])):
+            action = actions[class_index]
+            shadow_actions.append(action)
+            self.action_counts[index][action] += 1
+            if action == primary_action:
+                self.agreements[index] += 1
+        self.turns += 1
+        if self.keep_records:
+            self.records.append(ShadowRecord(turn, primary_action, tuple(shadow_actions)))
+
+        if probe is not None:
+            probe.observe('model_predict', 'shadow_stack', perf_counter() - started)
+
+        return primary_action
 
-        return Action(int(predicted_class))
\ No newline at end of file
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per shadow model: how often it agreed with the primary model and its predicted action mix"""
+        return {
+            label: {
+                'turns': self.turns,
+                'agreement': self.agreements[index] / self.turns if self.turns else 0.0,
+                **{
+                    f'predicted_{action.name.lower()}': self.action_counts[index][action]
+                    for action in Action
+                },
+            }
+            for index, label in enumerate(self.labels)
+        }
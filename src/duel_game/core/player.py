@@ -1,6 +1,6 @@
 from __future__ import annotations
 from duel_game.core.essential_types import Action, PlayerState, DataSample
-from duel_game.core.ml_model import TrainedModel
+from duel_game.core.ml_model import TrainedModel, ShadowScorer
 from duel_game.core.helpers import break_down_probability, compute_imminent_attack_likely, get_base_path, is_in_bundled
 from abc import ABC, abstractmethod
 from typing import Callable, TYPE_CHECKING, Dict, Callable, Type
@@ -12,13 +12,14 @@ import os
 # to prevent circular import errors (ImportError)
 if TYPE_CHECKING:
     from duel_game.core.game import DuelGame
+    from duel_game.ml_model.model_provider import ModelProvider
 
 if not is_in_bundled():
     # Load environment variables
     load_dotenv(get_base_path() / '.env')
 
 class Player(ABC):
-    def __init__(self, rng=random.Random()):
+    def __init__(self, rng: random.Random|None = None):
         self.stamina = 100
         self.health = 100
         self.is_shield_available = True
@@ -26,7 +27,7 @@ class Player(ABC):
         self.game: DuelGame
         self.opponent: Player
         self.action_in_turn: Action|None = None
-        self.rng = rng
+        self.rng = rng if rng is not None else random.Random()
 
     def choose_action(self) -> Action:
         pass
@@ -74,13 +75,26 @@ class Player(ABC):
         )
     
 class ArtificialPlayer(Player):
-    def __init__(self, prediction_model: TrainedModel, rng=random.Random()):
+    def __init__(self, prediction_model: TrainedModel|ModelProvider, rng: random.Random|None = None,
+                 shadow: ShadowScorer|None = None):
         super().__init__(rng)
-        self.model = prediction_model
+        # shadow models are scored alongside the primary model every turn but never change its decision
+        self.shadow = shadow
+        # a provider is asked for its current model at the start of every turn, so reloads apply between turns
+        self.model_provider = None if isinstance(prediction_model, TrainedModel) else prediction_model
+        self.model: TrainedModel|None = prediction_model if self.model_provider is None else None
+        self.model_version: int|None = None
 
     def choose_action(self) -> Action:
+        if self.model_provider is not None:
+            handle = self.model_provider.current()
+            self.model, self.model_version = handle.model, handle.version
+
         last_round_sample: DataSample|None = self.game.tracker.get_last_sample()
-        predicted_action: Action|None = self.model.predict(last_round_sample.features if last_round_sample is not None else None)
+        if self.shadow is not None and last_round_sample is not None:
+            predicted_action: Action|None = self.shadow.predict(self.model, last_round_sample.features, last_round_sample.turn)
+        else:
+            predicted_action = self.model.predict(last_round_sample.features if last_round_sample is not None else None, self.rng)
 
         if predicted_action == Action.ATTACK and not self.game.player_1.is_action_feasible(predicted_action):
             predicted_action = Action.NONE
@@ -97,7 +111,7 @@ class ArtificialPlayer(Player):
                 else:
                     my_action = Action.DODGE
             elif predicted_action in [Action.DEFENSE, Action.DODGE, Action.HEAL, Action.NONE]:
-                if self.health < 50 and self.is_action_feasible(Action.HEAL) and random.random() > 0.5:
+                if self.health < 50 and self.is_action_feasible(Action.HEAL) and self.rng.random() > 0.5:
                     my_action = Action.HEAL
                 elif self.is_action_feasible(Action.ATTACK):
                     my_action = Action.ATTACK
@@ -110,7 +124,7 @@ class ArtificialPlayer(Player):
 
     
 class DummyPlayer(Player):
-    def __init__(self, policy: Type[Policy], rng=random.Random()):
+    def __init__(self, policy: Type[Policy], rng: random.Random|None = None):
         super().__init__(rng)
         self.policy_performer = policy.get_policy_performer()
         self.archtype = policy.archtype
@@ -0,0 +1,297 @@
+"""
+Append-only binary replay log of played matches.
+
+A replay keeps what is needed to reconstruct a match exactly: the seed it was
+played with, the DuelGame rule constants and, per turn, one byte holding both
+players' actions and the outcome of the turn's dodge roll. Player states only
+depend on these, so the trajectory (and any feature derived from it) can be
+rebuilt later without simulating the players again.
+
+Log file:
+
+    magic b"DGR1"
+    records: body length (u32) | body
+
+Record body:
+
+    flags u8 (bit 0: seeded) | run seed u64 | key count u8 | match key u32 x count
+    attack_damage u16 | heal_amount u16 | stamina per turn u16 | shield cooldown u16 | dodge_probability f64
+    max turns u32 (0 when unlimited) | winner u8 (0 none, 1 player 1, 2 player 2)
+    2 x (label length u8 | utf-8 label) | turn count u32 | turn codes u8 x turn count
+
+Turn code bits: 0-2 player 1 action, 3-5 player 2 action, 6 the dodge worked.
+Record offsets go to a "<log>.idx" file of u64 values, so match i is read
+directly. The index is written after the log, an index lost in a crash is
+rebuilt by rebuild_index.
+
+    with ReplayWriter('data/replays.dgr') as writer:
+        game.set_recorder(MatchRecorder(writer, ('Aggressive', 'Healer'), run_seed, (pairing, game_index)))
+        game.play_game()
+
+    replays = ReplayReader('data/replays.dgr')
+    replays[12].player_1_actions
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple, TYPE_CHECKING
+import math
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from duel_game.core.essential_types import Action
+
+# to prevent circular import errors (ImportError)
+if TYPE_CHECKING:
+    from duel_game.core.game import DuelGame
+
+REPLAY_MAGIC = b"DGR1"
+DEFAULT_BUFFER_BYTES = 1 << 20
+
+_LENGTH = struct.Struct("<I")
+_SEED = struct.Struct("<BQB")
+_RULES = struct.Struct("<HHHHd")
+_OUTCOME = struct.Struct("<IB")
+_OFFSET = struct.Struct("<Q")
+
+_ACTION_MASK = 0b111
+_PLAYER_2_SHIFT = 3
+_DODGE_BIT = 1 << 6
+
+
+@dataclass(frozen=True)
+class ReplayRules:
+    """DuelGame rule constants a match was played with"""
+    attack_damage: int
+    heal_amount: int
+    increase_stamina_each_turn: int
+    sheild_spawn_duration: int
+    dodge_probability: float
+
+    @classmethod
+    def from_game(cls, game: DuelGame) -> 'ReplayRules':
+        return cls(game.attack_damage, game.heal_amount, game.increase_stamina_each_turn,
+                   game.sheild_spawn_duration, game.dodge_probability)
+
+
+def encode_turn(player_1_action: Action, player_2_action: Action, dodge_works: Optional[bool]) -> int:
+    return int(player_1_action) | int(player_2_action) << _PLAYER_2_SHIFT | (_DODGE_BIT if dodge_works else 0)
+
+
+@dataclass(frozen=True)
+class Replay:
+    run_seed: Optional[int]
+    match_key: Tuple[int, ...]
+    rules: ReplayRules
+    max_turns: Optional[int]
+    winner: int
+    player_labels: Tuple[str, str]
+    codes: np.ndarray
+
+    @property
+    def turns(self) -> int:
+        return len(self.codes)
+
+    @property
+    def player_1_actions(self) -> np.ndarray:
+        return self.codes & _ACTION_MASK
+
+    @property
+    def player_2_actions(self) -> np.ndarray:
+        return (self.codes >> _PLAYER_2_SHIFT) & _ACTION_MASK
+
+    @property
+    def dodge_works(self) -> np.ndarray:
+        return (self.codes & _DODGE_BIT) != 0
+
+    def encode(self) -> bytes:
+        body = bytearray(_SEED.pack(self.run_seed is not None, self.run_seed or 0, len(self.match_key)))
+        body += struct.pack(f"<{len(self.match_key)}I", *self.match_key)
+        body += _RULES.pack(self.rules.attack_damage, self.rules.heal_amount, self.rules.increase_stamina_each_turn,
+                            self.rules.sheild_spawn_duration, self.rules.dodge_probability)
+        body += _OUTCOME.pack(self.max_turns or 0, self.winner)
+        for label in self.player_labels:
+            encoded = label.encode('utf-8')
+            if len(encoded) > 255:
+                raise ValueError(f"Player label is longer than 255 bytes: {label!r}")
+            body += bytes((len(encoded),)) + encoded
+        body += _LENGTH.pack(len(self.codes))
+        body += np.asarray(self.codes, dtype=np.uint8).tobytes()
+        return _LENGTH.pack(len(body)) + bytes(body)
+
+    @classmethod
+    def decode(cls, buffer, offset: int = 0) -> 'Replay':
+        """Decode the record at `offset` (its length prefix) of a log buffer"""
+        (length,) = _LENGTH.unpack_from(buffer, offset)
+        position = offset + _LENGTH.size
+
+        seeded, run_seed, key_count = _SEED.unpack_from(buffer, position)
+        position += _SEED.size
+        match_key = struct.unpack_from(f"<{key_count}I", buffer, position)
+        position += 4 * key_count
+
+        rules = ReplayRules(*_RULES.unpack_from(buffer, position))
+        position += _RULES.size
+        max_turns, winner = _OUTCOME.unpack_from(buffer, position)
+        position += _OUTCOME.size
+
+        labels = []
+        for _ in range(2):
+            label_length = buffer[position]
+            labels.append(bytes(buffer[position + 1:position + 1 + label_length]).decode('utf-8'))
+            position += 1 + label_length
+
+        (turns,) = _LENGTH.unpack_from(buffer, position)
+        position += _LENGTH.size
+        if position + turns != offset + _LENGTH.size + length:
+            raise ValueError(f"Corrupt replay record at offset {offset}")
+        codes = np.frombuffer(buffer, dtype=np.uint8, count=turns, offset=position).copy()
+
+        return cls(run_seed if seeded else None, tuple(match_key), rules, max_turns or None, winner,
+                   (labels[0], labels[1]), codes)
+
+
+def _index_path(path) -> Path:
+    return Path(f"{path}.idx")
+
+
+class ReplayWriter:
+    def __init__(self, path, buffer_bytes: int = DEFAULT_BUFFER_BYTES):
+        """
+        Args:
+            path: Log file, created when missing, appended to otherwise
+            buffer_bytes: Records are written to the files once this many bytes are buffered
+        """
+        self.path = Path(path)
+        self.buffer_bytes = buffer_bytes
+        self._log = open(self.path, 'ab')
+        self._index = open(_index_path(self.path), 'ab')
+
+        self._position = self._log.seek(0, os.SEEK_END)
+        if self._position == 0:
+            self._log.write(REPLAY_MAGIC)
+            self._position = len(REPLAY_MAGIC)
+        self._records = bytearray()
+        self._offsets = bytearray()
+        self.matches_written = 0
+
+    def append(self, replay: Replay) -> None:
+        record = replay.encode()
+        self._offsets += _OFFSET.pack(self._position + len(self._records))
+        self._records += record
+        self.matches_written += 1
+        if len(self._records) >= self.buffer_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        # the log first, so every indexed offset points at a complete record
+        if self._records:
+            self._log.write(self._records)
+            self._log.flush()
+            self._position += len(self._records)
+            self._records.clear()
+        if self._offsets:
+            self._index.write(self._offsets)
+            self._index.flush()
+            self._offsets.clear()
+
+    def close(self) -> None:
+        if self._log.closed:
+            return
+        self.flush()
+        self._log.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class MatchRecorder:
+    """DuelGame recorder (see DuelGame.set_recorder) that appends the match to a ReplayWriter when it ends"""
+
+    def __init__(self, writer: ReplayWriter, player_labels: Sequence[str],
+                 run_seed: Optional[int] = None, match_key: Sequence[int] = ()):
+        self.writer = writer
+        self.player_labels = (player_labels[0], player_labels[1])
+        self.run_seed = run_seed
+        self.match_key = tuple(match_key)
+        self.codes = bytearray()
+
+    def on_turn(self, player_1_action: Action, player_2_action: Action, dodge_works: Optional[bool]) -> None:
+        self.codes.append(encode_turn(player_1_action, player_2_action, dodge_works))
+
+    def on_game_end(self, game: DuelGame) -> None:
+        winner = 0 if game.winner is None else 1 if game.winner is game.player_1 else 2
+        max_turns = None if game.max_turns == math.inf else int(game.max_turns)
+        self.writer.append(Replay(
+            self.run_seed, self.match_key, ReplayRules.from_game(game), max_turns, winner,
+            self.player_labels, np.frombuffer(bytes(self.codes), dtype=np.uint8)
+        ))
+
+
+def rebuild_index(path) -> int:
+    """Rewrite the offset index by scanning the log, returns the number of matches"""
+    offsets = bytearray()
+    with open(path, 'rb') as log:
+        if log.read(len(REPLAY_MAGIC)) != REPLAY_MAGIC:
+            raise ValueError(f"{path} is not a replay log")
+        position = len(REPLAY_MAGIC)
+        while True:
+            header = log.read(_LENGTH.size)
+            if len(header) < _LENGTH.size:
+                break
+            (length,) = _LENGTH.unpack(header)
+            if len(log.read(length)) < length:
+                # a record cut short by a crash is not indexed
+                break
+            offsets += _OFFSET.pack(position)
+            position += _LENGTH.size + length
+
+    with open(_index_path(path), 'wb') as index:
+        index.write(offsets)
+    return len(offsets) // _OFFSET.size
+
+
+class ReplayReader:
+    """Random access to the matches of a replay log, through a memory map"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as log:
+            size = log.seek(0, os.SEEK_END)
+            self._map = mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        if self._map is None or self._map[:len(REPLAY_MAGIC)] != REPLAY_MAGIC:
+            raise ValueError(f"{path} is not a replay log")
+
+        index_path = _index_path(self.path)
+        self.offsets = np.fromfile(index_path, dtype='<u8') if index_path.exists() else np.empty(0, dtype='<u8')
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, match_index: int) -> Replay:
+        return Replay.decode(self._map, int(self.offsets[match_index]))
+
+    def __iter__(self) -> Iterator[Replay]:
+        for offset in self.offsets:
+            yield Replay.decode(self._map, int(offset))
+
+    def read(self, match_indexes: Sequence[int]) -> List[Replay]:
+        return [self[index] for index in match_indexes]
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
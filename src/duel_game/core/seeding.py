@@ -0,0 +1,39 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import random
+
+from numpy.random import SeedSequence
+
+
+@dataclass(frozen=True)
+class MatchRngs:
+    """Independent random streams used by a single match"""
+    engine: random.Random
+    player_1: random.Random
+    player_2: random.Random
+    dodge: random.Random
+
+
+def _to_random(seed_sequence: SeedSequence) -> random.Random:
+    # 128 bits of entropy from the child sequence is plenty for Mersenne Twister seeding
+    state = seed_sequence.generate_state(4)
+    return random.Random(int.from_bytes(state.tobytes(), 'little'))
+
+
+def spawn_match_rngs(run_seed: int, *match_key: int) -> MatchRngs:
+    """
+    Derive the random streams of one match from the run seed.
+
+    The match is identified by `match_key` (e.g. pairing index and game index
+    inside the pairing), so the streams only depend on (run_seed, match_key)
+    and never on which worker plays the match or in which order.
+    """
+    match_sequence = SeedSequence(run_seed, spawn_key=tuple(int(k) for k in match_key))
+    engine, player_1, player_2, dodge = match_sequence.spawn(4)
+
+    return MatchRngs(
+        engine=_to_random(engine),
+        player_1=_to_random(player_1),
+        player_2=_to_random(player_2),
+        dodge=_to_random(dodge)
+    )
@@ -0,0 +1,143 @@
+"""
+Compressed columnar encoding of archived dataset runs.
+
+An archive is one blob:
+
+    magic b"DGA1" | codec (1 byte) | feature count (u16) | block count (u32)
+    block index: block count x (payload offset u64, rows u32, payload length u32)
+    block payloads
+
+Each block holds up to `block_rows` samples, compressed independently so
+readers can seek to and decompress one block at a time. A decompressed block
+is the labels (u8 each) followed by the feature columns: every column is
+float32, stored as successive differences of the float32 bit patterns
+(int32, wrapping), which keeps slowly changing game features close to zero
+and makes them compress well. The bit-pattern deltas are exact, the only
+precision loss is the float64 -> float32 cast.
+"""
+from __future__ import annotations
+from typing import Iterable, Iterator, List, Tuple, Callable
+import lzma
+import struct
+import zlib
+
+import numpy as np
+
+ARCHIVE_MAGIC = b"DGA1"
+DEFAULT_BLOCK_ROWS = 8192
+
+CODECS = {'zlib': 1, 'lzma': 2}
+_CODEC_NAMES = {code: name for name, code in CODECS.items()}
+
+_HEADER = struct.Struct("<4sBHI")
+_BLOCK_ENTRY = struct.Struct("<QII")
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == 'zlib':
+        return zlib.compress(data, 6)
+    return lzma.compress(data, preset=6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    return lzma.decompress(data)
+
+
+def encode_block(features: np.ndarray, labels: np.ndarray) -> bytes:
+    """Uncompressed block payload for (rows x features) float32 features and u8 labels"""
+    bits = np.ascontiguousarray(features, dtype='<f4').view('<i4')
+    # column-major deltas, the first row keeps its raw bit pattern
+    deltas = np.diff(bits, axis=0, prepend=np.zeros((1, bits.shape[1]), dtype='<i4'))
+    return labels.astype('<u1').tobytes() + np.ascontiguousarray(deltas.T).tobytes()
+
+
+def decode_block(payload: bytes, rows: int, feature_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    labels = np.frombuffer(payload, dtype='<u1', count=rows)
+    deltas = np.frombuffer(payload, dtype='<i4', offset=rows).reshape(feature_count, rows)
+    features = np.cumsum(deltas, axis=1, dtype='<i4').view('<f4').T
+    return features, labels
+
+
+def encode_archive(batches: Iterable[Tuple[np.ndarray, np.ndarray]], feature_count: int,
+                   codec: str = 'zlib', block_rows: int = DEFAULT_BLOCK_ROWS) -> Tuple[bytes, int]:
+    """
+    Encode (features, labels) batches of any size into an archive blob.
+
+    Returns:
+        (blob, number of samples)
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown archive codec {codec!r}, expected one of {sorted(CODECS)}")
+
+    payloads: List[Tuple[int, bytes]] = []
+    pending_features: List[np.ndarray] = []
+    pending_labels: List[np.ndarray] = []
+    pending_rows = 0
+    total_rows = 0
+
+    def flush_blocks(final: bool):
+        """Compress every full block, and the remainder when `final`"""
+        nonlocal pending_rows
+        features = np.concatenate(pending_features)
+        labels = np.concatenate(pending_labels)
+        start = 0
+        while len(labels) - start >= block_rows or (final and start < len(labels)):
+            end = start + block_rows
+            payloads.append((len(labels[start:end]), _compress(codec, encode_block(features[start:end], labels[start:end]))))
+            start = end
+        pending_features[:] = [features[start:]]
+        pending_labels[:] = [labels[start:]]
+        pending_rows = len(labels) - start
+
+    for features, labels in batches:
+        if len(labels) == 0:
+            continue
+        if np.any((labels < 0) | (labels > 255)):
+            raise ValueError("archived labels must fit in one unsigned byte")
+        pending_features.append(np.asarray(features, dtype='<f4').reshape(len(labels), feature_count))
+        pending_labels.append(np.asarray(labels))
+        pending_rows += len(labels)
+        total_rows += len(labels)
+        if pending_rows >= block_rows:
+            flush_blocks(final=False)
+    if pending_rows:
+        flush_blocks(final=True)
+
+    header = _HEADER.pack(ARCHIVE_MAGIC, CODECS[codec], feature_count, len(payloads))
+    offset = len(header) + _BLOCK_ENTRY.size * len(payloads)
+    index = bytearray()
+    for rows, payload in payloads:
+        index += _BLOCK_ENTRY.pack(offset, rows, len(payload))
+        offset += len(payload)
+
+    return header + bytes(index) + b"".join(payload for _, payload in payloads), total_rows
+
+
+def iter_archive(read: Callable[[int, int], bytes], start_row: int = 0) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Decode an archive block by block.
+
+    Args:
+        read: read(offset, length) -> bytes of the blob, so callers can stream
+            from an SQLite blob handle instead of loading the whole archive
+        start_row: Skip this many samples, blocks before it are not decompressed
+
+    Yields:
+        (features float32 rows x features, labels u8) per block
+    """
+    magic, codec_code, feature_count, block_count = _HEADER.unpack(read(0, _HEADER.size))
+    if magic != ARCHIVE_MAGIC or codec_code not in _CODEC_NAMES:
+        raise ValueError("Not a dataset run archive")
+    codec = _CODEC_NAMES[codec_code]
+
+    index = read(_HEADER.size, _BLOCK_ENTRY.size * block_count)
+    block_start = 0
+    for block in range(block_count):
+        offset, rows, length = _BLOCK_ENTRY.unpack_from(index, block * _BLOCK_ENTRY.size)
+        if block_start + rows > start_row:
+            features, labels = decode_block(_decompress(codec, read(offset, length)), rows, feature_count)
+            skip = max(0, start_row - block_start)
+            yield features[skip:], labels[skip:]
+        block_start += rows
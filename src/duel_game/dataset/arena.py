@@ -0,0 +1,234 @@
+"""
+Shared-memory arena for multi-process dataset generation.
+
+One `multiprocessing.shared_memory` block holds a state row per pairing and
+the output matrices (features, labels, turns). Every pairing owns a fixed
+region of output rows sized for its sample target. Worker processes attach
+to the block by name, play their contiguous slice of pairings and write each
+game's samples straight into the pairing's region, updating its state row.
+Only the small layout and pairing descriptions are pickled when a worker
+starts. Players, games, trackers and samples never cross a process boundary.
+The parent reads the output as numpy views of the same memory.
+
+    with SimulationArena.for_run(config, samples_count) as arena:
+        arena.run(seed, worker_count=8)
+        features, labels, turns = arena.samples()
+        repo.store_samples_array(features, labels, run_id)
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Any, Optional, Tuple
+import os
+
+import numpy as np
+
+from duel_game.core.essential_types import features as feature_names
+from duel_game.dataset.generation import Pairing, plan_run_pairings, worker_pairings, iter_pairing_games
+
+# state row columns (int64)
+STATE_PAIRING = 0
+STATE_OFFSET = 1
+STATE_CAPACITY = 2
+STATE_TARGET = 3
+STATE_WRITTEN = 4
+STATE_GAMES = 5
+STATE_STATUS = 6
+STATE_COLUMNS = 7
+
+STATUS_PENDING = 0
+STATUS_RUNNING = 1
+STATUS_DONE = 2
+
+
+def _aligned(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+@dataclass(frozen=True)
+class ArenaLayout:
+    """Where the arrays live inside the shared block, the only thing workers receive besides pairings"""
+    shm_name: str
+    pairing_count: int
+    capacity: int
+    feature_count: int
+
+    @property
+    def sizes(self) -> Tuple[int, int, int, int]:
+        return (
+            _aligned(self.pairing_count * STATE_COLUMNS * 8),
+            _aligned(self.capacity * self.feature_count * 8),
+            _aligned(self.capacity),
+            _aligned(self.capacity * 4),
+        )
+
+    @property
+    def size(self) -> int:
+        return max(1, sum(self.sizes))
+
+    def views(self, buffer) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(states, features, labels, turns) arrays over the shared buffer"""
+        states_size, features_size, labels_size, _ = self.sizes
+        offset = 0
+        states = np.ndarray((self.pairing_count, STATE_COLUMNS), dtype=np.int64, buffer=buffer, offset=offset)
+        offset += states_size
+        features = np.ndarray((self.capacity, self.feature_count), dtype=np.float64, buffer=buffer, offset=offset)
+        offset += features_size
+        labels = np.ndarray((self.capacity,), dtype=np.int8, buffer=buffer, offset=offset)
+        offset += labels_size
+        turns = np.ndarray((self.capacity,), dtype=np.int32, buffer=buffer, offset=offset)
+        return states, features, labels, turns
+
+
+def _close_quietly(shm: SharedMemory) -> None:
+    # views still referenced (e.g. by a traceback) keep the mapping alive until they are collected
+    try:
+        shm.close()
+    except BufferError:
+        pass
+
+
+def _fill_pairings(states: np.ndarray, features: np.ndarray, labels: np.ndarray, turns: np.ndarray,
+                   pairings: List[Pairing], max_turns_per_game: int, run_seed: int) -> None:
+    for pairing in pairings:
+        state = states[pairing.index]
+        state[STATE_STATUS] = STATUS_RUNNING
+        offset = int(state[STATE_OFFSET])
+        capacity = int(state[STATE_CAPACITY])
+
+        for game_samples in iter_pairing_games(pairing, max_turns_per_game, run_seed):
+            written = int(state[STATE_WRITTEN])
+            end = written + len(game_samples)
+            if end > capacity:
+                raise RuntimeError(f"Pairing {pairing.index} produced more than its {capacity} arena rows")
+
+            if game_samples:
+                features[offset + written:offset + end] = [sample.features for sample in game_samples]
+                labels[offset + written:offset + end] = [int(sample.label) for sample in game_samples]
+                turns[offset + written:offset + end] = [sample.turn for sample in game_samples]
+            state[STATE_WRITTEN] = end
+            state[STATE_GAMES] += 1
+
+        state[STATE_STATUS] = STATUS_DONE
+
+
+def _advance_arena_slice(layout: ArenaLayout, pairings: List[Pairing], max_turns_per_game: int, run_seed: int) -> int:
+    """Worker process entry point: attach to the arena and play a slice of pairings in place"""
+    shm = SharedMemory(name=layout.shm_name)
+    try:
+        _fill_pairings(*layout.views(shm.buf), pairings, max_turns_per_game, run_seed)
+    finally:
+        _close_quietly(shm)
+    return len(pairings)
+
+
+class SimulationArena:
+    def __init__(self, pairings: List[Pairing], max_turns_per_game: int):
+        """
+        Args:
+            pairings: Pairings of the run, indexed 0..n-1
+            max_turns_per_game: Per-game turn limit, also the per-pairing row headroom
+        """
+        self.pairings = pairings
+        self.max_turns_per_game = max_turns_per_game
+
+        capacities = [pairing.target_samples + max_turns_per_game for pairing in pairings]
+        offsets = np.cumsum([0] + capacities[:-1]) if pairings else []
+
+        size = ArenaLayout('', len(pairings), sum(capacities), len(feature_names)).size
+        self.shm = SharedMemory(create=True, size=size)
+        self.layout = ArenaLayout(self.shm.name, len(pairings), sum(capacities), len(feature_names))
+        self.states, self.features, self.labels, self.turns = self.layout.views(self.shm.buf)
+
+        self.states[:] = 0
+        for pairing, offset, capacity in zip(pairings, offsets, capacities):
+            self.states[pairing.index, STATE_PAIRING] = pairing.index
+            self.states[pairing.index, STATE_OFFSET] = offset
+            self.states[pairing.index, STATE_CAPACITY] = capacity
+            self.states[pairing.index, STATE_TARGET] = pairing.target_samples
+        self._compacted = False
+
+    @classmethod
+    def for_run(cls, config: Dict[str, Any], samples_count: int) -> 'SimulationArena':
+        return cls(plan_run_pairings(config, samples_count), config["MAX_TURNS_PER_GAME"])
+
+    def run(self, run_seed: int, worker_count: Optional[int] = None) -> None:
+        """
+        Play every pairing, each worker process advancing a contiguous slice
+        in place. With one worker the pairings are played in this process.
+        """
+        worker_count = worker_count or os.cpu_count() or 1
+        if worker_count == 1:
+            _fill_pairings(self.states, self.features, self.labels, self.turns,
+                           self.pairings, self.max_turns_per_game, run_seed)
+            return
+
+        with ProcessPoolExecutor(max_workers=worker_count) as executor:
+            futures = [
+                executor.submit(_advance_arena_slice, self.layout,
+                                worker_pairings(self.pairings, worker_index, worker_count),
+                                self.max_turns_per_game, run_seed)
+                for worker_index in range(worker_count)
+            ]
+            for future in futures:
+                future.result()
+
+    def progress(self) -> Dict[str, int]:
+        """Live counters, readable from the parent while workers run"""
+        return {
+            'pairings_done': int(np.count_nonzero(self.states[:, STATE_STATUS] == STATUS_DONE)),
+            'pairings': self.layout.pairing_count,
+            'games_played': int(self.states[:, STATE_GAMES].sum()),
+            'samples_written': int(self.states[:, STATE_WRITTEN].sum()),
+        }
+
+    def pairing_samples(self, pairing_index: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Zero-copy (features, labels, turns) views of one pairing's samples"""
+        state = self.states[pairing_index]
+        start = int(state[STATE_OFFSET])
+        end = start + int(state[STATE_WRITTEN])
+        return self.features[start:end], self.labels[start:end], self.turns[start:end]
+
+    def samples(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        All samples in pairing order as zero-copy views, the same order as
+        generate_run_samples. The pairing regions are moved together in place
+        the first time, so call it after run(). The views are only valid
+        until the arena is closed.
+        """
+        if not self._compacted:
+            if np.any(self.states[:, STATE_STATUS] != STATUS_DONE):
+                raise RuntimeError("Arena samples are read after every pairing is done")
+
+            position = 0
+            for index in range(self.layout.pairing_count):
+                start = int(self.states[index, STATE_OFFSET])
+                written = int(self.states[index, STATE_WRITTEN])
+                if start != position:
+                    # regions only move towards the front, overlapping copies are handled by numpy
+                    self.features[position:position + written] = self.features[start:start + written]
+                    self.labels[position:position + written] = self.labels[start:start + written]
+                    self.turns[position:position + written] = self.turns[start:start + written]
+                    self.states[index, STATE_OFFSET] = position
+                self.states[index, STATE_CAPACITY] = written
+                position += written
+            self._compacted = True
+
+        total = int(self.states[:, STATE_WRITTEN].sum())
+        return self.features[:total], self.labels[:total], self.turns[:total]
+
+    def close(self) -> None:
+        """Release the shared block (views handed out must not be used afterwards)"""
+        if self.shm is None:
+            return
+        self.states = self.features = self.labels = self.turns = None
+        _close_quietly(self.shm)
+        self.shm.unlink()
+        self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
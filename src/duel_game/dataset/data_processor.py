@@ -1,9 +1,11 @@
 from duel_game.core.essential_types import GameState, Action
 from duel_game.core.essential_types import features as feature_names
-from duel_game.core.helpers import compute_imminent_attack_likely
+from duel_game.core.helpers import estimate_attack_likelihood
 from duel_game.core.essential_types import DataSample
+from duel_game.core import instrumentation
+from time import perf_counter
 from dotenv import load_dotenv
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 
 class Tracker:
@@ -17,15 +19,32 @@ class Tracker:
         self.records: List[GameState] = []
         self.data_samples: List[DataSample] = []
         self.game_ref = game
+        # number of enemy (player_2) attacks in the first i records, for O(1) window counts
+        self._enemy_attack_prefix: List[int] = [0]
+        # (turn, perspective, history_length) -> attack likelihood, reset whenever a record is added
+        self._threat_cache: Dict[Tuple[int, int, float], float] = {}
     
     def record(self, game_state: GameState):
         """
         Record a game state AFTER players have chosen actions
         but BEFORE combat resolution.
         """
+        probe = instrumentation.active
+        if probe is not None:
+            started = perf_counter()
+
         self.records.append(game_state)
+        self._enemy_attack_prefix.append(
+            self._enemy_attack_prefix[-1] + (game_state.player_2.action_in_turn == Action.ATTACK)
+        )
+        self._threat_cache.clear()
 
+        if probe is not None:
+            extract_started = perf_counter()
         features = self._extract_features(game_state)
+        if probe is not None:
+            probe.observe('tracker_record', 'extract_features', perf_counter() - extract_started)
+
         sample = DataSample(
             features=features,
             label=game_state.player_1.action_in_turn,
@@ -33,6 +52,9 @@ class Tracker:
         )
         self.data_samples.append(sample)
 
+        if probe is not None:
+            probe.observe('tracker_record', 'total', perf_counter() - started)
+
     def get_samples(self) -> List[DataSample]:
         return self.data_samples
      
@@ -42,6 +64,35 @@ class Tracker:
         else:
             return self.data_samples[-1]
 
+    def attack_likelihood(self, player, history_length) -> float:
+        """
+        Likelihood of an incoming attack from `player`'s point of view, computed
+        once per (turn, perspective, history_length) and shared by every consumer.
+        The attack history is the enemy (player_2) actions of the last
+        `history_length` records, as returned by Player.get_opponent_recent_actions.
+        """
+        perspective = 1 if player is self.game_ref.player_1 else 2
+        key = (self.game_ref.turn, perspective, history_length)
+
+        likelihood = self._threat_cache.get(key)
+        if likelihood is None:
+            records_count = len(self._enemy_attack_prefix) - 1
+            window_start = max(0, records_count - int(history_length))
+            attack_count = self._enemy_attack_prefix[-1] - self._enemy_attack_prefix[window_start]
+
+            opponent = player.opponent
+            likelihood = self._threat_cache[key] = estimate_attack_likelihood(
+                attack_count,
+                history_length,
+                opponent.stamina,
+                opponent.health,
+                player.health,
+                player.is_shield_available,
+                opponent.action_in_turn
+            )
+
+        return likelihood
+
     def _extract_features(self, game_state: GameState) -> dict:
         p = game_state.player_1
         e = game_state.player_2
@@ -104,68 +155,7 @@ class Tracker:
         # ----------------------------
         # E. Estimation of enemy Attack Likelihood
         # ----------------------------
-
-        # --- Parameters ---
-        ATTACK_COST = Action.ATTACK.stamina_cost()
-        THREAT_THRESHOLD = self.THREAT_THRESHOLD
-
-        # 1. Behavioral Threat (attack frequency)
-        enemy_attack_count = sum(
-            1 for state in history
-            if state.player_2.action_in_turn == Action.ATTACK
-        )
-        attack_ratio = enemy_attack_count / self.HISTORY_LEN
-
-        behavioral_threat = max(
-            0.0,
-            (attack_ratio - THREAT_THRESHOLD) / (1.0 - THREAT_THRESHOLD)
-        )
-
-        # 2. Capability Score (HARD mechanical constraint)
-        if e.stamina < ATTACK_COST:
-            capability_score = 0.0
-        else:
-            stamina_surplus = (
-                (e.stamina - ATTACK_COST)
-                / (self.MAX_STAMINA - ATTACK_COST)
-            )
-            hp_confidence = min(e.health / self.MAX_HP, 1.0)
-
-            capability_score = (
-                0.7 * stamina_surplus +
-                0.3 * hp_confidence
-            )
-
-        capability_score = min(capability_score, 1.0)
-
-        # 3. Opportunity Score (player vulnerability)
-        opportunity_score = 0.0
-
-        if p.health <= 0.3 * self.MAX_HP:
-            opportunity_score += 0.5
-
-        if not p.is_shield_available:
-            opportunity_score += 0.3
-
-        last_enemy_action = history[-1].player_2.action_in_turn
-        if last_enemy_action == Action.ATTACK:
-            opportunity_score += 0.2
-
-        opportunity_score = min(opportunity_score, 1.0)
-
-        # 4. Momentum Score
-        momentum_score = 0.0
-
-        if attack_ratio >= 0.6:
-            momentum_score += 0.6
-
-        if last_enemy_action == Action.ATTACK:
-            momentum_score += 0.4
-
-        momentum_score = min(momentum_score, 1.0)
-
-        # 5. Final Composition
-        features["enemy_attack_likelihood"] = compute_imminent_attack_likely(self.game_ref.player_1, 5)
+        features["enemy_attack_likelihood"] = self.attack_likelihood(self.game_ref.player_1, self.HISTORY_LEN)
 
         return Tracker._enforce_features_order_then_return_as_list(features)
     
@@ -1,22 +1,237 @@
 import sqlite3
 import json
 import hashlib
+import functools
+import struct
+from concurrent.futures import Future
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Callable, List, Dict, Any, Optional, Tuple, Sequence, Iterator
+
+import numpy as np
 
 from duel_game.core.essential_types import DataSample
+from duel_game.core.essential_types import features as feature_names
+from duel_game.dataset.writer import BackgroundWriter
+from duel_game.dataset.migrations import Migration, Backfill, MigrationRunner, add_column_if_missing
+from duel_game.dataset.feature_schema import FEATURE_SCHEMA_FINGERPRINT, create_schema_table, stored_feature_adapter
+from duel_game.dataset.archive import encode_archive, iter_archive, DEFAULT_BLOCK_ROWS
+from duel_game.dataset.paging import (Page, filter_fingerprint, encode_page_token, decode_page_token,
+                                      check_page_size, to_timestamp, prefix_upper_bound)
+
+# one REAL column per feature in the columnar samples layout (same order as the feature vector)
+FEATURE_COLUMNS: Tuple[str, ...] = tuple(feature_names)
+
+# deduplicated samples are addressed by the feature vector packed as little-endian doubles
+_VECTOR_STRUCT = struct.Struct(f"<{len(FEATURE_COLUMNS)}d")
+_VECTOR_HASH_SIZE = 16
+
+
+def _pack_vector(features: Sequence[float]) -> bytes:
+    return _VECTOR_STRUCT.pack(*features)
+
+
+def _vector_hash(packed_features: bytes, label: int) -> bytes:
+    """Content address of a (features, label) pair"""
+    return hashlib.blake2b(packed_features + label.to_bytes(4, 'little', signed=True),
+                           digest_size=_VECTOR_HASH_SIZE).digest()
+
+
+def _rebuild_run_summaries(conn: sqlite3.Connection, run_ids: Optional[Sequence[int]] = None) -> None:
+    """
+    Recompute run_summary, run_label_counts and dataset_run.sample_count from
+    the live sample tables (all runs when `run_ids` is None) without committing.
+    Archived runs have no live rows, their summary is kept as archived.
+    """
+    if run_ids is None:
+        run_filter, params = "", {}
+    else:
+        run_filter, params = "WHERE run_id IN (SELECT value FROM json_each(:run_ids))", {'run_ids': json.dumps(list(run_ids))}
+
+    all_samples_sql = f"""
+        SELECT run_id, label, 1 AS multiplicity, created_at FROM samples {run_filter}
+        UNION ALL
+        SELECT run_id, label, 1, created_at FROM samples_columnar {run_filter}
+        UNION ALL
+        SELECT rsv.run_id, sv.label, rsv.count, NULL
+        FROM run_sample_vectors rsv JOIN sample_vectors sv ON sv.id = rsv.vector_id
+        {run_filter.replace("run_id", "rsv.run_id", 1)}
+    """
+    not_archived = "run_id NOT IN (SELECT run_id FROM archived_runs)"
+    summary_filter = f"{run_filter} AND {not_archived}" if run_filter else f"WHERE {not_archived}"
+
+    conn.execute(f"DELETE FROM run_summary {summary_filter}", params)
+    conn.execute(f"DELETE FROM run_label_counts {summary_filter}", params)
+
+    conn.execute(f"""
+        INSERT INTO run_summary (run_id, total_samples, first_sample, last_sample)
+        SELECT run_id, SUM(multiplicity), MIN(created_at), MAX(created_at)
+        FROM ({all_samples_sql})
+        GROUP BY run_id
+    """, params)
+
+    conn.execute(f"""
+        INSERT INTO run_label_counts (run_id, label, count)
+        SELECT run_id, label, SUM(multiplicity)
+        FROM ({all_samples_sql})
+        GROUP BY run_id, label
+    """, params)
+
+    conn.execute(f"""
+        UPDATE dataset_run
+        SET sample_count = COALESCE(
+            (SELECT total_samples FROM run_summary WHERE run_summary.run_id = dataset_run.id), 0
+        )
+        {run_filter.replace("run_id", "id", 1) + " AND" if run_filter else "WHERE"}
+        id NOT IN (SELECT run_id FROM archived_runs)
+    """, params)
+
+
+def _add_feature_schema_column(conn: sqlite3.Connection) -> None:
+    # runs created before fingerprints keep a NULL feature_schema and are read as they are
+    add_column_if_missing(conn, 'dataset_run', 'feature_schema', 'TEXT')
+    create_schema_table(conn)
+
+
+def _adapt_sample_features(samples: List[Dict[str, Any]], adapter: Optional[List[int]]) -> List[Dict[str, Any]]:
+    """Reorder the 'features' of sample dictionaries in place with a feature adapter"""
+    if adapter is not None:
+        for sample in samples:
+            sample['features'] = [sample['features'][index] for index in adapter]
+    return samples
+
+
+# ----------------------------
+# SCHEMA MIGRATIONS
+# ----------------------------
+# Version 1 is the schema _create_tables creates. New layout changes append a
+# migration here (idempotent DDL, bulk data changes as chunked backfills).
+DATASET_MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(1, 'baseline'),
+    Migration(2, 'backfill run summaries', backfill=Backfill(
+        keys_sql="SELECT id FROM dataset_run WHERE id > :after ORDER BY id LIMIT :limit",
+        count_sql="SELECT COUNT(*) FROM dataset_run WHERE id > :after",
+        apply_chunk=_rebuild_run_summaries
+    )),
+    Migration(3, 'feature schema fingerprints', apply=_add_feature_schema_column),
+    # create_run used to seed sample_count with a caller's estimate on top of the trigger counts
+    Migration(4, 'recount run samples', backfill=Backfill(
+        keys_sql="SELECT id FROM dataset_run WHERE id > :after ORDER BY id LIMIT :limit",
+        count_sql="SELECT COUNT(*) FROM dataset_run WHERE id > :after",
+        apply_chunk=_rebuild_run_summaries
+    )),
+)
+
+
+HIGH_THROUGHPUT_PRAGMAS = (
+    "PRAGMA journal_mode = WAL;",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA cache_size = -65536;",      # 64 MiB page cache
+    "PRAGMA mmap_size = 268435456;",    # 256 MiB memory mapped I/O
+    "PRAGMA temp_store = MEMORY;",
+)
+
+
+def _write_operation(method):
+    """Route a write method through the background writer when one is running"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._writer is not None:
+            return self._writer.submit(method.__name__, *args, **kwargs).result()
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _queued_write_operation(method):
+    """
+    Like _write_operation, but a call under the background writer returns the
+    write's Future right away instead of waiting for it (sample batches)
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._writer is not None:
+            return self._writer.submit(method.__name__, *args, **kwargs)
+        return method(self, *args, **kwargs)
+    return wrapper
+
 
 class DatasetRepository:
-    def __init__(self, db_path: str = "database.db"):
+    def __init__(self, db_path: str = "database.db", high_throughput: bool = False,
+                 writer_queue_size: int = 64, group_commit_rows: int = 5000, group_commit_interval: float = 0.5,
+                 auto_migrate: bool = True):
+        """
+        Args:
+            db_path: SQLite database file
+            high_throughput: Enable WAL and tuned pragmas and send every write
+                through a single background writer thread that group-commits.
+                Writes are then visible to readers after the next group commit
+                (see flush()). The batch sample stores (store_samples,
+                store_samples_array, store_samples_columnar,
+                store_samples_deduplicated) then return a Future of their
+                result instead of waiting for the writer.
+            writer_queue_size: Max queued write operations before producers block
+            group_commit_rows: Commit once this many rows are pending
+            group_commit_interval: Commit at most this many seconds after the first pending write
+            auto_migrate: Apply pending schema migrations on open (see migrations.py)
+        """
         self.db_path = Path(db_path)
-        self.conn = sqlite3.connect(self.db_path)
+        self.high_throughput = high_throughput
+        # the main connection may be used for reads from any thread in high throughput mode
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=not high_throughput)
         self.conn.row_factory = sqlite3.Row
 
         # IMPORTANT: enable foreign key enforcement in SQLite
         self.conn.execute("PRAGMA foreign_keys = ON;")
 
+        if high_throughput:
+            for pragma in HIGH_THROUGHPUT_PRAGMAS:
+                self.conn.execute(pragma)
+
+        # set on the writer thread's own repository, commits are then issued by the writer
+        self._defer_commits = False
+        self._writer: Optional[BackgroundWriter] = None
+
         self._create_tables()
+        if auto_migrate:
+            MigrationRunner(self.conn, 'dataset', DATASET_MIGRATIONS).migrate()
+
+        if high_throughput:
+            self._writer = BackgroundWriter(
+                self._open_writer_repository,
+                max_queue_size=writer_queue_size,
+                group_commit_rows=group_commit_rows,
+                group_commit_interval=group_commit_interval
+            )
+
+    def _open_writer_repository(self) -> 'DatasetRepository':
+        """Repository owned by the writer thread (its own connection, same pragmas)"""
+        repository = DatasetRepository(self.db_path)
+        for pragma in HIGH_THROUGHPUT_PRAGMAS:
+            repository.conn.execute(pragma)
+        return repository
+
+    def _commit(self):
+        if not self._defer_commits:
+            self.conn.commit()
+
+    def _rollback(self):
+        # under the writer, the failed operation is rolled back to its savepoint (see BackgroundWriter)
+        if not self._defer_commits:
+            self.conn.rollback()
+
+    def flush(self) -> None:
+        """Wait until every queued write is committed (no-op without a background writer)"""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def store_samples_async(self, samples: List[DataSample], run_id: int) -> Future:
+        """
+        Queue a batch of samples on the background writer without waiting for it.
+        Blocks only while the writer queue is full.
+        """
+        if self._writer is None:
+            raise RuntimeError("store_samples_async requires high_throughput=True")
+        return self.store_samples(samples, run_id)
 
     def _create_tables(self):
         cursor = self.conn.cursor()
@@ -50,6 +265,7 @@ class DatasetRepository:
             label TEXT,
             note TEXT,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            feature_schema TEXT,
 
             FOREIGN KEY (template_id)
                 REFERENCES config_template(id)
@@ -57,6 +273,9 @@ class DatasetRepository:
         );
         """)
 
+        # fingerprint -> feature order and normalization constants (see feature_schema.py)
+        create_schema_table(self.conn)
+
         # ----------------------------
         # SAMPLES TABLE
         # ----------------------------
@@ -74,6 +293,80 @@ class DatasetRepository:
         );
         """)
 
+        # ----------------------------
+        # COLUMNAR SAMPLES TABLE
+        # ----------------------------
+        # Same samples as `samples` but with one typed column per feature, so
+        # aggregates and filtered subsets run inside SQLite. `turn_number` is the
+        # raw game turn (the `turn` column is the normalized feature).
+        feature_columns_sql = ",\n            ".join(f"{name} REAL NOT NULL" for name in FEATURE_COLUMNS)
+        cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS samples_columnar (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id INTEGER NOT NULL,
+            label INTEGER NOT NULL,
+            turn_number INTEGER,
+            archetype TEXT,
+            {feature_columns_sql},
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+            FOREIGN KEY (run_id)
+                REFERENCES dataset_run(id)
+                ON DELETE CASCADE
+        );
+        """)
+
+        # ----------------------------
+        # DEDUPLICATED SAMPLE VECTORS
+        # ----------------------------
+        # Every distinct (features, label) pair is stored once, addressed by a
+        # hash of the packed vector and label. Runs reference vectors with a
+        # multiplicity, so repeated states cost one row per run.
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sample_vectors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            vector_hash BLOB NOT NULL UNIQUE,
+            features_json TEXT NOT NULL,
+            label INTEGER NOT NULL
+        );
+        """)
+
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS run_sample_vectors (
+            run_id INTEGER NOT NULL,
+            vector_id INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+
+            PRIMARY KEY (run_id, vector_id),
+            FOREIGN KEY (run_id)
+                REFERENCES dataset_run(id)
+                ON DELETE CASCADE,
+            FOREIGN KEY (vector_id)
+                REFERENCES sample_vectors(id)
+        ) WITHOUT ROWID;
+        """)
+
+        # ----------------------------
+        # ARCHIVED RUNS
+        # ----------------------------
+        # Cold runs packed into one compressed columnar blob (see archive.py),
+        # their row-per-sample data is removed. run_id is the rowid, so the blob
+        # can be read incrementally.
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS archived_runs (
+            run_id INTEGER PRIMARY KEY,
+            codec TEXT NOT NULL,
+            sample_count INTEGER NOT NULL,
+            live_bytes INTEGER NOT NULL,
+            archive BLOB NOT NULL,
+            archived_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+            FOREIGN KEY (run_id)
+                REFERENCES dataset_run(id)
+                ON DELETE CASCADE
+        );
+        """)
+
         # ----------------------------
         # INDEXES (CRITICAL FOR SCALE)
         # ----------------------------
@@ -87,12 +380,210 @@ class DatasetRepository:
         ON samples(run_id);
         """)
 
+        # covering indexes for per-run label counts
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_samples_run_label
+        ON samples(run_id, label);
+        """)
+
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_samples_columnar_run_label
+        ON samples_columnar(run_id, label);
+        """)
+
+        # run_index prefix filters are range scans on this index
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_run_run_index
+        ON dataset_run(run_index);
+        """)
+
+        # ----------------------------
+        # TEMPLATE LABEL SEARCH (FTS5)
+        # ----------------------------
+        # External-content FTS5 index with the trigram tokenizer, so substring
+        # label searches use the index instead of a LIKE '%...%' scan. SQLite
+        # builds without FTS5 (or trigram, < 3.34) fall back to LIKE.
+        fts_exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'config_template_fts'"
+        ).fetchone() is not None
+        try:
+            cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS config_template_fts USING fts5(
+                label, description,
+                content='config_template', content_rowid='id',
+                tokenize='trigram'
+            );
+            """)
+            self._template_fts = True
+        except sqlite3.OperationalError:
+            self._template_fts = False
+
+        if self._template_fts:
+            cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_config_template_fts_insert
+            AFTER INSERT ON config_template
+            BEGIN
+                INSERT INTO config_template_fts (rowid, label, description)
+                VALUES (NEW.id, NEW.label, NEW.description);
+            END;
+            """)
+
+            cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_config_template_fts_delete
+            AFTER DELETE ON config_template
+            BEGIN
+                INSERT INTO config_template_fts (config_template_fts, rowid, label, description)
+                VALUES ('delete', OLD.id, OLD.label, OLD.description);
+            END;
+            """)
+
+            cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_config_template_fts_update
+            AFTER UPDATE OF label, description ON config_template
+            BEGIN
+                INSERT INTO config_template_fts (config_template_fts, rowid, label, description)
+                VALUES ('delete', OLD.id, OLD.label, OLD.description);
+                INSERT INTO config_template_fts (rowid, label, description)
+                VALUES (NEW.id, NEW.label, NEW.description);
+            END;
+            """)
+
+            if not fts_exists:
+                cursor.execute("INSERT INTO config_template_fts (config_template_fts) VALUES ('rebuild')")
+
+        # ----------------------------
+        # RUN SUMMARY TABLES
+        # ----------------------------
+        # Kept current by the triggers below, so run statistics are read in
+        # constant time instead of scanning the run's samples.
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS run_summary (
+            run_id INTEGER PRIMARY KEY,
+            total_samples INTEGER NOT NULL DEFAULT 0,
+            first_sample DATETIME,
+            last_sample DATETIME,
+
+            FOREIGN KEY (run_id)
+                REFERENCES dataset_run(id)
+                ON DELETE CASCADE
+        );
+        """)
+
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS run_label_counts (
+            run_id INTEGER NOT NULL,
+            label INTEGER NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+
+            PRIMARY KEY (run_id, label),
+            FOREIGN KEY (run_id)
+                REFERENCES dataset_run(id)
+                ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """)
+
+        # ----------------------------
+        # SUMMARY TRIGGERS
+        # ----------------------------
+        # Both sample layouts count towards the run. Deletes do not narrow the
+        # first/last bounds (that would need a scan), rebuild_run_summary does.
+        for table in ('samples', 'samples_columnar'):
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_summary_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO run_summary (run_id, total_samples, first_sample, last_sample)
+                VALUES (NEW.run_id, 1, NEW.created_at, NEW.created_at)
+                ON CONFLICT (run_id) DO UPDATE SET
+                    total_samples = total_samples + 1,
+                    first_sample = COALESCE(MIN(first_sample, excluded.first_sample), excluded.first_sample),
+                    last_sample = COALESCE(MAX(last_sample, excluded.last_sample), excluded.last_sample);
+
+                INSERT INTO run_label_counts (run_id, label, count)
+                VALUES (NEW.run_id, NEW.label, 1)
+                ON CONFLICT (run_id, label) DO UPDATE SET count = count + 1;
+
+                UPDATE dataset_run SET sample_count = sample_count + 1 WHERE id = NEW.run_id;
+            END;
+            """)
+
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_summary_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                UPDATE run_summary SET
+                    total_samples = total_samples - 1,
+                    first_sample = CASE WHEN total_samples > 1 THEN first_sample END,
+                    last_sample = CASE WHEN total_samples > 1 THEN last_sample END
+                WHERE run_id = OLD.run_id;
+
+                UPDATE run_label_counts SET count = count - 1
+                WHERE run_id = OLD.run_id AND label = OLD.label;
+
+                UPDATE dataset_run SET sample_count = sample_count - 1 WHERE id = OLD.run_id;
+            END;
+            """)
+
+        # deduplicated runs count every reference with its multiplicity
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_run_sample_vectors_summary_insert
+        AFTER INSERT ON run_sample_vectors
+        BEGIN
+            INSERT INTO run_summary (run_id, total_samples, first_sample, last_sample)
+            VALUES (NEW.run_id, NEW.count, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            ON CONFLICT (run_id) DO UPDATE SET
+                total_samples = total_samples + excluded.total_samples,
+                first_sample = COALESCE(first_sample, excluded.first_sample),
+                last_sample = excluded.last_sample;
+
+            INSERT INTO run_label_counts (run_id, label, count)
+            VALUES (NEW.run_id, (SELECT label FROM sample_vectors WHERE id = NEW.vector_id), NEW.count)
+            ON CONFLICT (run_id, label) DO UPDATE SET count = count + excluded.count;
+
+            UPDATE dataset_run SET sample_count = sample_count + NEW.count WHERE id = NEW.run_id;
+        END;
+        """)
+
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_run_sample_vectors_summary_update
+        AFTER UPDATE OF count ON run_sample_vectors
+        BEGIN
+            UPDATE run_summary SET
+                total_samples = total_samples + NEW.count - OLD.count,
+                last_sample = CURRENT_TIMESTAMP
+            WHERE run_id = NEW.run_id;
+
+            UPDATE run_label_counts SET count = count + NEW.count - OLD.count
+            WHERE run_id = NEW.run_id AND label = (SELECT label FROM sample_vectors WHERE id = NEW.vector_id);
+
+            UPDATE dataset_run SET sample_count = sample_count + NEW.count - OLD.count WHERE id = NEW.run_id;
+        END;
+        """)
+
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_run_sample_vectors_summary_delete
+        AFTER DELETE ON run_sample_vectors
+        BEGIN
+            UPDATE run_summary SET
+                total_samples = total_samples - OLD.count,
+                first_sample = CASE WHEN total_samples > OLD.count THEN first_sample END,
+                last_sample = CASE WHEN total_samples > OLD.count THEN last_sample END
+            WHERE run_id = OLD.run_id;
+
+            UPDATE run_label_counts SET count = count - OLD.count
+            WHERE run_id = OLD.run_id AND label = (SELECT label FROM sample_vectors WHERE id = OLD.vector_id);
+
+            UPDATE dataset_run SET sample_count = sample_count - OLD.count WHERE id = OLD.run_id;
+        END;
+        """)
+
         self.conn.commit()
 
     def _generate_config_hash(self, config_json: str) -> str:
         """Generate a hash for the configuration JSON."""
         return hashlib.sha256(config_json.encode()).hexdigest()
 
+    @_write_operation
     def create_config_template(self, config_json: str, app_version: int, label: str, description: str = "") -> int:
         """
         Create a new configuration template.
@@ -115,7 +606,7 @@ class DatasetRepository:
             VALUES (?, ?, ?, ?, ?, ?)
         """, (app_version, config_version, label, config_hash, config_json, description))
         
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
 
     def get_config_template(self, template_id: int) -> Dict[str, Any]:
@@ -203,15 +694,15 @@ class DatasetRepository:
         max_index = row['max_index'] if row['max_index'] is not None else 0
         return int(max_index) + 1
 
-    def create_run(self, template_id: int, label: str, samples_count: int, 
-                  seed: int, note: str = "") -> int:
+    @_write_operation
+    def create_run(self, template_id: int, label: str, *, seed: int, note: str = "") -> int:
         """
-        Create a new dataset run.
+        Create a new dataset run. Its sample_count starts at 0 and is
+        maintained by the insert/delete triggers as samples are stored.
         
         Args:
             template_id: The template ID to associate with
             label: Label for this run
-            samples_count: Expected number of samples
             seed: Random seed used for this run
             note: Optional note
             
@@ -228,108 +719,69 @@ class DatasetRepository:
         
         cursor = self.conn.cursor()
         cursor.execute("""
-            INSERT INTO dataset_run (template_id, run_index, sample_count, seed, label, note)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (template_id, run_index, samples_count, seed, label, note))
+            INSERT INTO dataset_run (template_id, run_index, sample_count, seed, label, note, feature_schema)
+            VALUES (?, ?, 0, ?, ?, ?, ?)
+        """, (template_id, run_index, seed, label, note, FEATURE_SCHEMA_FINGERPRINT))
         
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
 
+    @_write_operation
     def set_samples_count_for_run(self, run_id, samples_count):
         """
-        Update the sample_count for a specific dataset run.
-        
+        Overwrite the sample_count of a dataset run.
+
+        sample_count is maintained by triggers as samples are inserted or
+        deleted, so this is only needed to correct it by hand.
+
         Args:
             run_id (int): The ID of the dataset run to update
             samples_count (int): The new sample count value (must be non-negative)
-        
+
         Returns:
-            bool: True if update was successful, False otherwise
-        
+            bool: True if the run exists and was updated, False otherwise
+
         Raises:
             ValueError: If samples_count is negative
             TypeError: If run_id or samples_count are not integers
         """
-        # Input validation
         if not isinstance(run_id, int):
             raise TypeError(f"run_id must be an integer, got {type(run_id).__name__}")
-        
+
         if not isinstance(samples_count, int):
             raise TypeError(f"samples_count must be an integer, got {type(samples_count).__name__}")
-        
+
         if samples_count < 0:
             raise ValueError(f"samples_count must be non-negative, got {samples_count}")
-        
-        # If run_id doesn't exist, we can handle it gracefully or raise error
-        if run_id <= 0:
-            raise ValueError(f"run_id must be positive, got {run_id}")
-        
-        try:
-            # Use parameterized query to prevent SQL injection
-            cursor = self.conn.cursor()
-            
-            # First check if the run exists
-            cursor.execute("""
-                SELECT id FROM dataset_run WHERE id = ?
-            """, (run_id,))
-            
-            if not cursor.fetchone():
-                # Option 1: Log warning and return False
-                print(f"Warning: Run with ID {run_id} not found")
-                return False
-                
-                # Option 2: Raise an exception (uncomment if preferred)
-                # raise ValueError(f"Run with ID {run_id} not found")
-            
-            # Update the sample count
-            cursor.execute("""
-                UPDATE dataset_run 
-                SET sample_count = ?
-                WHERE id = ?
-            """, (samples_count, run_id))
-            
-            # Check if any row was actually updated
-            if cursor.rowcount == 0:
-                print(f"Warning: No rows updated for run_id {run_id}")
-                return False
-            
-            # Commit the transaction
-            self.conn.commit()
-            
-            # Verify the update (optional but good for debugging)
-            cursor.execute("""
-                SELECT sample_count FROM dataset_run WHERE id = ?
-            """, (run_id,))
-            
-            updated_value = cursor.fetchone()[0]
-            if updated_value == samples_count:
-                print(f"Successfully updated run {run_id} sample_count to {samples_count}")
-                return True
-            else:
-                print(f"Warning: Update may have failed. Expected {samples_count}, got {updated_value}")
-                return False
-                
-        except sqlite3.Error as e:
-            # Rollback in case of error
-            self.conn.rollback()
-            print(f"Database error occurred: {e}")
-            return False
-        
-        except Exception as e:
-            # Catch any other unexpected errors
-            print(f"Unexpected error occurred: {e}")
-            return False
+
+        cursor = self.conn.execute("""
+            UPDATE dataset_run
+            SET sample_count = ?
+            WHERE id = ?
+        """, (samples_count, run_id))
+
+        self._commit()
+        return cursor.rowcount > 0
 
     def get_run_samples(self, run_id: int) -> List[Dict[str, Any]]:
         """
-        Get all samples for a specific run.
+        Get all samples for a specific run: its JSON rows, then its columnar
+        rows, then its deduplicated vectors (expanded by count, in vector
+        order), or the run's archive (float32 precision, ids are row
+        positions). A run may hold rows in several layouts, e.g. after
+        storing into one layout and then another.
         
         Args:
             run_id: The run ID
             
         Returns:
             List of sample dictionaries
+
+        Raises:
+            FeatureSchemaMismatch: The run's features cannot be adapted to the current schema
         """
+        adapter = self.get_run_feature_adapter(run_id)
+
         cursor = self.conn.cursor()
         cursor.execute("""
             SELECT id, features_json, label, created_at
@@ -346,9 +798,35 @@ class DatasetRepository:
                 'label': row['label'],
                 'created_at': row['created_at']
             })
+
+        # then the rows stored (or moved) into the columnar layout
+        cursor.execute(f"""
+            SELECT id, label, created_at, {", ".join(FEATURE_COLUMNS)}
+            FROM samples_columnar
+            WHERE run_id = ?
+            ORDER BY id
+        """, (run_id,))
+
+        for row in cursor.fetchall():
+            samples.append({
+                'id': row['id'],
+                'features': [row[name] for name in FEATURE_COLUMNS],
+                'label': row['label'],
+                'created_at': row['created_at']
+            })
+
+        for vector in self.get_run_vectors(run_id):
+            sample = {'id': vector['id'], 'features': vector['features'], 'label': vector['label'], 'created_at': None}
+            samples.extend(dict(sample) for _ in range(vector['count']))
+
+        if not samples and self.is_run_archived(run_id):
+            for features, labels in self._iter_archive_batches(run_id):
+                for sample_features, label in zip(features.tolist(), labels.tolist()):
+                    samples.append({'id': len(samples), 'features': sample_features, 'label': label, 'created_at': None})
         
-        return samples
+        return _adapt_sample_features(samples, adapter)
 
+    @_write_operation
     def store_sample(self, features: List[float], label: int, run_id: int) -> int:
         """
         Create a single sample.
@@ -369,9 +847,10 @@ class DatasetRepository:
             VALUES (?, ?, ?)
         """, (run_id, features_json, label))
         
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
 
+    @_queued_write_operation
     def store_samples(self, samples: List[DataSample], run_id: int) -> List[int]:
         """
         Create multiple samples in a batch.
@@ -391,24 +870,357 @@ class DatasetRepository:
         """
         if not samples:
             return []
-        
-        cursor = self.conn.cursor()
-        sample_ids = []
-        
-        # Batch insert for efficiency
-        for sample in samples:
-            features_json = json.dumps(sample.features)
-            label = sample.label.value
-            
-            cursor.execute( """
+
+        try:
+            self.conn.executemany("""
                 INSERT INTO samples (run_id, features_json, label)
                 VALUES (?, ?, ?)
-            """, (run_id, features_json, label))
+            """, ((run_id, json.dumps(sample.features), sample.label.value) for sample in samples))
+            # one statement on this connection, the AUTOINCREMENT ids are consecutive
+            last_id = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            self._commit()
+        except sqlite3.Error:
+            self._rollback()
+            raise
+
+        return list(range(last_id - len(samples) + 1, last_id + 1))
+
+    @_queued_write_operation
+    def store_samples_array(self, features: np.ndarray, labels: np.ndarray, run_id: int) -> int:
+        """
+        Store samples given as a (samples x features) matrix and a label
+        vector, e.g. the output of a SimulationArena, in the JSON layout.
+
+        Returns:
+            Number of stored samples
+        """
+        if len(features) != len(labels):
+            raise ValueError(f"features has {len(features)} rows but labels has {len(labels)}")
+
+        try:
+            self.conn.executemany("""
+                INSERT INTO samples (run_id, features_json, label)
+                VALUES (?, ?, ?)
+            """, (
+                (run_id, json.dumps(row), label)
+                for row, label in zip(np.asarray(features).tolist(), np.asarray(labels).tolist())
+            ))
+            self._commit()
+        except sqlite3.Error:
+            self._rollback()
+            raise
+
+        return len(labels)
+
+    @_queued_write_operation
+    def store_samples_columnar(self, samples: List[DataSample], run_id: int,
+                               archetype: Optional[str | Sequence[str]] = None) -> int:
+        """
+        Store samples in the columnar layout (one REAL column per feature).
+        
+        Args:
+            samples: List of DataSample objects
+            run_id: The run ID to associate with
+            archetype: Archetype of the sampled player, either one value for
+                all samples or one value per sample
             
-            sample_ids.append(cursor.lastrowid)
+        Returns:
+            Number of stored samples
+        """
+        if not samples:
+            return 0
+
+        if archetype is None or isinstance(archetype, str):
+            archetypes = [archetype] * len(samples)
+        else:
+            archetypes = list(archetype)
+            if len(archetypes) != len(samples):
+                raise ValueError(f"Got {len(archetypes)} archetypes for {len(samples)} samples")
+
+        columns = ("run_id", "label", "turn_number", "archetype") + FEATURE_COLUMNS
+        placeholders = ", ".join("?" for _ in columns)
+
+        try:
+            self.conn.executemany(f"""
+                INSERT INTO samples_columnar ({", ".join(columns)})
+                VALUES ({placeholders})
+            """, (
+                (run_id, int(sample.label), sample.turn, sample_archetype, *sample.features)
+                for sample, sample_archetype in zip(samples, archetypes)
+            ))
+            self._commit()
+        except sqlite3.Error:
+            self._rollback()
+            raise
+
+        return len(samples)
+
+    @_write_operation
+    def migrate_run_to_columnar(self, run_id: int) -> int:
+        """
+        Move a run's JSON samples into the columnar layout inside SQLite.
+
+        Args:
+            run_id: The run ID
+
+        Returns:
+            Number of migrated samples
+        """
+        # the JSON layout stores feature lists, older rows may hold name -> value objects
+        extract_sql = ",\n                   ".join(
+            f"COALESCE(json_extract(features_json, '$[{index}]'), json_extract(features_json, '$.{name}'))"
+            for index, name in enumerate(FEATURE_COLUMNS)
+        )
+
+        try:
+            cursor = self.conn.execute(f"""
+                INSERT INTO samples_columnar (run_id, label, created_at, {", ".join(FEATURE_COLUMNS)})
+                SELECT run_id, label, created_at,
+                       {extract_sql}
+                FROM samples
+                WHERE run_id = ?
+                ORDER BY id
+            """, (run_id,))
+            migrated = cursor.rowcount
+
+            self.conn.execute("DELETE FROM samples WHERE run_id = ?", (run_id,))
+
+            self._commit()
+        except sqlite3.Error:
+            self._rollback()
+            raise
+
+        return migrated
+
+    @_queued_write_operation
+    def store_samples_deduplicated(self, samples: List[DataSample], run_id: int) -> Dict[str, int]:
+        """
+        Store samples content-addressed: each distinct (features, label) pair
+        is written to sample_vectors once and the run references it with a
+        multiplicity count.
+
+        Args:
+            samples: List of DataSample objects
+            run_id: The run ID to associate with
+
+        Returns:
+            Dictionary with the number of samples, distinct vectors in the batch
+            and vectors that were new to the database
+        """
+        counts: Dict[bytes, int] = {}
+        vectors: Dict[bytes, Tuple[str, int]] = {}
+        for sample in samples:
+            label = int(sample.label)
+            vector_hash = _vector_hash(_pack_vector(sample.features), label)
+            if vector_hash in counts:
+                counts[vector_hash] += 1
+            else:
+                counts[vector_hash] = 1
+                vectors[vector_hash] = (json.dumps(sample.features), label)
+
+        try:
+            changes_before = self.conn.total_changes
+            self.conn.executemany("""
+                INSERT OR IGNORE INTO sample_vectors (vector_hash, features_json, label)
+                VALUES (?, ?, ?)
+            """, [(vector_hash, features_json, label) for vector_hash, (features_json, label) in vectors.items()])
+            new_vectors = self.conn.total_changes - changes_before
+
+            references = []
+            for vector_hash, count in counts.items():
+                vector_id = self.conn.execute(
+                    "SELECT id FROM sample_vectors WHERE vector_hash = ?", (vector_hash,)
+                ).fetchone()[0]
+                references.append((run_id, vector_id, count))
+
+            self.conn.executemany("""
+                INSERT INTO run_sample_vectors (run_id, vector_id, count)
+                VALUES (?, ?, ?)
+                ON CONFLICT (run_id, vector_id) DO UPDATE SET count = count + excluded.count
+            """, references)
+
+            self._commit()
+        except sqlite3.Error:
+            self._rollback()
+            raise
+
+        return {'samples': len(samples), 'unique_vectors': len(vectors), 'new_vectors': new_vectors}
+
+    def get_run_vectors(self, run_id: int) -> List[Dict[str, Any]]:
+        """
+        Get the distinct sample vectors of a deduplicated run with their multiplicity.
+
+        Args:
+            run_id: The run ID
+
+        Returns:
+            List of dictionaries with id, features, label and count
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT sv.id, sv.features_json, sv.label, rsv.count
+            FROM run_sample_vectors rsv
+            JOIN sample_vectors sv ON sv.id = rsv.vector_id
+            WHERE rsv.run_id = ?
+            ORDER BY rsv.vector_id
+        """, (run_id,))
+
+        return [
+            {
+                'id': row['id'],
+                'features': json.loads(row['features_json']),
+                'label': row['label'],
+                'count': row['count']
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def get_weighted_samples(self, run_id: int) -> Tuple[List[List[float]], List[int], List[int]]:
+        """
+        Training data of a deduplicated run without expanding duplicates,
+        pass the counts as sample weights.
+
+        Returns:
+            (X, y, counts)
+        """
+        adapter = self.get_run_feature_adapter(run_id)
+        vectors = _adapt_sample_features(self.get_run_vectors(run_id), adapter)
+        return (
+            [vector['features'] for vector in vectors],
+            [vector['label'] for vector in vectors],
+            [vector['count'] for vector in vectors]
+        )
+
+    def get_dedup_report(self, run_id: int) -> Dict[str, Any]:
+        """
+        Storage and training-size savings of a deduplicated run compared to
+        storing every sample as its own JSON row.
+
+        Deduplicated bytes count each vector of the run once with its content
+        hash; vectors shared with other runs are stored only once in total, so
+        the real saving is at least `bytes_saved`. Training cost is estimated
+        by rows: a weighted fit over the distinct vectors touches
+        `training_rows` instead of `samples`.
+
+        Args:
+            run_id: The run ID
+
+        Returns:
+            Dictionary with the report
+        """
+        vectors = self.get_run_vectors(run_id)
+        sample_total = sum(vector['count'] for vector in vectors)
+        json_sizes = [len(json.dumps(vector['features'])) for vector in vectors]
+        json_bytes = sum(size * vector['count'] for size, vector in zip(json_sizes, vectors))
+        vector_bytes = sum(json_sizes) + len(vectors) * _VECTOR_HASH_SIZE
+
+        return {
+            'samples': sample_total,
+            'unique_vectors': len(vectors),
+            'duplicate_ratio': 1 - len(vectors) / sample_total if sample_total else 0.0,
+            'json_feature_bytes': json_bytes,
+            'deduplicated_bytes': vector_bytes,
+            'bytes_saved': json_bytes - vector_bytes,
+            'training_rows': len(vectors),
+            'training_speedup_estimate': sample_total / len(vectors) if vectors else 1.0
+        }
+
+    @staticmethod
+    def _check_feature_column(name: str) -> str:
+        if name not in FEATURE_COLUMNS:
+            raise ValueError(f"Unknown feature column {name!r}")
+        return name
+
+    def get_feature_means(self, run_id: int, label: Optional[int] = None) -> Dict[str, Optional[float]]:
+        """
+        Mean of every feature of a columnar run, optionally for a single label.
+        """
+        where_sql = "WHERE run_id = ?" + (" AND label = ?" if label is not None else "")
+        params = (run_id,) if label is None else (run_id, label)
+
+        row = self.conn.execute(f"""
+            SELECT {", ".join(f"AVG({name}) AS {name}" for name in FEATURE_COLUMNS)}
+            FROM samples_columnar
+            {where_sql}
+        """, params).fetchone()
+
+        return {name: row[name] for name in FEATURE_COLUMNS}
+
+    def get_class_balance(self, run_id: int, group_by: Optional[str] = None) -> Dict[Any, Dict[int, int]]:
+        """
+        Label counts of a columnar run, optionally grouped by a feature column
+        (e.g. 'low_hp') or by 'archetype'.
         
-        self.conn.commit()
-        return sample_ids
+        Returns:
+            {group value: {label: count}}, the group value is None when not grouped
+        """
+        if group_by is None:
+            group_sql = "NULL"
+        elif group_by == "archetype":
+            group_sql = "archetype"
+        else:
+            group_sql = self._check_feature_column(group_by)
+
+        cursor = self.conn.execute(f"""
+            SELECT {group_sql} AS group_value, label, COUNT(*) AS count
+            FROM samples_columnar
+            WHERE run_id = ?
+            GROUP BY group_value, label
+        """, (run_id,))
+
+        balance: Dict[Any, Dict[int, int]] = {}
+        for row in cursor.fetchall():
+            balance.setdefault(row['group_value'], {})[row['label']] = row['count']
+        return balance
+
+    def get_training_subset(self, run_id: int, labels: Optional[Sequence[int]] = None,
+                            archetypes: Optional[Sequence[str]] = None,
+                            feature_ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None
+                            ) -> Tuple[List[List[float]], List[int]]:
+        """
+        Filtered feature matrix and labels of a columnar run.
+        
+        Args:
+            run_id: The run ID
+            labels: Keep only these labels
+            archetypes: Keep only these archetypes
+            feature_ranges: feature name -> (min, max), inclusive, None for open ends
+            
+        Returns:
+            (features, labels)
+        """
+        conditions = ["run_id = ?"]
+        params: List[Any] = [run_id]
+
+        if labels is not None:
+            conditions.append(f"label IN ({', '.join('?' for _ in labels)})")
+            params.extend(int(label) for label in labels)
+
+        if archetypes is not None:
+            conditions.append(f"archetype IN ({', '.join('?' for _ in archetypes)})")
+            params.extend(archetypes)
+
+        for name, (low, high) in (feature_ranges or {}).items():
+            self._check_feature_column(name)
+            if low is not None:
+                conditions.append(f"{name} >= ?")
+                params.append(low)
+            if high is not None:
+                conditions.append(f"{name} <= ?")
+                params.append(high)
+
+        cursor = self.conn.execute(f"""
+            SELECT label, {", ".join(FEATURE_COLUMNS)}
+            FROM samples_columnar
+            WHERE {" AND ".join(conditions)}
+            ORDER BY id
+        """, params)
+
+        X, y = [], []
+        for row in cursor:
+            y.append(row[0])
+            X.append(list(row[1:]))
+        return X, y
 
     def get_run_info(self, run_id: int) -> Dict[str, Any]:
         """
@@ -423,7 +1235,7 @@ class DatasetRepository:
         cursor = self.conn.cursor()
         cursor.execute("""
             SELECT dr.id, dr.template_id, dr.run_index, dr.sample_count, 
-                   dr.seed, dr.label, dr.note, dr.created_at,
+                   dr.seed, dr.label, dr.note, dr.created_at, dr.feature_schema,
                    ct.label as template_label
             FROM dataset_run dr
             JOIN config_template ct ON dr.template_id = ct.id
@@ -443,9 +1255,25 @@ class DatasetRepository:
             'seed': row['seed'],
             'label': row['label'],
             'note': row['note'],
-            'created_at': row['created_at']
+            'created_at': row['created_at'],
+            'feature_schema': row['feature_schema']
         }
 
+    def get_run_feature_adapter(self, run_id: int) -> Optional[List[int]]:
+        """
+        Check a run's feature schema fingerprint against the current one
+        (one primary key lookup, before any sample is read).
+
+        Returns:
+            None when the run's features can be used as they are, otherwise
+            the column indexes that adapt them to the current schema
+
+        Raises:
+            FeatureSchemaMismatch: The features cannot be adapted
+        """
+        row = self.conn.execute("SELECT feature_schema FROM dataset_run WHERE id = ?", (run_id,)).fetchone()
+        return stored_feature_adapter(self.conn, row['feature_schema'] if row else None)
+
     def get_all_runs_for_template(self, template_id: int) -> List[Dict[str, Any]]:
         """
         Get all runs for a specific template.
@@ -478,6 +1306,7 @@ class DatasetRepository:
         
         return runs
 
+    @_write_operation
     def update_sample_count(self, run_id: int, new_count: int) -> None:
         """
         Update the sample count for a run.
@@ -493,8 +1322,9 @@ class DatasetRepository:
             WHERE id = ?
         """, (new_count, run_id))
         
-        self.conn.commit()
+        self._commit()
 
+    @_write_operation
     def delete_run(self, run_id: int) -> bool:
         """
         Delete a run and all its samples (cascading delete).
@@ -509,12 +1339,189 @@ class DatasetRepository:
         cursor.execute("DELETE FROM dataset_run WHERE id = ?", (run_id,))
         deleted = cursor.rowcount > 0
         
-        self.conn.commit()
+        self._commit()
         return deleted
 
+    @_write_operation
+    def prune_sample_vectors(self) -> int:
+        """
+        Delete deduplicated vectors no run references anymore.
+
+        Returns:
+            Number of deleted vectors
+        """
+        cursor = self.conn.execute("""
+            DELETE FROM sample_vectors
+            WHERE NOT EXISTS (SELECT 1 FROM run_sample_vectors WHERE vector_id = sample_vectors.id)
+        """)
+        self._commit()
+        return cursor.rowcount
+
+    # ----------------------------
+    # ARCHIVAL
+    # ----------------------------
+
+    def is_run_archived(self, run_id: int) -> bool:
+        return self.conn.execute("SELECT 1 FROM archived_runs WHERE run_id = ?", (run_id,)).fetchone() is not None
+
+    def _live_bytes(self, run_id: int) -> int:
+        """Feature payload bytes of a run's live rows (JSON text, or 8 bytes per REAL column)"""
+        return self.conn.execute(f"""
+            SELECT COALESCE((SELECT SUM(length(features_json)) FROM samples WHERE run_id = :run_id), 0)
+                 + COALESCE((SELECT COUNT(*) FROM samples_columnar WHERE run_id = :run_id), 0) * {8 * len(FEATURE_COLUMNS)}
+                 + COALESCE((SELECT SUM(length(sv.features_json))
+                             FROM run_sample_vectors rsv JOIN sample_vectors sv ON sv.id = rsv.vector_id
+                             WHERE rsv.run_id = :run_id), 0)
+        """, {'run_id': run_id}).fetchone()[0]
+
+    def _live_sample_count(self, run_id: int) -> int:
+        """Samples in a run's live rows over every layout, vectors counted with their multiplicity"""
+        return self.conn.execute("""
+            SELECT (SELECT COUNT(*) FROM samples WHERE run_id = :run_id)
+                 + (SELECT COUNT(*) FROM samples_columnar WHERE run_id = :run_id)
+                 + COALESCE((SELECT SUM(count) FROM run_sample_vectors WHERE run_id = :run_id), 0)
+        """, {'run_id': run_id}).fetchone()[0]
+
+    def _live_layouts(self, run_id: int) -> List[str]:
+        """Every layout holding live rows of a run, in the order get_run_samples prefers them"""
+        return [
+            layout
+            for layout, table in (('json', 'samples'), ('columnar', 'samples_columnar'),
+                                  ('vectors', 'run_sample_vectors'))
+            if self.conn.execute(f"SELECT 1 FROM {table} WHERE run_id = ? LIMIT 1", (run_id,)).fetchone()
+        ]
+
+    def _iter_live_batches(self, run_id: int, batch_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """(features float32, labels) batches over every live layout of a run, vectors expanded by count"""
+        page_token = None
+        while True:
+            page = self._run_samples_page(run_id, None, None, batch_size, page_token)
+            if page.items:
+                counts = [item.get('count', 1) for item in page.items]
+                features = np.asarray([item['features'] for item in page.items], dtype=np.float32)
+                labels = np.asarray([item['label'] for item in page.items], dtype=np.int64)
+                yield np.repeat(features, counts, axis=0), np.repeat(labels, counts)
+            if page.next_page_token is None:
+                return
+            page_token = page.next_page_token
+
+    def _iter_archive_batches(self, run_id: int, start_row: int = 0) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        with self.conn.blobopen('archived_runs', 'archive', run_id, readonly=True) as blob:
+            def read(offset: int, length: int) -> bytes:
+                blob.seek(offset)
+                return blob.read(length)
+
+            yield from iter_archive(read, start_row)
+
+    def iter_run_batches(self, run_id: int, batch_size: int = DEFAULT_BLOCK_ROWS) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Stream a run as (features, labels) numpy batches, features as float32.
+        Archived runs are decompressed one block at a time straight from the
+        blob (their batches follow the archive's block size), live runs are
+        read page by page.
+
+        Args:
+            run_id: The run ID
+            batch_size: Samples per batch for live runs
+        """
+        adapter = self.get_run_feature_adapter(run_id)
+        if self.is_run_archived(run_id):
+            batches = ((features, labels.astype(np.int64)) for features, labels in self._iter_archive_batches(run_id))
+        else:
+            batches = self._iter_live_batches(run_id, batch_size)
+
+        for features, labels in batches:
+            yield (features if adapter is None else features[:, adapter]), labels
+
+    @_write_operation
+    def archive_run(self, run_id: int, codec: str = 'zlib', block_rows: int = DEFAULT_BLOCK_ROWS) -> Dict[str, Any]:
+        """
+        Pack a run's samples into one compressed columnar blob in archived_runs
+        and delete its row-per-sample data. Features are kept as float32.
+        A run with rows in several layouts is archived whole, layout after
+        layout (JSON, columnar, then deduplicated vectors).
+        The run summary and sample_count are preserved. Freed pages are reused
+        by later writes, VACUUM shrinks the file.
+
+        Args:
+            run_id: The run ID
+            codec: 'zlib' (faster) or 'lzma' (smaller)
+            block_rows: Samples per independently compressed block
+
+        Returns:
+            The archive report (see get_archive_info)
+        """
+        if self.is_run_archived(run_id):
+            raise ValueError(f"Run {run_id} is already archived")
+
+        live_bytes = self._live_bytes(run_id)
+        live_count = self._live_sample_count(run_id)
+        archive, sample_count = encode_archive(self._iter_live_batches(run_id, block_rows), len(FEATURE_COLUMNS),
+                                               codec, block_rows)
+        # the live rows are deleted next, never lose any that did not make it into the archive
+        if sample_count != live_count:
+            raise ValueError(f"Archive of run {run_id} holds {sample_count} samples, the run has {live_count}")
+
+        # deleting the live rows fires the summary triggers, the run's summary is restored afterwards
+        summary = self.conn.execute("SELECT * FROM run_summary WHERE run_id = ?", (run_id,)).fetchone()
+        label_counts = self.conn.execute(
+            "SELECT label, count FROM run_label_counts WHERE run_id = ?", (run_id,)
+        ).fetchall()
+
+        try:
+            self.conn.execute("""
+                INSERT INTO archived_runs (run_id, codec, sample_count, live_bytes, archive)
+                VALUES (?, ?, ?, ?, ?)
+            """, (run_id, codec, sample_count, live_bytes, archive))
+
+            for table in ('samples', 'samples_columnar', 'run_sample_vectors'):
+                self.conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+            if summary is not None:
+                self.conn.execute("""
+                    UPDATE run_summary SET total_samples = ?, first_sample = ?, last_sample = ?
+                    WHERE run_id = ?
+                """, (summary['total_samples'], summary['first_sample'], summary['last_sample'], run_id))
+            self.conn.executemany(
+                "UPDATE run_label_counts SET count = ? WHERE run_id = ? AND label = ?",
+                [(row['count'], run_id, row['label']) for row in label_counts]
+            )
+            self.conn.execute("UPDATE dataset_run SET sample_count = ? WHERE id = ?", (sample_count, run_id))
+
+            self._commit()
+        except sqlite3.Error:
+            self._rollback()
+            raise
+
+        return self.get_archive_info(run_id)
+
+    def get_archive_info(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Compression report of an archived run, None if the run is not archived.
+        `live_bytes` is the feature payload the run's rows held before archiving.
+        """
+        row = self.conn.execute("""
+            SELECT run_id, codec, sample_count, live_bytes, length(archive) AS archive_bytes, archived_at
+            FROM archived_runs WHERE run_id = ?
+        """, (run_id,)).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            'run_id': row['run_id'],
+            'codec': row['codec'],
+            'samples': row['sample_count'],
+            'live_bytes': row['live_bytes'],
+            'archive_bytes': row['archive_bytes'],
+            'compression_ratio': row['live_bytes'] / row['archive_bytes'] if row['archive_bytes'] else 0.0,
+            'archived_at': row['archived_at']
+        }
+
     def get_sample_statistics(self, run_id: int) -> Dict[str, Any]:
         """
-        Get statistics about samples in a run.
+        Get statistics about samples in a run, read from the trigger-maintained
+        summary tables in constant time.
         
         Args:
             run_id: The run ID
@@ -523,43 +1530,72 @@ class DatasetRepository:
             Dictionary with statistics
         """
         cursor = self.conn.cursor()
-        
-        # Count samples by label
+
         cursor.execute("""
-            SELECT label, COUNT(*) as count
-            FROM samples
-            WHERE run_id = ?
-            GROUP BY label
+            SELECT label, count
+            FROM run_label_counts
+            WHERE run_id = ? AND count > 0
+            ORDER BY label
         """, (run_id,))
-        
-        label_counts = {}
-        total_samples = 0
-        for row in cursor.fetchall():
-            label_counts[row['label']] = row['count']
-            total_samples += row['count']
-        
-        # Get date range
+        label_counts = {row['label']: row['count'] for row in cursor.fetchall()}
+
         cursor.execute("""
-            SELECT MIN(created_at) as first_sample, MAX(created_at) as last_sample
-            FROM samples
+            SELECT total_samples, first_sample, last_sample
+            FROM run_summary
             WHERE run_id = ?
         """, (run_id,))
-        
-        date_row = cursor.fetchone()
-        
+        summary_row = cursor.fetchone()
+
+        if summary_row is None:
+            return {
+                'total_samples': 0,
+                'label_distribution': label_counts,
+                'first_sample': None,
+                'last_sample': None
+            }
+
         return {
-            'total_samples': total_samples,
+            'total_samples': summary_row['total_samples'],
             'label_distribution': label_counts,
-            'first_sample': date_row['first_sample'],
-            'last_sample': date_row['last_sample']
+            'first_sample': summary_row['first_sample'],
+            'last_sample': summary_row['last_sample']
         }
 
+    @_write_operation
+    def rebuild_run_summary(self, run_id: Optional[int] = None) -> None:
+        """
+        Recompute run summaries, label counts and sample_count from the samples
+        tables. The triggers keep them current (older databases are backfilled
+        by schema migration 2), this narrows first/last bounds after deletes.
+
+        Args:
+            run_id: Rebuild only this run (all runs when None)
+        """
+        try:
+            _rebuild_run_summaries(self.conn, None if run_id is None else [run_id])
+            self._commit()
+        except sqlite3.Error:
+            self._rollback()
+            raise
+
+    def _template_label_condition(self, label_query: str) -> Tuple[str, Tuple[Any, ...]]:
+        """SQL condition on config_template `ct` matching labels that contain `label_query`"""
+        # the trigram index needs at least 3 characters, LIKE wildcards keep LIKE semantics
+        if self._template_fts and len(label_query) >= 3 and not any(c in label_query for c in '%_'):
+            phrase = '"' + label_query.replace('"', '""') + '"'
+            return (
+                "ct.id IN (SELECT rowid FROM config_template_fts WHERE config_template_fts MATCH ?)",
+                (f"label : {phrase}",)
+            )
+        return "ct.label LIKE ?", (f"%{label_query}%",)
+
     def search_config_templates(self, label_pattern: str = None) -> List[Dict[str, Any]]:
         """
         Search for configuration templates by label.
         
         Args:
-            label_pattern: SQL LIKE pattern for label search
+            label_pattern: Substring of the label (served by the FTS5 index
+                when it has 3+ characters, otherwise an SQL LIKE pattern)
             
         Returns:
             List of matching templates
@@ -567,12 +1603,13 @@ class DatasetRepository:
         cursor = self.conn.cursor()
         
         if label_pattern:
-            cursor.execute("""
-                SELECT id, label, config_hash, description, created_at
-                FROM config_template
-                WHERE label LIKE ?
-                ORDER BY created_at DESC
-            """, (f"%{label_pattern}%",))
+            condition, params = self._template_label_condition(label_pattern)
+            cursor.execute(f"""
+                SELECT ct.id, ct.label, ct.config_hash, ct.description, ct.created_at
+                FROM config_template ct
+                WHERE {condition}
+                ORDER BY ct.created_at DESC
+            """, params)
         else:
             cursor.execute("""
                 SELECT id, label, config_hash, description, created_at
@@ -592,11 +1629,301 @@ class DatasetRepository:
         
         return templates
 
+    # ----------------------------
+    # KEYSET PAGINATION
+    # ----------------------------
+
+    def _fetch_page(self, query_name: str, filters: Dict[str, Any], sql: str, params: List[Any],
+                    key_column: str, page_size: int, page_token: Optional[str], to_item) -> Page:
+        """
+        Run `sql` (a SELECT whose WHERE clause ends where the keyset condition
+        is appended) and return one page ordered by `key_column`.
+        """
+        check_page_size(page_size)
+        fingerprint = filter_fingerprint(query_name, filters)
+        last_key = decode_page_token(page_token, fingerprint)
+
+        if last_key is not None:
+            sql += f" AND {key_column} > ?"
+            params = params + [last_key]
+        sql += f" ORDER BY {key_column} LIMIT ?"
+
+        rows = self.conn.execute(sql, params + [page_size + 1]).fetchall()
+        items = [to_item(row) for row in rows[:page_size]]
+        next_page_token = None
+        if len(rows) > page_size:
+            next_page_token = encode_page_token(fingerprint, rows[page_size - 1]['page_key'])
+
+        return Page(items, next_page_token)
+
+    def list_runs(self, template_id: Optional[int] = None, app_version: Optional[int] = None,
+                  label: Optional[str] = None, run_index_prefix: Optional[str] = None,
+                  created_after: Optional[str | datetime] = None, created_before: Optional[str | datetime] = None,
+                  page_size: int = 100, page_token: Optional[str] = None) -> Page:
+        """
+        One page of dataset runs in creation (id) order.
+
+        Args:
+            template_id: Only runs of this template
+            app_version: Only runs whose template has this app version
+            label: Exact run label
+            run_index_prefix: e.g. "2.3." for every run of app 2, template version 3
+            created_after: Inclusive lower bound on created_at
+            created_before: Exclusive upper bound on created_at
+            page_size: Max runs per page
+            page_token: next_page_token of the previous page
+
+        Returns:
+            Page of run dictionaries
+        """
+        filters = {
+            'template_id': template_id, 'app_version': app_version, 'label': label,
+            'run_index_prefix': run_index_prefix,
+            'created_after': to_timestamp(created_after), 'created_before': to_timestamp(created_before)
+        }
+
+        sql = """
+            SELECT dr.id AS page_key, dr.id, dr.template_id, dr.run_index, dr.sample_count,
+                   dr.seed, dr.label, dr.note, dr.created_at, ct.app_version
+            FROM dataset_run dr
+            JOIN config_template ct ON dr.template_id = ct.id
+            WHERE 1 = 1
+        """
+        params: List[Any] = []
+        if template_id is not None:
+            sql += " AND dr.template_id = ?"
+            params.append(template_id)
+        if app_version is not None:
+            sql += " AND ct.app_version = ?"
+            params.append(app_version)
+        if label is not None:
+            sql += " AND dr.label = ?"
+            params.append(label)
+        if run_index_prefix:
+            sql += " AND dr.run_index >= ? AND dr.run_index < ?"
+            params += [run_index_prefix, prefix_upper_bound(run_index_prefix)]
+        if filters['created_after'] is not None:
+            sql += " AND dr.created_at >= ?"
+            params.append(filters['created_after'])
+        if filters['created_before'] is not None:
+            sql += " AND dr.created_at < ?"
+            params.append(filters['created_before'])
+
+        return self._fetch_page('runs', filters, sql, params, 'dr.id', page_size, page_token, lambda row: {
+            'id': row['id'],
+            'template_id': row['template_id'],
+            'app_version': row['app_version'],
+            'run_index': row['run_index'],
+            'sample_count': row['sample_count'],
+            'seed': row['seed'],
+            'label': row['label'],
+            'note': row['note'],
+            'created_at': row['created_at']
+        })
+
+    def list_config_templates(self, label_query: Optional[str] = None, app_version: Optional[int] = None,
+                              created_after: Optional[str | datetime] = None,
+                              created_before: Optional[str | datetime] = None,
+                              page_size: int = 100, page_token: Optional[str] = None) -> Page:
+        """
+        One page of configuration templates in creation (id) order.
+
+        Args:
+            label_query: Substring of the label (see search_config_templates)
+            app_version: Only templates of this app version
+            created_after: Inclusive lower bound on created_at
+            created_before: Exclusive upper bound on created_at
+            page_size: Max templates per page
+            page_token: next_page_token of the previous page
+
+        Returns:
+            Page of template dictionaries (without config_json)
+        """
+        filters = {
+            'label_query': label_query, 'app_version': app_version,
+            'created_after': to_timestamp(created_after), 'created_before': to_timestamp(created_before)
+        }
+
+        sql = """
+            SELECT ct.id AS page_key, ct.id, ct.app_version, ct.version, ct.label,
+                   ct.config_hash, ct.description, ct.created_at
+            FROM config_template ct
+            WHERE 1 = 1
+        """
+        params: List[Any] = []
+        if label_query:
+            condition, condition_params = self._template_label_condition(label_query)
+            sql += f" AND {condition}"
+            params += condition_params
+        if app_version is not None:
+            sql += " AND ct.app_version = ?"
+            params.append(app_version)
+        if filters['created_after'] is not None:
+            sql += " AND ct.created_at >= ?"
+            params.append(filters['created_after'])
+        if filters['created_before'] is not None:
+            sql += " AND ct.created_at < ?"
+            params.append(filters['created_before'])
+
+        return self._fetch_page('templates', filters, sql, params, 'ct.id', page_size, page_token, lambda row: {
+            'id': row['id'],
+            'app_version': row['app_version'],
+            'version': row['version'],
+            'label': row['label'],
+            'config_hash': row['config_hash'],
+            'description': row['description'],
+            'created_at': row['created_at']
+        })
+
+    def _run_sample_layouts(self, run_id: int) -> List[str]:
+        """Layouts get_run_samples reads a run from: its live layouts in order, or ['archived']"""
+        layouts = self._live_layouts(run_id)
+        if not layouts and self.is_run_archived(run_id):
+            return ['archived']
+        return layouts or ['json']
+
+    def get_run_samples_page(self, run_id: int, labels: Optional[Sequence[int]] = None,
+                             archetype: Optional[str] = None,
+                             page_size: int = 1000, page_token: Optional[str] = None) -> Page:
+        """
+        One page of a run's samples, in the order get_run_samples returns them
+        (JSON rows, then columnar rows, then deduplicated vectors). Vectors
+        are paged as distinct vectors, each item then carries its `count`.
+
+        Args:
+            run_id: The run ID
+            labels: Only these labels
+            archetype: Only samples of this policy archetype (columnar layout only)
+            page_size: Max samples per page
+            page_token: next_page_token of the previous page
+
+        Returns:
+            Page of sample dictionaries
+        """
+        adapter = self.get_run_feature_adapter(run_id)
+        page = self._run_samples_page(run_id, labels, archetype, page_size, page_token)
+        _adapt_sample_features(page.items, adapter)
+        return page
+
+    def _run_samples_page(self, run_id: int, labels: Optional[Sequence[int]], archetype: Optional[str],
+                          page_size: int, page_token: Optional[str]) -> Page:
+        """Keyset page over every layout of a run, keyed by [layout, last key in that layout]"""
+        layouts = self._run_sample_layouts(run_id)
+        if archetype is not None and layouts != ['columnar']:
+            raise ValueError(f"archetype filter needs the columnar layout, run {run_id} is stored as {layouts!r}")
+
+        filters = {'run_id': run_id, 'layouts': layouts, 'labels': sorted(labels) if labels else None,
+                   'archetype': archetype}
+        if layouts == ['archived']:
+            return self._archived_samples_page(run_id, filters, labels, page_size, page_token)
+
+        check_page_size(page_size)
+        fingerprint = filter_fingerprint('run_samples', filters)
+        last_position = decode_page_token(page_token, fingerprint)
+        first_layout, last_key = (0, None) if last_position is None else (layouts.index(last_position[0]),
+                                                                           last_position[1])
+
+        items: List[Dict[str, Any]] = []
+        position = None
+        for layout in layouts[first_layout:]:
+            sql, params, key_column, to_item = self._layout_page_query(run_id, layout, labels, archetype)
+            if last_key is not None:
+                sql += f" AND {key_column} > ?"
+                params.append(last_key)
+            last_key = None
+            # one row more than the page holds tells whether another page follows
+            sql += f" ORDER BY {key_column} LIMIT ?"
+            params.append(page_size - len(items) + 1)
+
+            for row in self.conn.execute(sql, params):
+                if len(items) == page_size:
+                    return Page(items, encode_page_token(fingerprint, position))
+                items.append(to_item(row))
+                position = [layout, row['page_key']]
+
+        return Page(items, None)
+
+    def _layout_page_query(self, run_id: int, layout: str, labels: Optional[Sequence[int]],
+                           archetype: Optional[str]) -> Tuple[str, List[Any], str, Callable]:
+        """(sql ending in its WHERE clause, params, key column, row -> item) of one live layout"""
+        params: List[Any] = [run_id]
+
+        if layout == 'json':
+            sql = "SELECT id AS page_key, id, features_json, label, created_at FROM samples WHERE run_id = ?"
+            key_column = 'id'
+            to_item = lambda row: {'id': row['id'], 'features': json.loads(row['features_json']),
+                                   'label': row['label'], 'created_at': row['created_at']}
+        elif layout == 'columnar':
+            sql = f"""
+                SELECT id AS page_key, id, label, archetype, created_at, {", ".join(FEATURE_COLUMNS)}
+                FROM samples_columnar WHERE run_id = ?
+            """
+            key_column = 'id'
+            to_item = lambda row: {'id': row['id'], 'features': [row[name] for name in FEATURE_COLUMNS],
+                                   'label': row['label'], 'archetype': row['archetype'],
+                                   'created_at': row['created_at']}
+            if archetype is not None:
+                sql += " AND archetype = ?"
+                params.append(archetype)
+        else:
+            sql = """
+                SELECT rsv.vector_id AS page_key, sv.id, sv.features_json, sv.label, rsv.count
+                FROM run_sample_vectors rsv
+                JOIN sample_vectors sv ON sv.id = rsv.vector_id
+                WHERE rsv.run_id = ?
+            """
+            key_column = 'rsv.vector_id'
+            to_item = lambda row: {'id': row['id'], 'features': json.loads(row['features_json']),
+                                   'label': row['label'], 'count': row['count']}
+
+        if labels:
+            label_column = 'sv.label' if layout == 'vectors' else 'label'
+            sql += f" AND {label_column} IN ({', '.join('?' for _ in labels)})"
+            params += [int(label) for label in labels]
+
+        return sql, params, key_column, to_item
+
+    def _archived_samples_page(self, run_id: int, filters: Dict[str, Any], labels: Optional[Sequence[int]],
+                               page_size: int, page_token: Optional[str]) -> Page:
+        """Keyset page over an archive, keyed by row position"""
+        check_page_size(page_size)
+        fingerprint = filter_fingerprint('run_samples', filters)
+        last_row = decode_page_token(page_token, fingerprint)
+        row = 0 if last_row is None else last_row + 1
+        wanted = None if not labels else {int(label) for label in labels}
+
+        items: List[Dict[str, Any]] = []
+        for features, block_labels in self._iter_archive_batches(run_id, start_row=row):
+            for sample_features, label in zip(features.tolist(), block_labels.tolist()):
+                if wanted is None or label in wanted:
+                    if len(items) == page_size:
+                        return Page(items, encode_page_token(fingerprint, items[-1]['id']))
+                    items.append({'id': row, 'features': sample_features, 'label': label, 'created_at': None})
+                row += 1
+
+        return Page(items, None)
+
+    def iter_run_samples(self, run_id: int, labels: Optional[Sequence[int]] = None,
+                         archetype: Optional[str] = None, page_size: int = 1000):
+        """Yield a run's samples page by page without loading the whole run"""
+        page_token = None
+        while True:
+            page = self.get_run_samples_page(run_id, labels, archetype, page_size, page_token)
+            yield from page.items
+            if page.next_page_token is None:
+                return
+            page_token = page.next_page_token
+
     def close(self):
         """Close the database connection."""
-        if self.conn:
-            self.conn.close()
-            print('database connection has closed')
+        try:
+            if self._writer is not None:
+                self._writer.close()
+        finally:
+            self._writer = None
+            if self.conn:
+                self.conn.close()
+                print('database connection has closed')
 
     def __enter__(self):
         return self
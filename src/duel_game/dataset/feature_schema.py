@@ -0,0 +1,122 @@
+"""
+Feature schema fingerprints.
+
+A feature vector only means something together with the feature order of
+essential_types.features and the Tracker normalization constants. The
+schema is computed once at import and identified by a short fingerprint that
+is stored with every dataset run (dataset_run.feature_schema), every stored
+model (models.feature_schema) and in model artifacts. Loading compares one
+string; only on a mismatch the stored schema is looked up to decide whether
+the data can be adapted (same constants, the current features are a
+reordering or subset of the stored ones) or must be refused.
+
+Rows written before fingerprints existed have no fingerprint and are read
+as they are.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import sqlite3
+
+from duel_game.core.essential_types import features as feature_names
+from duel_game.core.ml_model import TrainedModel
+from duel_game.dataset.data_processor import Tracker
+
+
+class FeatureSchemaMismatch(ValueError):
+    """Stored features or weights cannot be used with the current feature schema"""
+
+
+def feature_schema() -> Dict[str, Any]:
+    """Everything the meaning of a feature vector depends on"""
+    return {
+        'features': list(feature_names),
+        'HISTORY_LEN': Tracker.HISTORY_LEN,
+        'MAX_HP': Tracker.MAX_HP,
+        'MAX_STAMINA': Tracker.MAX_STAMINA,
+        'MAX_TURN': Tracker.MAX_TURN,
+    }
+
+
+def schema_fingerprint(schema: Dict[str, Any]) -> str:
+    encoded = json.dumps(schema, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+FEATURE_SCHEMA = feature_schema()
+FEATURE_SCHEMA_FINGERPRINT = schema_fingerprint(FEATURE_SCHEMA)
+
+
+def feature_adapter(stored: Dict[str, Any], current: Dict[str, Any] = FEATURE_SCHEMA) -> Optional[List[int]]:
+    """
+    Column indexes that turn `stored` feature vectors into `current` ones.
+
+    Returns:
+        None when the schemas are the same, the indexes when the current
+        features can be picked from the stored ones
+
+    Raises:
+        FeatureSchemaMismatch: Different normalization constants or missing features
+    """
+    if stored == current:
+        return None
+
+    stored_constants = {key: value for key, value in stored.items() if key != 'features'}
+    current_constants = {key: value for key, value in current.items() if key != 'features'}
+    if stored_constants != current_constants:
+        raise FeatureSchemaMismatch(
+            f"Feature normalization changed from {stored_constants} to {current_constants}, regenerate the data"
+        )
+
+    missing = [name for name in current['features'] if name not in stored['features']]
+    if missing:
+        raise FeatureSchemaMismatch(f"Stored features lack {missing}, regenerate the data")
+
+    return [stored['features'].index(name) for name in current['features']]
+
+
+# ----------------------------
+# Schema registry (shared by the dataset and model tables)
+# ----------------------------
+def create_schema_table(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS feature_schemas (
+        fingerprint TEXT PRIMARY KEY,
+        schema_json TEXT NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+    conn.execute(
+        "INSERT OR IGNORE INTO feature_schemas (fingerprint, schema_json) VALUES (?, ?)",
+        (FEATURE_SCHEMA_FINGERPRINT, json.dumps(FEATURE_SCHEMA, sort_keys=True))
+    )
+
+
+def stored_feature_adapter(conn: sqlite3.Connection, fingerprint: Optional[str]) -> Optional[List[int]]:
+    """feature_adapter for data stored with `fingerprint`, None for the current or an unknown (legacy) schema"""
+    if fingerprint is None or fingerprint == FEATURE_SCHEMA_FINGERPRINT:
+        return None
+
+    row = conn.execute("SELECT schema_json FROM feature_schemas WHERE fingerprint = ?", (fingerprint,)).fetchone()
+    if row is None:
+        raise FeatureSchemaMismatch(f"Feature schema {fingerprint} is not registered in this database")
+    return feature_adapter(json.loads(row[0]))
+
+
+def adapt_weights(weights: Dict[Any, List[float]], adapter: Optional[List[int]]) -> Dict[Any, List[float]]:
+    """Reorder [intercept, *coefficients] weight vectors with a feature adapter"""
+    if adapter is None:
+        return weights
+    return {action: [vector[0]] + [vector[1 + index] for index in adapter] for action, vector in weights.items()}
+
+
+def model_from_artifact(artifact: Dict[str, Any]) -> TrainedModel:
+    """
+    TrainedModel of a model artifact ({"weights": ..., "feature_schema": ...}),
+    with the weights adapted to the current schema. Artifacts without a
+    schema are trusted as they are.
+    """
+    schema = artifact.get('feature_schema')
+    adapter = feature_adapter(schema) if schema is not None else None
+    return TrainedModel(adapt_weights(artifact['weights'], adapter))
@@ -0,0 +1,258 @@
+"""
+Vectorized featurizer: recompute dataset samples from replay logs.
+
+Matches are processed in chunks padded to a (matches x turns) grid. The
+player states are rebuilt from the logged actions and dodge outcomes with one
+NumPy step per turn over the whole chunk, then every feature column of
+Tracker._extract_features is computed for all turns at once, the action
+history windows with sliding window views. The output is the samples
+Tracker would have recorded, row for row, in log order.
+
+    python -m duel_game.dataset.featurizer --db data/database.sqlite --log data/replays.dgr --template-id 3 [--workers 8]
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import os
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from duel_game.core.essential_types import Action
+from duel_game.core.essential_types import features as feature_names
+from duel_game.core.replay import Replay, ReplayReader
+from duel_game.dataset.data_processor import Tracker
+
+DEFAULT_CHUNK_MATCHES = 4096
+
+MAX_HP = 100
+MAX_STAMINA = 100
+
+# stamina cost per action code, index 0 is padding
+_STAMINA_COST = np.array([0] + [Action(code).stamina_cost() for code in range(1, 6)], dtype=np.int64)
+
+
+def _rule_column(replays: Sequence[Replay], name: str) -> np.ndarray:
+    """One DuelGame rule constant per match (replays may mix rule versions)"""
+    return np.array([getattr(replay.rules, name) for replay in replays], dtype=np.int64)
+
+
+def reconstruct_states(replays: Sequence[Replay]) -> Dict[str, np.ndarray]:
+    """
+    Player states as Tracker records them (after the turn's stamina and
+    shield updates and the action choices, before combat resolution).
+
+    Returns:
+        (matches x max turns) arrays: action_1, action_2, health_1, health_2,
+        stamina_1, stamina_2, shield_1, shield_2, and the `valid` turn mask
+    """
+    count = len(replays)
+    length = max((replay.turns for replay in replays), default=0)
+    valid = np.zeros((count, length), dtype=bool)
+    codes = np.zeros((count, length), dtype=np.uint8)
+    for row, replay in enumerate(replays):
+        codes[row, :replay.turns] = replay.codes
+        valid[row, :replay.turns] = True
+
+    action_1 = (codes & 0b111).astype(np.int64)
+    action_2 = ((codes >> 3) & 0b111).astype(np.int64)
+    dodge_works = (codes & (1 << 6)) != 0
+
+    attack_damage = _rule_column(replays, 'attack_damage')
+    heal_amount = _rule_column(replays, 'heal_amount')
+    stamina_gain = _rule_column(replays, 'increase_stamina_each_turn')
+    shield_duration = _rule_column(replays, 'sheild_spawn_duration')
+
+    states = {name: np.zeros((count, length), dtype=np.int64)
+              for name in ('health_1', 'health_2', 'stamina_1', 'stamina_2')}
+    states['shield_1'] = np.zeros((count, length), dtype=bool)
+    states['shield_2'] = np.zeros((count, length), dtype=bool)
+
+    health = [np.full(count, MAX_HP, dtype=np.int64), np.full(count, MAX_HP, dtype=np.int64)]
+    stamina = [np.full(count, MAX_STAMINA, dtype=np.int64), np.full(count, MAX_STAMINA, dtype=np.int64)]
+    shield_cd = [np.zeros(count, dtype=np.int64), np.zeros(count, dtype=np.int64)]
+    actions = (action_1, action_2)
+
+    for turn in range(length):
+        for player in (0, 1):
+            # DuelGame._update_player_state_before_turn
+            stamina[player] = np.minimum(MAX_STAMINA, stamina[player] + stamina_gain)
+            shield_cd[player] = np.maximum(0, shield_cd[player] - 1)
+            states[f'health_{player + 1}'][:, turn] = health[player]
+            states[f'stamina_{player + 1}'][:, turn] = stamina[player]
+            states[f'shield_{player + 1}'][:, turn] = shield_cd[player] == 0
+
+        for player in (0, 1):
+            # DuelGame._update_player_state_based_on_actions
+            action = actions[player][:, turn]
+            attacked = actions[1 - player][:, turn] == Action.ATTACK
+            stamina[player] = stamina[player] - _STAMINA_COST[action]
+            health[player] = np.where(action == Action.HEAL, np.minimum(MAX_HP, health[player] + heal_amount), health[player])
+
+            defended = attacked & (action == Action.DEFENSE)
+            shield_cd[player] = np.where(defended, shield_duration, shield_cd[player])
+            hit = attacked & (action != Action.DEFENSE) & ~((action == Action.DODGE) & dodge_works[:, turn])
+            health[player] = np.where(hit, np.maximum(0, health[player] - attack_damage), health[player])
+
+    return {'action_1': action_1, 'action_2': action_2, 'valid': valid, **states}
+
+
+def _window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum over the last `window` turns (fewer at the start) along axis 1"""
+    padded = np.concatenate([np.zeros((values.shape[0], window - 1), dtype=values.dtype), values], axis=1)
+    return sliding_window_view(padded, window, axis=1).sum(axis=2)
+
+
+def attack_likelihood_columns(attack_count: np.ndarray, history_length: int, opponent_stamina: np.ndarray,
+                              opponent_hp: np.ndarray, your_hp: np.ndarray, your_shield_available: np.ndarray,
+                              opponent_last_attack: np.ndarray) -> np.ndarray:
+    """helpers.estimate_attack_likelihood over arrays, with the same operation order"""
+    attack_cost = Action.ATTACK.stamina_cost()
+    behavioral_threat = attack_count / history_length
+
+    stamina_surplus = (opponent_stamina - attack_cost) / (MAX_STAMINA - attack_cost)
+    hp_confidence = np.minimum(opponent_hp / 100.0, 1.0)
+    capability_score = np.where(opponent_stamina < attack_cost, 0.0, 0.7 * stamina_surplus + 0.3 * hp_confidence)
+    capability_score = np.minimum(capability_score, 1.0)
+
+    opportunity_score = np.zeros(attack_count.shape)
+    opportunity_score = opportunity_score + np.where(your_hp <= 30, 0.5, 0.0)
+    opportunity_score = opportunity_score + np.where(~your_shield_available, 0.3, 0.0)
+    opportunity_score = opportunity_score + np.where(opponent_last_attack, 0.2, 0.0)
+    opportunity_score = np.minimum(opportunity_score, 1.0)
+
+    momentum_score = np.zeros(attack_count.shape)
+    momentum_score = momentum_score + np.where(behavioral_threat >= 0.6, 0.6, 0.0)
+    momentum_score = momentum_score + np.where(opponent_last_attack, 0.4, 0.0)
+    momentum_score = np.minimum(momentum_score, 1.0)
+
+    likelihood = 0.40 * behavioral_threat + 0.30 * capability_score + 0.20 * opportunity_score + 0.10 * momentum_score
+    return np.minimum(np.maximum(likelihood, 0.0), 1.0)
+
+
+def featurize_replays(replays: Sequence[Replay]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Recompute the Tracker samples of whole matches at once.
+
+    Returns:
+        (features float64 samples x features in essential_types.features order,
+         labels int8, turns int32), the matches' samples concatenated in order
+    """
+    if not replays:
+        return np.empty((0, len(feature_names))), np.empty(0, dtype=np.int8), np.empty(0, dtype=np.int32)
+
+    states = reconstruct_states(replays)
+    valid = states['valid']
+    action_1, action_2 = states['action_1'], states['action_2']
+    health_1, health_2 = states['health_1'], states['health_2']
+    stamina_1, stamina_2 = states['stamina_1'], states['stamina_2']
+    shield_1 = states['shield_1']
+
+    history = int(Tracker.HISTORY_LEN)
+    turns = np.broadcast_to(np.arange(1, valid.shape[1] + 1), valid.shape)
+
+    columns = {
+        "player_hp": health_1 / Tracker.MAX_HP,
+        "enemy_hp": health_2 / Tracker.MAX_HP,
+        "player_stamina": stamina_1 / Tracker.MAX_STAMINA,
+        "enemy_stamina": stamina_2 / Tracker.MAX_STAMINA,
+        "turn": np.minimum(turns / Tracker.MAX_TURN, 1.0),
+        "shield_available": shield_1.astype(np.float64),
+    }
+
+    for action in (Action.ATTACK, Action.DEFENSE, Action.DODGE, Action.HEAL):
+        name = action.name.lower()
+        columns[f"count_{name}"] = _window_sum((action_1 == action).astype(np.int64), history) / Tracker.HISTORY_LEN
+        columns[f"last_{name}"] = (action_1 == action).astype(np.float64)
+
+    columns["stamina_spent_recent"] = _window_sum(_STAMINA_COST[action_1], history) / (Tracker.MAX_STAMINA * Tracker.HISTORY_LEN)
+    # the window's health differences add up to the last minus the first health of the window
+    window_start = np.maximum(turns - history, 0)
+    columns["hp_delta_recent"] = (health_1 - np.take_along_axis(health_1, window_start, axis=1)) / Tracker.MAX_HP
+
+    columns["can_attack"] = (stamina_1 >= Action.ATTACK.stamina_cost()).astype(np.float64)
+    columns["can_heal"] = (stamina_1 >= Action.HEAL.stamina_cost()).astype(np.float64)
+    columns["can_dodge"] = (stamina_1 >= Action.DODGE.stamina_cost()).astype(np.float64)
+    columns["can_defend"] = shield_1.astype(np.float64)
+
+    columns["hp_diff"] = (health_1 - health_2) / Tracker.MAX_HP
+    columns["low_hp"] = (health_1 < 0.3 * Tracker.MAX_HP).astype(np.float64)
+    columns["low_stamina"] = (stamina_1 < 0.3 * Tracker.MAX_STAMINA).astype(np.float64)
+
+    enemy_attacks = action_2 == Action.ATTACK
+    columns["enemy_attack_likelihood"] = attack_likelihood_columns(
+        _window_sum(enemy_attacks.astype(np.int64), history), history,
+        stamina_2, health_2, health_1, shield_1, enemy_attacks
+    )
+
+    missing = [name for name in feature_names if name not in columns]
+    if missing:
+        raise ValueError(f"The vectorized featurizer has no column for {missing}, add it next to Tracker._extract_features")
+
+    features = np.stack([columns[name][valid] for name in feature_names], axis=1)
+    return features, action_1[valid].astype(np.int8), turns[valid].astype(np.int32)
+
+
+def _featurize_log_slice(log_path: str, start: int, end: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Worker process entry point: featurize matches [start, end) of a replay log"""
+    with ReplayReader(log_path) as reader:
+        return featurize_replays(reader.read(range(start, end)))
+
+
+def featurize_log(log_path: str, worker_count: Optional[int] = None,
+                  chunk_matches: int = DEFAULT_CHUNK_MATCHES) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Featurize every match of a replay log in chunks of `chunk_matches`,
+    spread over `worker_count` processes (one process when 1).
+    """
+    with ReplayReader(log_path) as reader:
+        match_count = len(reader)
+    chunks = [(start, min(start + chunk_matches, match_count)) for start in range(0, match_count, chunk_matches)]
+
+    worker_count = worker_count or os.cpu_count() or 1
+    if worker_count == 1 or len(chunks) <= 1:
+        results = [_featurize_log_slice(str(log_path), start, end) for start, end in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=worker_count) as executor:
+            results = list(executor.map(_featurize_log_slice, [str(log_path)] * len(chunks),
+                                        [start for start, _ in chunks], [end for _, end in chunks]))
+
+    if not results:
+        return featurize_replays([])
+    return tuple(np.concatenate(parts) for parts in zip(*results))
+
+
+def featurize_log_into_run(repo, log_path: str, template_id: int, label: str, note: str = "",
+                           worker_count: Optional[int] = None, chunk_matches: int = DEFAULT_CHUNK_MATCHES) -> int:
+    """Featurize a replay log into a new dataset run of `repo` (a DatasetRepository), returns the run id"""
+    features, labels, _ = featurize_log(log_path, worker_count, chunk_matches)
+    with ReplayReader(log_path) as reader:
+        seeds = {replay.run_seed for replay in reader}
+    seed = seeds.pop() if len(seeds) == 1 and None not in seeds else 0
+
+    run_id = repo.create_run(template_id, label, seed=seed, note=note or f"featurized from {log_path}")
+    repo.store_samples_array(features, labels, run_id)
+    return run_id
+
+
+def main(argv: Optional[List[str]] = None):
+    from duel_game.dataset.dataset_repo import DatasetRepository
+
+    parser = argparse.ArgumentParser(prog='python -m duel_game.dataset.featurizer')
+    parser.add_argument('--db', required=True, help='main database file')
+    parser.add_argument('--log', required=True, help='replay log to featurize')
+    parser.add_argument('--template-id', type=int, required=True, help='config template of the new run')
+    parser.add_argument('--label', default='refeaturized')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-matches', type=int, default=DEFAULT_CHUNK_MATCHES)
+    args = parser.parse_args(argv)
+
+    with DatasetRepository(args.db) as repo:
+        run_id = featurize_log_into_run(repo, args.log, args.template_id, args.label,
+                                        worker_count=args.workers, chunk_matches=args.chunk_matches)
+        print(f"Run {run_id}: {repo.get_sample_statistics(run_id)['total_samples']} samples")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Any, Type, Iterator, Optional
+import math
+
+from duel_game.core.game import DuelGame
+from duel_game.core.player import DummyPlayer, Policy, Aggressive, Defensive, Balanced, Healer, Opportunist, RandomBiased
+from duel_game.core.essential_types import DataSample
+from duel_game.core.seeding import spawn_match_rngs
+from duel_game.core.replay import ReplayWriter, MatchRecorder
+from duel_game.dataset.data_processor import Tracker
+
+
+ARCHETYPE_CLASSES: Dict[str, Type[Policy]] = {
+    "Aggressive": Aggressive,
+    "Defensive": Defensive,
+    "Balanced": Balanced,
+    "Healer": Healer,
+    "Opportunist": Opportunist,
+    "RandomBiased": RandomBiased,
+}
+
+ARCHETYPE_ORDER = [
+    "Aggressive",
+    "Defensive",
+    "Balanced",
+    "Healer",
+    "Opportunist",
+    "RandomBiased",
+]
+
+
+@dataclass(frozen=True)
+class Pairing:
+    """One (policy, opponent) cell of a dataset run and how many samples it must produce"""
+    index: int
+    policy_name: str
+    opponent_name: str
+    target_samples: int
+
+
+def plan_run_pairings(config: Dict[str, Any], samples_count: int) -> List[Pairing]:
+    """
+    Split the run's sample budget into pairings using the policy and opponent
+    distributions of the run configuration.
+    """
+    pairings = []
+    policy_distribution = config["DUMMY_PLAYER_POLICIES_DATA_DISTRIBUTION_IN_RUN"]
+
+    for policy_name, policy_ratio in zip(ARCHETYPE_ORDER, policy_distribution):
+        policy_target = math.ceil(samples_count * policy_ratio)
+
+        opponents = config[f"{policy_name.upper()}_OPPONENTS"]
+        opponent_dist = config[f"{policy_name.upper()}_DISTRIBUTION"]
+
+        for opponent_name, opp_ratio in zip(opponents, opponent_dist):
+            pairings.append(Pairing(
+                index=len(pairings),
+                policy_name=policy_name,
+                opponent_name=opponent_name,
+                target_samples=math.ceil(policy_target * opp_ratio)
+            ))
+
+    return pairings
+
+
+def play_seeded_match(policy_name: str, opponent_name: str, max_turns: int, run_seed: int, *match_key: int,
+                      replay_writer: Optional[ReplayWriter] = None) -> Tracker:
+    """
+    Play one headless match between two archetypes with random streams derived
+    from (run_seed, match_key) and return its tracker. The match is appended
+    to `replay_writer` when given.
+    """
+    rngs = spawn_match_rngs(run_seed, *match_key)
+
+    p1 = DummyPlayer(ARCHETYPE_CLASSES[policy_name], rngs.player_1)
+    p2 = DummyPlayer(ARCHETYPE_CLASSES[opponent_name], rngs.player_2)
+
+    game = DuelGame(p1, p2, max_turns, rngs.engine, dodge_rng=rngs.dodge)
+
+    p1.set_game(game)
+    p1.set_opponent(p2)
+    p2.set_game(game)
+    p2.set_opponent(p1)
+
+    tracker = Tracker(game)
+    game.set_tracker(tracker)
+    if replay_writer is not None:
+        game.set_recorder(MatchRecorder(replay_writer, (policy_name, opponent_name), run_seed, match_key))
+
+    game.play_game()
+
+    return tracker
+
+
+def iter_pairing_games(pairing: Pairing, max_turns_per_game: int, run_seed: int,
+                       replay_writer: Optional[ReplayWriter] = None) -> Iterator[List[DataSample]]:
+    """Play games of a pairing until its sample target is reached, yielding each game's samples"""
+    sample_total = 0
+    game_index = 0
+
+    while sample_total < pairing.target_samples:
+        remaining = pairing.target_samples - sample_total
+
+        # Adjust max_turns only for final game if needed
+        max_turns = min(max_turns_per_game, remaining)
+
+        tracker = play_seeded_match(pairing.policy_name, pairing.opponent_name, max_turns, run_seed, pairing.index, game_index,
+                                    replay_writer=replay_writer)
+        game_samples = tracker.get_samples()
+        sample_total += len(game_samples)
+        game_index += 1
+        yield game_samples
+
+
+def play_pairing(pairing: Pairing, max_turns_per_game: int, run_seed: int,
+                 replay_writer: Optional[ReplayWriter] = None) -> List[DataSample]:
+    """Play games of a pairing until its sample target is reached"""
+    return [
+        sample
+        for game_samples in iter_pairing_games(pairing, max_turns_per_game, run_seed, replay_writer)
+        for sample in game_samples
+    ]
+
+
+def worker_pairings(pairings: List[Pairing], worker_index: int, worker_count: int) -> List[Pairing]:
+    """
+    Contiguous block of pairings assigned to one worker, so concatenating the
+    workers' outputs in worker order keeps the pairing order.
+    """
+    if not 0 <= worker_index < worker_count:
+        raise ValueError(f"worker_index must be in [0, {worker_count}), got {worker_index}")
+
+    start = len(pairings) * worker_index // worker_count
+    end = len(pairings) * (worker_index + 1) // worker_count
+    return pairings[start:end]
+
+
+def generate_worker_samples(config: Dict[str, Any], run_seed: int, samples_count: int,
+                            worker_index: int = 0, worker_count: int = 1) -> Dict[int, List[DataSample]]:
+    """
+    Generate the samples of the pairings assigned to one worker, keyed by pairing index.
+
+    Every match is seeded from (run_seed, pairing index, game index), so merging
+    the outputs of all workers in pairing index order gives exactly the samples
+    of a single-worker run with the same seed, whatever the number of workers.
+    """
+    pairings = worker_pairings(plan_run_pairings(config, samples_count), worker_index, worker_count)
+
+    return {
+        pairing.index: play_pairing(pairing, config["MAX_TURNS_PER_GAME"], run_seed)
+        for pairing in pairings
+    }
+
+
+def merge_worker_samples(worker_outputs: List[Dict[int, List[DataSample]]]) -> List[DataSample]:
+    """Concatenate worker outputs in pairing order"""
+    by_pairing: Dict[int, List[DataSample]] = {}
+    for output in worker_outputs:
+        by_pairing.update(output)
+
+    return [sample for index in sorted(by_pairing) for sample in by_pairing[index]]
+
+
+def generate_run_samples(config: Dict[str, Any], run_seed: int, samples_count: int) -> List[DataSample]:
+    """Generate all samples of a run in the current process"""
+    return merge_worker_samples([generate_worker_samples(config, run_seed, samples_count)])
@@ -0,0 +1,124 @@
+"""
+Opt-in capture of human games as training data.
+
+    with HumanGameCapture('data/database.sqlite', replay_log_path='data/human.dgr') as capture:
+        game.set_recorder(capture.match_recorder(('human', 'default_model')))
+        game.play_game()
+        capture.submit_game(tracker)
+
+The samples of every finished game are queued on the repository's
+background writer (DatasetRepository high throughput mode) and group
+committed from there, and replays are appended to the log on a writer
+thread of their own, so the interactive turn loop never waits on disk I/O.
+A crash loses at most the games queued since the last group commit, which
+happens at most `commit_interval` seconds after a game is submitted.
+
+All human games go to one run labelled HUMAN_RUN_LABEL under a template of
+their own, created on first use. The template includes the feature schema
+fingerprint, so games played with different features never share a run.
+"""
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Sequence
+import hashlib
+import json
+
+from duel_game.core.replay import MatchRecorder, Replay, ReplayWriter
+from duel_game.dataset.data_processor import Tracker
+from duel_game.dataset.dataset_repo import DatasetRepository
+from duel_game.dataset.feature_schema import FEATURE_SCHEMA_FINGERPRINT
+from duel_game.dataset.run_config import get_run_configuration
+
+HUMAN_TEMPLATE_LABEL = 'human-gameplay'
+HUMAN_RUN_LABEL = 'human-gameplay'
+DEFAULT_COMMIT_INTERVAL = 1.0
+
+
+def human_template_config() -> dict:
+    return {'source': 'human', 'feature_schema': FEATURE_SCHEMA_FINGERPRINT}
+
+
+class _QueuedReplayWriter:
+    """ReplayWriter stand-in for MatchRecorder: appends and flushes every replay on the capture's replay thread"""
+
+    def __init__(self, writer: ReplayWriter, executor: ThreadPoolExecutor):
+        self.writer = writer
+        self.executor = executor
+
+    def append(self, replay: Replay) -> Future:
+        return self.executor.submit(self._append, replay)
+
+    def _append(self, replay: Replay) -> None:
+        self.writer.append(replay)
+        self.writer.flush()
+
+
+class HumanGameCapture:
+    def __init__(self, db_path: str, replay_log_path: Optional[str] = None,
+                 commit_interval: float = DEFAULT_COMMIT_INTERVAL):
+        """
+        Args:
+            db_path: Database the samples are stored in
+            replay_log_path: Replay log the games are appended to, no replays when None
+            commit_interval: Seconds queued samples may wait for their group commit
+        """
+        self.repo = DatasetRepository(db_path, high_throughput=True, group_commit_interval=commit_interval)
+        self.run_id = self._human_run_id()
+        self.games_submitted = 0
+        self.samples_submitted = 0
+
+        self._replays: Optional[_QueuedReplayWriter] = None
+        if replay_log_path is not None:
+            self._replays = _QueuedReplayWriter(
+                ReplayWriter(replay_log_path),
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix='replay-writer')
+            )
+
+    def _human_run_id(self) -> int:
+        """The capture run, created with its template on first use"""
+        config_json = json.dumps(human_template_config(), sort_keys=True)
+        template_id = self.repo.is_config_available_given_hash(hashlib.sha256(config_json.encode()).hexdigest())
+        if template_id is None:
+            app_version = int(get_run_configuration()['APP_VERSION'])
+            template_id = self.repo.create_config_template(config_json, app_version, HUMAN_TEMPLATE_LABEL,
+                                                           "Games played by humans against the AI")
+
+        for run in self.repo.get_all_runs_for_template(template_id):
+            if run['label'] == HUMAN_RUN_LABEL:
+                return run['id']
+        return self.repo.create_run(template_id, HUMAN_RUN_LABEL, seed=0,
+                                    note="captured from interactive games")
+
+    def match_recorder(self, player_labels: Sequence[str]) -> Optional[MatchRecorder]:
+        """DuelGame recorder that queues the game's replay, None without a replay log"""
+        if self._replays is None:
+            return None
+        return MatchRecorder(self._replays, player_labels)
+
+    def submit_game(self, tracker: Tracker) -> Optional[Future]:
+        """Queue the samples of a finished game, returns the write's Future (None for a game without samples)"""
+        samples = list(tracker.get_samples())
+        if not samples:
+            return None
+        self.games_submitted += 1
+        self.samples_submitted += len(samples)
+        return self.repo.store_samples_async(samples, self.run_id)
+
+    def flush(self) -> None:
+        """Block until every submitted game is committed and every replay written"""
+        if self._replays is not None:
+            self._replays.executor.submit(self._replays.writer.flush).result()
+        self.repo.flush()
+
+    def close(self) -> None:
+        if self._replays is not None:
+            self._replays.executor.shutdown(wait=True)
+            self._replays.writer.close()
+            self._replays = None
+        self.repo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,302 @@
+"""
+Versioned schema migrations for the dataset and model databases.
+
+Every component (DatasetRepository: "dataset", ModelRepository: "models",
+RatingLedger: "ratings") keeps an ordered list of migrations. Applied
+versions are recorded in the `schema_version` table, so opening a database
+only runs what is missing.
+
+A migration has an optional DDL step and an optional chunked backfill. The DDL
+step must be idempotent because repositories still create their current
+tables with CREATE ... IF NOT EXISTS (use add_column_if_missing). Backfills
+walk the keys of a table in bounded-size transactions and store their
+position in `schema_backfill_progress` after every chunk, so an interrupted
+backfill resumes where it stopped. The version is recorded only once the
+backfill is complete.
+
+    python -m duel_game.dataset.migrations --db data/database.sqlite status
+    python -m duel_game.dataset.migrations --db data/database.sqlite migrate [--dry-run] [--chunk-rows 5000]
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Any, Optional, Sequence
+import argparse
+import math
+import sqlite3
+import time
+
+DEFAULT_CHUNK_ROWS = 10000
+
+
+@dataclass(frozen=True)
+class Backfill:
+    """
+    Chunked data migration over an ordered integer key.
+
+    `keys_sql` selects the next keys with the named parameters :after and
+    :limit, `count_sql` counts the keys greater than :after.
+    """
+    keys_sql: str
+    count_sql: str
+    apply_chunk: Callable[[sqlite3.Connection, List[int]], None]
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Optional[Callable[[sqlite3.Connection], None]] = None
+    backfill: Optional[Backfill] = None
+
+
+def add_column_if_missing(conn: sqlite3.Connection, table: str, column: str, definition: str) -> bool:
+    """ALTER TABLE ... ADD COLUMN unless the column exists, returns True when added"""
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column in columns:
+        return False
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return True
+
+
+class MigrationRunner:
+    def __init__(self, conn: sqlite3.Connection, component: str, migrations: Sequence[Migration]):
+        versions = [migration.version for migration in migrations]
+        if versions != sorted(set(versions)):
+            raise ValueError(f"Migrations of {component!r} must have unique, increasing versions: {versions}")
+
+        self.conn = conn
+        self.component = component
+        self.migrations = list(migrations)
+        self._create_tables()
+
+    def _create_tables(self):
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            component TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+            PRIMARY KEY (component, version)
+        );
+        """)
+
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_backfill_progress (
+            component TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            last_key INTEGER NOT NULL,
+            rows_done INTEGER NOT NULL,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+            PRIMARY KEY (component, version)
+        );
+        """)
+        self.conn.commit()
+
+    def current_version(self) -> int:
+        row = self.conn.execute(
+            "SELECT MAX(version) FROM schema_version WHERE component = ?", (self.component,)
+        ).fetchone()
+        return row[0] or 0
+
+    def applied_versions(self) -> List[int]:
+        return [row[0] for row in self.conn.execute(
+            "SELECT version FROM schema_version WHERE component = ? ORDER BY version", (self.component,)
+        )]
+
+    def pending(self, target: Optional[int] = None) -> List[Migration]:
+        applied = set(self.applied_versions())
+        return [
+            migration for migration in self.migrations
+            if migration.version not in applied and (target is None or migration.version <= target)
+        ]
+
+    def _backfill_position(self, migration: Migration) -> tuple:
+        row = self.conn.execute(
+            "SELECT last_key, rows_done FROM schema_backfill_progress WHERE component = ? AND version = ?",
+            (self.component, migration.version)
+        ).fetchone()
+        return (row[0], row[1]) if row else (None, 0)
+
+    def _next_keys(self, backfill: Backfill, after: Optional[int], limit: int) -> List[int]:
+        after = -math.inf if after is None else after
+        return [row[0] for row in self.conn.execute(backfill.keys_sql, {'after': after, 'limit': limit})]
+
+    def _remaining_rows(self, backfill: Backfill, after: Optional[int]) -> int:
+        return self.conn.execute(backfill.count_sql, {'after': -math.inf if after is None else after}).fetchone()[0]
+
+    def migrate(self, target: Optional[int] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                dry_run: bool = False) -> List[Dict[str, Any]]:
+        """
+        Apply pending migrations in version order.
+
+        Args:
+            target: Stop after this version (all pending when None)
+            chunk_rows: Keys per backfill transaction
+            dry_run: Apply the DDL and one backfill chunk of every pending
+                migration inside a transaction that is rolled back, and
+                estimate row counts and durations from it
+
+        Returns:
+            One report per pending migration: version, name, rows and seconds
+            (estimated_seconds on a dry run)
+        """
+        if chunk_rows < 1:
+            raise ValueError(f"chunk_rows must be positive, got {chunk_rows}")
+
+        pending = self.pending(target)
+        if dry_run:
+            return self._dry_run(pending, chunk_rows)
+
+        reports = []
+        for migration in pending:
+            started = time.perf_counter()
+            rows = 0
+
+            if migration.apply is not None:
+                self._in_transaction(lambda: migration.apply(self.conn))
+
+            if migration.backfill is not None:
+                rows = self._run_backfill(migration, chunk_rows)
+
+            def record():
+                self.conn.execute(
+                    "INSERT INTO schema_version (component, version, name) VALUES (?, ?, ?)",
+                    (self.component, migration.version, migration.name)
+                )
+                self.conn.execute(
+                    "DELETE FROM schema_backfill_progress WHERE component = ? AND version = ?",
+                    (self.component, migration.version)
+                )
+
+            self._in_transaction(record)
+            reports.append({
+                'version': migration.version,
+                'name': migration.name,
+                'rows': rows,
+                'seconds': time.perf_counter() - started
+            })
+
+        return reports
+
+    def _in_transaction(self, operation: Callable[[], Any]) -> Any:
+        self.conn.commit()
+        self.conn.execute("BEGIN")
+        try:
+            result = operation()
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def _run_backfill(self, migration: Migration, chunk_rows: int) -> int:
+        backfill = migration.backfill
+        last_key, rows_done = self._backfill_position(migration)
+
+        while True:
+            keys = self._next_keys(backfill, last_key, chunk_rows)
+            if not keys:
+                return rows_done
+
+            def chunk():
+                backfill.apply_chunk(self.conn, keys)
+                self.conn.execute("""
+                    INSERT INTO schema_backfill_progress (component, version, last_key, rows_done)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (component, version) DO UPDATE SET
+                        last_key = excluded.last_key,
+                        rows_done = excluded.rows_done,
+                        updated_at = CURRENT_TIMESTAMP
+                """, (self.component, migration.version, keys[-1], rows_done + len(keys)))
+
+            self._in_transaction(chunk)
+            last_key = keys[-1]
+            rows_done += len(keys)
+
+    def _dry_run(self, pending: List[Migration], chunk_rows: int) -> List[Dict[str, Any]]:
+        reports = []
+        self.conn.commit()
+        self.conn.execute("BEGIN")
+        try:
+            for migration in pending:
+                started = time.perf_counter()
+                if migration.apply is not None:
+                    migration.apply(self.conn)
+                ddl_seconds = time.perf_counter() - started
+
+                rows = 0
+                backfill_seconds = 0.0
+                if migration.backfill is not None:
+                    last_key, _ = self._backfill_position(migration)
+                    rows = self._remaining_rows(migration.backfill, last_key)
+                    keys = self._next_keys(migration.backfill, last_key, chunk_rows)
+                    if keys:
+                        started = time.perf_counter()
+                        migration.backfill.apply_chunk(self.conn, keys)
+                        backfill_seconds = (time.perf_counter() - started) / len(keys) * rows
+
+                reports.append({
+                    'version': migration.version,
+                    'name': migration.name,
+                    'rows': rows,
+                    'estimated_seconds': ddl_seconds + backfill_seconds
+                })
+        finally:
+            self.conn.execute("ROLLBACK")
+
+        return reports
+
+
+def main(argv: Optional[List[str]] = None):
+    from duel_game.dataset.dataset_repo import DatasetRepository, DATASET_MIGRATIONS
+    from duel_game.ml_model.model_repo import ModelRepository, MODEL_MIGRATIONS
+    from duel_game.ml_model.ratings import RatingLedger, RATING_MIGRATIONS
+
+    components = {'dataset': DATASET_MIGRATIONS, 'models': MODEL_MIGRATIONS, 'ratings': RATING_MIGRATIONS}
+
+    parser = argparse.ArgumentParser(prog='python -m duel_game.dataset.migrations')
+    parser.add_argument('--db', required=True, help='database file')
+    parser.add_argument('--component', choices=[*components, 'all'], default='all')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('status', help='show applied and pending migrations')
+    migrate_parser = subparsers.add_parser('migrate', help='apply pending migrations')
+    migrate_parser.add_argument('--target', type=int, default=None)
+    migrate_parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    migrate_parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args(argv)
+
+    selected = components if args.component == 'all' else {args.component: components[args.component]}
+
+    # the repositories create the baseline tables the migrations build on
+    if 'dataset' in selected:
+        DatasetRepository(args.db, auto_migrate=False).close()
+    if 'models' in selected:
+        ModelRepository(args.db, auto_migrate=False)
+    if 'ratings' in selected:
+        RatingLedger(args.db, auto_migrate=False).close()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        for component, migrations in selected.items():
+            runner = MigrationRunner(conn, component, migrations)
+            if args.command == 'status':
+                pending = runner.pending()
+                print(f"{component}: version {runner.current_version()}, "
+                      f"pending: {[f'{m.version} {m.name}' for m in pending] or 'none'}")
+                continue
+
+            for report in runner.migrate(args.target, args.chunk_rows, args.dry_run):
+                if args.dry_run:
+                    print(f"{component} {report['version']} {report['name']}: "
+                          f"~{report['rows']} rows, ~{report['estimated_seconds']:.2f}s")
+                else:
+                    print(f"{component} {report['version']} {report['name']}: "
+                          f"{report['rows']} rows in {report['seconds']:.2f}s")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Keyset pagination helpers for DatasetRepository queries.
+
+A page token is "p1." followed by unpadded urlsafe base64 of the JSON object
+{"f": <filter fingerprint>, "k": <last key of the previous page>}. The
+fingerprint ties a token to the query and filters it was issued for, so a
+token replayed against different filters is rejected instead of silently
+skipping rows. Tokens stay valid while rows are inserted, since pages
+continue strictly after the last seen key.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import base64
+import binascii
+import hashlib
+import json
+
+PAGE_TOKEN_PREFIX = "p1."
+MAX_PAGE_SIZE = 10000
+
+
+@dataclass(frozen=True)
+class Page:
+    items: List[Dict[str, Any]]
+    # None on the last page
+    next_page_token: Optional[str] = None
+
+
+def filter_fingerprint(query: str, filters: Dict[str, Any]) -> str:
+    payload = json.dumps([query, filters], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def encode_page_token(fingerprint: str, last_key: Any) -> str:
+    payload = json.dumps({'f': fingerprint, 'k': last_key}, separators=(',', ':'))
+    return PAGE_TOKEN_PREFIX + base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_page_token(token: Optional[str], fingerprint: str) -> Any:
+    """
+    Returns:
+        The last key of the previous page, or None for the first page
+
+    Raises:
+        ValueError: If the token is malformed or was issued for other filters
+    """
+    if token is None:
+        return None
+
+    if not token.startswith(PAGE_TOKEN_PREFIX):
+        raise ValueError(f"Unsupported page token: {token!r}")
+
+    encoded = token[len(PAGE_TOKEN_PREFIX):]
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Malformed page token: {token!r}") from e
+
+    if not isinstance(payload, dict) or payload.get('f') != fingerprint or 'k' not in payload:
+        raise ValueError("Page token does not belong to this query and filters")
+
+    return payload['k']
+
+
+def check_page_size(page_size: int) -> int:
+    if not isinstance(page_size, int) or not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be an integer between 1 and {MAX_PAGE_SIZE}, got {page_size!r}")
+    return page_size
+
+
+def to_timestamp(value: Optional[str | datetime]) -> Optional[str]:
+    """Normalize a date filter to SQLite's CURRENT_TIMESTAMP text format"""
+    if value is None or isinstance(value, str):
+        return value
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with `prefix`"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
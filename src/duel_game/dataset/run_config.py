@@ -0,0 +1,196 @@
+from typing import Tuple, Any, Optional, Dict
+import json
+import os
+
+
+CONFIG_VARIABLES: Tuple[Tuple[str, type, Any], ...] = (
+    # Basic app config
+    ("APP_VERSION", str, "1"),
+    
+    # Game parameters
+    ("MAX_TURNS_PER_GAME", int, 50),
+    ("SAMPLES_COUNT_PER_RUN", int, 10000),
+    
+    # Policy data distribution
+    ("DUMMY_PLAYER_POLICIES_DATA_DISTRIBUTION_IN_RUN", list, [0.25, 0.2, 0.15, 0.15, 0.15, 0.1]),
+    
+    # Aggressive policy
+    ("AGGRESSIVE_OPPONENTS", list, ["Defensive", "Healer", "Opportunist", "Balanced", "Aggressive"]),
+    ("AGGRESSIVE_DISTRIBUTION", list, [0.25, 0.25, 0.25, 0.15, 0.1]),
+    
+    # Defensive policy (Note: Fixed case to match .env)
+    ("DEFENSIVE_OPPONENTS", list, ["Aggressive", "Opportunist", "Balanced", "RandomBiased", "Defensive"]),
+    ("DEFENSIVE_DISTRIBUTION", list, [0.3, 0.2, 0.2, 0.2, 0.1]),
+    
+    # Balanced policy
+    ("BALANCED_OPPONENTS", list, ["Balanced", "Aggressive", "Opportunist", "Defensive", "Healer"]),
+    ("BALANCED_DISTRIBUTION", list, [0.3, 0.2, 0.2, 0.2, 0.1]),
+    
+    # Healer policy
+    ("HEALER_OPPONENTS", list, ["Aggressive", "Balanced", "Opportunist", "Defensive", "Healer"]),
+    ("HEALER_DISTRIBUTION", list, [0.3, 0.2, 0.2, 0.2, 0.1]),
+    
+    # Opportunist policy
+    ("OPPORTUNIST_OPPONENTS", list, ["Aggressive", "Balanced", "Opportunist", "Defensive"]),
+    ("OPPORTUNIST_DISTRIBUTION", list, [0.3, 0.3, 0.2, 0.2]),
+    
+    # Random-Biased policy
+    ("RANDOMBIASED_OPPONENTS", list, ["Aggressive", "Defensive", "Healer", "Balanced", "Opportunist", "RandomBiased"]),
+    ("RANDOMBIASED_DISTRIBUTION", list, [0.166, 0.166, 0.166, 0.166, 0.166, 0.166]),
+    
+    # Aggressive parameters
+    ("AGGRESSIVE_EPSILON", float, 0.1),
+    ("AGGRESSIVE_ATTACK_BIAS", float, 0.7),
+    ("AGGRESSIVE_HEAL_THRESHOLD", float, 40.0),
+    ("AGGRESSIVE_ATTACK_THREAT_THRESHOLD", float, 0.6),
+    ("AGGRESSIVE_ATTACK_THREAT_HISTORY_LENGTH", int, 5),
+    
+    # Defensive parameters
+    ("DEFENSIVE_EPSILON", float, 0.1),
+    ("DEFENSIVE_ATTACK_PROB_OPP_HP_LOW", float, 0.6),
+    ("DEFENSIVE_OPP_HP_THRESHOLD", float, 30.0),
+    ("DEFENSIVE_HEAL_BIAS", float, 0.6),
+    ("DEFENSIVE_DEFENSE_BIAS", float, 0.7),
+    ("DEFENSIVE_ATTACK_THREAT_THRESHOLD", float, 0.4),
+    ("DEFENSIVE_ATTACK_THREAT_HISTORY_LENGTH", int, 5),
+    ("DEFENSIVE_ATTACK_START_TURN_THRESHOLD", int, 5),
+    
+    # Balanced parameters
+    ("BALANCED_EPSILON", float, 0.1),
+    ("BALANCED_DOMINATION_MARGIN", float, 30.0),
+    ("BALANCED_DESPERATION_MARGIN", float, -20.0),
+    
+    # Healer parameters
+    ("HEALER_EPSILON", float, 0.1),
+    ("HEALER_HEAL_THRESHOLD", float, 80.0),
+    ("HEALER_HEAL_BIAS", float, 0.8),
+    ("HEALER_ATTACK_PROB", float, 0.3),
+    
+    # Opportunist parameters
+    ("OPPORTUNIST_EPSILON", float, 0.1),
+    ("OPPORTUNIST_DECISION_THRESHOLD", float, 0.5),
+    ("OPPORTUNIST_BASE_TURN_NUMBER", int, 5),
+    ("OPPORTUNIST_HEAL_THRESHOLD", float, 35.0),
+    ("OPPORTUNIST_HEAL_BIAS", float, 0.85),
+    
+    # Random-Biased parameters
+    ("RANDOM_BIASED_W_ATTACK", float, 0.25),
+    ("RANDOM_BIASED_W_DEFENSE", float, 0.25),
+    ("RANDOM_BIASED_W_DODGE", float, 0.25),
+    ("RANDOM_BIASED_W_HEAL", float, 0.25),
+)
+
+# ========================================
+# HELPER FUNCTIONS
+# ========================================
+def _parse_env_string(value: Optional[str], default: str="") -> str:
+    """Parse string environment variable."""
+    return value if value is not None else default
+
+def _parse_env_int(value: Optional[str], default: int) -> int:
+    """Parse integer environment variable."""
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+def _parse_env_float(value: Optional[str], default: float) -> float:
+    """Parse float environment variable."""
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+def _parse_env_list(value: Optional[str], default: list) -> list:
+    """Parse list from environment variable.
+    Supports both JSON arrays and comma-separated values.
+    """
+    if value is None:
+        return default.copy() if default is not None else []
+    
+    # Try parsing as JSON first
+    try:
+        parsed = json.loads(value)
+        if isinstance(parsed, list):
+            return parsed
+    except (json.JSONDecodeError, TypeError):
+        pass
+    
+    # Try comma-separated values
+    if ',' in value:
+        items = [item.strip() for item in value.split(',') if item.strip()]
+        # Try to convert numeric items
+        converted_items = []
+        for item in items:
+            try:
+                # Try to convert to float if it looks like a number
+                if '.' in item:
+                    converted_items.append(float(item))
+                else:
+                    converted_items.append(int(item))
+            except ValueError:
+                converted_items.append(item)
+        return converted_items
+    
+    # Single value as list
+    return [value.strip()] if value.strip() else []
+
+def _parse_env_bool(value: Optional[str], default: bool) -> bool:
+    """Parse boolean environment variable."""
+    if value is None:
+        return default
+    
+    value_lower = value.lower().strip()
+    true_values = {'true', '1', 'yes', 'on', 'y'}
+    false_values = {'false', '0', 'no', 'off', 'n'}
+    
+    if value_lower in true_values:
+        return True
+    elif value_lower in false_values:
+        return False
+    else:
+        return default
+
+# ========================================
+# TYPE PARSER MAPPING
+# ========================================
+_TYPE_PARSERS = {
+    str: _parse_env_string,
+    int: _parse_env_int,
+    float: _parse_env_float,
+    list: _parse_env_list,
+    bool: _parse_env_bool,
+}
+
+# ========================================
+# MAIN CONFIGURATION LOADER
+# ========================================
+# @lru_cache(maxsize=1)
+def get_run_configuration() -> Dict[str, Any]:
+    """
+    Load and parse all configuration variables with proper types.
+    
+    Returns:
+        Dictionary with configuration variables as keys and parsed values.
+    """
+    config = {}
+    
+    for var_name, var_type, default_value in CONFIG_VARIABLES:
+        # Get raw value from environment
+        raw_value = os.getenv(var_name)
+        
+        # Get appropriate parser for the type
+        parser = _TYPE_PARSERS.get(var_type)
+        
+        if parser is None:
+            # If type not supported, use string as fallback
+            config[var_name] = raw_value if raw_value is not None else default_value
+        else:
+            # Parse with type-specific parser
+            config[var_name] = parser(raw_value, default_value)
+    
+    return config
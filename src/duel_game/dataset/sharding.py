@@ -0,0 +1,244 @@
+"""
+Sharded dataset generation: every worker process writes its own SQLite file,
+then the shards are merged into the main database in one pass.
+
+    python -m duel_game.dataset.sharding generate --db data/database.sqlite --seed 42 [--workers 8]
+    python -m duel_game.dataset.sharding merge data/database.sqlite shard-0.db shard-1.db ...
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+import argparse
+import hashlib
+import json
+import math
+import os
+
+from duel_game.dataset.dataset_repo import DatasetRepository, FEATURE_COLUMNS
+from duel_game.dataset.generation import generate_worker_samples
+from duel_game.dataset.run_config import get_run_configuration
+
+
+def shard_db_path(main_db_path: str | Path, worker_index: int) -> Path:
+    main_db_path = Path(main_db_path)
+    return main_db_path.with_name(f"{main_db_path.stem}.shard-{worker_index}{main_db_path.suffix}")
+
+
+def _generate_shard(shard_path: str, config: Dict[str, Any], template_label: str, template_description: str,
+                    run_label: str, run_note: str, seed: int, samples_count: int,
+                    worker_index: int, worker_count: int) -> Tuple[str, int]:
+    """Worker process entry point: generate this worker's pairings into its own shard"""
+    samples_by_pairing = generate_worker_samples(config, seed, samples_count, worker_index, worker_count)
+    samples = [sample for index in sorted(samples_by_pairing) for sample in samples_by_pairing[index]]
+
+    config_json = json.dumps(config, sort_keys=True)
+    repo = DatasetRepository(shard_path)
+    try:
+        template_id = repo.is_config_available_given_hash(hashlib.sha256(config_json.encode()).hexdigest())
+        if template_id is None:
+            template_id = repo.create_config_template(config_json, int(config['APP_VERSION']), template_label, template_description)
+
+        run_id = repo.create_run(template_id, run_label, seed=seed, note=run_note)
+        repo.store_samples(samples, run_id)
+    finally:
+        repo.close()
+
+    return shard_path, len(samples)
+
+
+def generate_run_sharded(main_db_path: str | Path, seed: int, config: Optional[Dict[str, Any]] = None,
+                         template_label: str = "", template_description: str = "",
+                         run_label: str = "", run_note: str = "",
+                         worker_count: Optional[int] = None, keep_shards: bool = False) -> int:
+    """
+    Generate a dataset run with one process and one database file per worker,
+    then merge the shards into the main database.
+
+    Returns:
+        The run ID in the main database
+    """
+    config = config if config is not None else get_run_configuration()
+    worker_count = worker_count or os.cpu_count() or 1
+    samples_count = math.ceil(float(config['SAMPLES_COUNT_PER_RUN']) * 1.05)
+
+    shard_paths = [str(shard_db_path(main_db_path, worker_index)) for worker_index in range(worker_count)]
+    for shard_path in shard_paths:
+        Path(shard_path).unlink(missing_ok=True)
+
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        futures = [
+            executor.submit(_generate_shard, shard_path, config, template_label, template_description,
+                            run_label, run_note, seed, samples_count, worker_index, worker_count)
+            for worker_index, shard_path in enumerate(shard_paths)
+        ]
+        for future in futures:
+            future.result()
+
+    run_ids = merge_shards(main_db_path, shard_paths)
+    if not keep_shards:
+        for shard_path in shard_paths:
+            Path(shard_path).unlink(missing_ok=True)
+
+    return run_ids[0]
+
+
+def merge_shards(main_db_path: str | Path, shard_paths: List[str | Path], combine_runs: bool = True) -> List[int]:
+    """
+    Bulk-copy config templates, runs and samples of shard databases into the main database.
+
+    Templates are deduplicated by config_hash and get a new version number in
+    the main database when they are new. With `combine_runs`, runs that share
+    (config_hash, seed, label, note, feature schema) across shards, i.e. the
+    parts of one sharded run, become a single run whose samples keep shard order.
+    Samples are copied with INSERT ... SELECT from the attached shard,
+    deduplicated vectors are remapped by their content hash.
+
+    Returns:
+        Main database run IDs in order of first appearance
+    """
+    repo = DatasetRepository(str(main_db_path))
+    conn = repo.conn
+    # (config_hash, seed, label, note, feature_schema) -> main run id
+    combined_runs: Dict[Tuple[str, int, Any, Any, Any], int] = {}
+    main_run_ids: List[int] = []
+    feature_columns_sql = ", ".join(FEATURE_COLUMNS)
+
+    try:
+        for shard_path in shard_paths:
+            conn.execute("ATTACH DATABASE ? AS shard", (str(shard_path),))
+            try:
+                conn.execute("BEGIN")
+
+                conn.execute("""
+                    INSERT OR IGNORE INTO main.feature_schemas (fingerprint, schema_json, created_at)
+                    SELECT fingerprint, schema_json, created_at FROM shard.feature_schemas
+                """)
+
+                # ---- templates (dedup by hash) ----
+                template_map: Dict[int, int] = {}
+                for template in conn.execute("""
+                    SELECT id, app_version, label, config_hash, config_json, description, created_at
+                    FROM shard.config_template ORDER BY id
+                """).fetchall():
+                    main_template = conn.execute(
+                        "SELECT id FROM main.config_template WHERE config_hash = ?", (template['config_hash'],)
+                    ).fetchone()
+
+                    if main_template is None:
+                        version = conn.execute(
+                            "SELECT COALESCE(MAX(version), 0) + 1 FROM main.config_template WHERE app_version = ?",
+                            (template['app_version'],)
+                        ).fetchone()[0]
+                        cursor = conn.execute("""
+                            INSERT INTO main.config_template (app_version, version, label, config_hash, config_json, description, created_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """, (template['app_version'], version, template['label'], template['config_hash'],
+                              template['config_json'], template['description'], template['created_at']))
+                        template_map[template['id']] = cursor.lastrowid
+                    else:
+                        template_map[template['id']] = main_template['id']
+
+                # ---- runs ----
+                for run in conn.execute("""
+                    SELECT dr.id, dr.template_id, dr.seed, dr.label, dr.note, dr.created_at, dr.feature_schema, ct.config_hash
+                    FROM shard.dataset_run dr
+                    JOIN shard.config_template ct ON dr.template_id = ct.id
+                    ORDER BY dr.id
+                """).fetchall():
+                    run_key = (run['config_hash'], run['seed'], run['label'], run['note'], run['feature_schema'])
+                    main_run_id = combined_runs.get(run_key) if combine_runs else None
+
+                    if main_run_id is None:
+                        template_id = template_map[run['template_id']]
+                        app_version, template_version = conn.execute(
+                            "SELECT app_version, version FROM main.config_template WHERE id = ?", (template_id,)
+                        ).fetchone()
+                        run_number = conn.execute(
+                            "SELECT COUNT(*) + 1 FROM main.dataset_run WHERE template_id = ?", (template_id,)
+                        ).fetchone()[0]
+
+                        cursor = conn.execute("""
+                            INSERT INTO main.dataset_run (template_id, run_index, sample_count, seed, label, note, created_at, feature_schema)
+                            VALUES (?, ?, 0, ?, ?, ?, ?, ?)
+                        """, (template_id, f'{app_version}.{template_version}.{run_number}',
+                              run['seed'], run['label'], run['note'], run['created_at'], run['feature_schema']))
+                        main_run_id = cursor.lastrowid
+                        combined_runs[run_key] = main_run_id
+                        main_run_ids.append(main_run_id)
+
+                    # ---- samples (bulk copy inside SQLite, sample_count follows via triggers) ----
+                    conn.execute("""
+                        INSERT INTO main.samples (run_id, features_json, label, created_at)
+                        SELECT ?, features_json, label, created_at
+                        FROM shard.samples WHERE run_id = ? ORDER BY id
+                    """, (main_run_id, run['id']))
+
+                    conn.execute(f"""
+                        INSERT INTO main.samples_columnar (run_id, label, turn_number, archetype, created_at, {feature_columns_sql})
+                        SELECT ?, label, turn_number, archetype, created_at, {feature_columns_sql}
+                        FROM shard.samples_columnar WHERE run_id = ? ORDER BY id
+                    """, (main_run_id, run['id']))
+
+                    # deduplicated vectors are remapped by content hash
+                    conn.execute("""
+                        INSERT OR IGNORE INTO main.sample_vectors (vector_hash, features_json, label)
+                        SELECT sv.vector_hash, sv.features_json, sv.label
+                        FROM shard.run_sample_vectors rsv JOIN shard.sample_vectors sv ON sv.id = rsv.vector_id
+                        WHERE rsv.run_id = ? ORDER BY sv.id
+                    """, (run['id'],))
+
+                    conn.execute("""
+                        INSERT INTO main.run_sample_vectors (run_id, vector_id, count)
+                        SELECT ?, main_sv.id, rsv.count
+                        FROM shard.run_sample_vectors rsv
+                        JOIN shard.sample_vectors sv ON sv.id = rsv.vector_id
+                        JOIN main.sample_vectors main_sv ON main_sv.vector_hash = sv.vector_hash
+                        WHERE rsv.run_id = ?
+                        ON CONFLICT (run_id, vector_id) DO UPDATE SET count = count + excluded.count
+                    """, (main_run_id, run['id']))
+
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.execute("DETACH DATABASE shard")
+    finally:
+        repo.close()
+
+    return main_run_ids
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog='python -m duel_game.dataset.sharding')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate_parser = subparsers.add_parser('generate', help='generate a run with one shard per worker and merge it')
+    generate_parser.add_argument('--db', required=True, help='main database file')
+    generate_parser.add_argument('--seed', type=int, required=True)
+    generate_parser.add_argument('--workers', type=int, default=None, help='defaults to the number of CPUs')
+    generate_parser.add_argument('--template-label', default='')
+    generate_parser.add_argument('--template-description', default='')
+    generate_parser.add_argument('--run-label', default='')
+    generate_parser.add_argument('--run-note', default='')
+    generate_parser.add_argument('--keep-shards', action='store_true')
+
+    merge_parser = subparsers.add_parser('merge', help='merge shard databases into the main database')
+    merge_parser.add_argument('main_db')
+    merge_parser.add_argument('shards', nargs='+')
+    merge_parser.add_argument('--no-combine-runs', action='store_true', help='copy every shard run as its own run')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        run_id = generate_run_sharded(args.db, args.seed, None, args.template_label, args.template_description,
+                                      args.run_label, args.run_note, args.workers, args.keep_shards)
+        print(f'Run merged into {args.db} with run_id={run_id}')
+    else:
+        run_ids = merge_shards(args.main_db, args.shards, combine_runs=not args.no_combine_runs)
+        print(f'Merged {len(args.shards)} shard(s) into {args.main_db}, run ids: {run_ids}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+from __future__ import annotations
+from concurrent.futures import Future
+from typing import Callable, Any, List, Tuple, Dict, Optional, TYPE_CHECKING
+import sqlite3
+import threading
+import queue
+import time
+
+# to prevent circular import errors (ImportError)
+if TYPE_CHECKING:
+    from duel_game.dataset.dataset_repo import DatasetRepository
+
+_FLUSH = '__flush__'
+_STOP = '__stop__'
+
+
+def _stored_rows(result: Any) -> int:
+    """Rows a store_samples* call wrote, read from its result (ids, a count or a report)"""
+    if isinstance(result, dict):
+        return result['samples']
+    if isinstance(result, int):
+        return result
+    return len(result)
+
+
+class BackgroundWriter:
+    """
+    Single writer thread for a DatasetRepository.
+
+    Write operations are queued as (method name, args) and executed in order on
+    the thread's own repository, whose per-call commits are deferred. Each
+    operation runs in its own savepoint and is rolled back as a whole when it
+    raises, so the pending group only ever holds complete operations. Sample
+    writes (store_*) are group-committed once `group_commit_rows` rows are
+    pending or `group_commit_interval` seconds passed since the first
+    uncommitted write. Other writes (runs, templates, counts) commit right away
+    so the ids they return are immediately visible to readers. A write's Future
+    resolves once its group is committed; when a commit fails, the whole group
+    and every write queued after it fail with that error, and the writer
+    refuses further writes.
+    The queue is bounded, so producers block (back-pressure) instead of
+    contending for the SQLite write lock.
+    """
+
+    def __init__(self, repository_factory: Callable[[], DatasetRepository], max_queue_size: int = 64,
+                 group_commit_rows: int = 5000, group_commit_interval: float = 0.5):
+        self._repository_factory = repository_factory
+        self._queue: queue.Queue[Tuple[str, tuple, Dict[str, Any], Future]] = queue.Queue(maxsize=max_queue_size)
+        self.group_commit_rows = group_commit_rows
+        self.group_commit_interval = group_commit_interval
+
+        self.commits = 0
+        self.rows_written = 0
+
+        self._error: Optional[BaseException] = None
+        self._started = threading.Event()
+        self._startup_error: Optional[BaseException] = None
+        self.thread = threading.Thread(target=self._run, name='dataset-writer', daemon=True)
+        self.thread.start()
+        self._started.wait()
+        if self._startup_error is not None:
+            raise self._startup_error
+
+    def submit(self, method_name: str, *args, **kwargs) -> Future:
+        """Queue a repository write, blocks while the queue is full"""
+        if self._error is not None:
+            raise RuntimeError("dataset writer stopped after a failed commit") from self._error
+        if not self.thread.is_alive():
+            raise RuntimeError("dataset writer thread is not running")
+
+        future: Future = Future()
+        self._queue.put((method_name, args, kwargs, future))
+        return future
+
+    def flush(self) -> None:
+        """Block until every write submitted so far is committed"""
+        self.submit(_FLUSH).result()
+
+    def close(self) -> None:
+        """Commit what is pending and stop the thread, raises if that last commit fails"""
+        if self.thread.is_alive():
+            future: Future = Future()
+            self._queue.put((_STOP, (), {}, future))
+            self.thread.join()
+            future.result()
+
+    def _run(self):
+        try:
+            repository = self._repository_factory()
+            repository._defer_commits = True
+        except BaseException as e:
+            self._startup_error = e
+            self._started.set()
+            return
+        self._started.set()
+
+        pending_rows = 0
+        first_pending_at = None
+        # Futures of the uncommitted group, resolved once it is committed
+        pending: List[Tuple[Future, Any]] = []
+
+        def commit():
+            nonlocal pending_rows, first_pending_at
+            if first_pending_at is not None:
+                repository.conn.commit()
+                self.commits += 1
+            for pending_future, result in pending:
+                pending_future.set_result(result)
+            pending.clear()
+            pending_rows = 0
+            first_pending_at = None
+
+        method_name, future = None, None
+        try:
+            while True:
+                timeout = None
+                if first_pending_at is not None:
+                    timeout = max(0.0, first_pending_at + self.group_commit_interval - time.monotonic())
+
+                try:
+                    method_name, args, kwargs, future = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    method_name, future = None, None
+                    commit()
+                    continue
+
+                if method_name in (_FLUSH, _STOP):
+                    pending.append((future, None))
+                    commit()
+                    if method_name == _STOP:
+                        return
+                    continue
+
+                # every operation runs in a savepoint of the pending group, so a call
+                # that fails halfway leaves none of its rows behind for the next commit
+                if not repository.conn.in_transaction:
+                    repository.conn.execute("BEGIN")
+                repository.conn.execute("SAVEPOINT write_operation")
+                try:
+                    result = getattr(repository, method_name)(*args, **kwargs)
+                except BaseException as e:
+                    repository.conn.execute("ROLLBACK TO write_operation")
+                    repository.conn.execute("RELEASE write_operation")
+                    if first_pending_at is None:
+                        # nothing else pending, end the empty transaction
+                        repository.conn.rollback()
+                    future.set_exception(e)
+                    continue
+                repository.conn.execute("RELEASE write_operation")
+
+                rows = _stored_rows(result) if method_name.startswith('store_samples') else 1
+                self.rows_written += rows
+                pending_rows += rows
+                if first_pending_at is None:
+                    first_pending_at = time.monotonic()
+
+                pending.append((future, result))
+                if pending_rows >= self.group_commit_rows or not method_name.startswith('store_'):
+                    commit()
+        except BaseException as e:
+            # the group never reached the database: fail its writes (and the one in hand)
+            self._error = e
+            for failed in [pending_future for pending_future, _ in pending] + [future]:
+                if failed is not None and not failed.done():
+                    failed.set_exception(e)
+            try:
+                repository.conn.rollback()
+            except sqlite3.Error:
+                pass
+        finally:
+            repository.close()
+
+        if method_name != _STOP:
+            self._reject_queued()
+
+    def _reject_queued(self) -> None:
+        """After a failed commit, fail every queued write until close() stops the thread"""
+        while True:
+            method_name, _, _, future = self._queue.get()
+            if method_name == _STOP:
+                future.set_result(None)
+                return
+            future.set_exception(self._error)
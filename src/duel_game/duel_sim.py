@@ -0,0 +1,290 @@
+"""
+Headless match simulation from the command line.
+
+    python -m duel_game.duel_sim --player-1 Aggressive Healer --player-2 default model:12 --db data.sqlite \\
+        --games 10000 --seed 7 --output results.jsonl --samples-dir samples/
+
+Every player-1 spec plays every player-2 spec `--games` times. A spec is an
+archetype name (see generation.ARCHETYPE_ORDER), `default` for the bundled
+default_model.json, `model:<id>` for a ModelRepository entry of --db, or
+`file:<path>` for a model artifact. Models play as player 2, as in the game.
+
+Matches are split into chunks of --chunk-games and simulated on --workers
+processes (all cores by default). Every match is seeded from
+(seed, matchup index, game index), so the output does not depend on the
+worker count. Results are streamed in match order as one JSON line per
+match, to stdout or --output. With --samples-dir every chunk also writes its
+Tracker samples to samples-<chunk>.npz (features, labels, turns, match).
+At most two chunks per worker are in flight, so memory stays bounded
+however many games are played. Throughput is reported on stderr.
+"""
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from duel_game.core.essential_types import features as feature_names
+from duel_game.core.game import DuelGame
+from duel_game.core.helpers import get_base_path
+from duel_game.core.ml_model import TrainedModel
+from duel_game.core.player import ArtificialPlayer, DummyPlayer, Player
+from duel_game.core.seeding import spawn_match_rngs
+from duel_game.dataset.data_processor import Tracker
+from duel_game.dataset.feature_schema import model_from_artifact
+from duel_game.dataset.generation import ARCHETYPE_CLASSES
+
+DEFAULT_CHUNK_GAMES = 256
+DEFAULT_MAX_TURNS = 50
+
+
+@dataclass(frozen=True)
+class PlayerSpec:
+    label: str                                       # the spec as given on the command line
+    archetype: Optional[str] = None                  # DummyPlayer archetype
+    weights: Optional[Dict[Any, List[float]]] = None # TrainedModel weights, already adapted to the feature schema
+
+    @property
+    def is_model(self) -> bool:
+        return self.weights is not None
+
+
+@dataclass(frozen=True)
+class SimulationChunk:
+    index: int
+    matchup: int
+    player_1: PlayerSpec
+    player_2: PlayerSpec
+    first_game: int
+    end_game: int
+
+
+def parse_player_spec(spec: str, db_path: Optional[str] = None) -> PlayerSpec:
+    """
+    Raises:
+        ValueError: Unknown archetype, missing model or a model id without a database
+    """
+    if spec in ARCHETYPE_CLASSES:
+        return PlayerSpec(spec, archetype=spec)
+
+    if spec == 'default':
+        return _artifact_spec(spec, get_base_path() / 'default_model.json')
+    if spec.startswith('file:'):
+        return _artifact_spec(spec, Path(spec[len('file:'):]))
+    if spec.startswith('model:'):
+        if db_path is None:
+            raise ValueError(f"{spec} needs --db")
+        from duel_game.ml_model.model_repo import ModelRepository
+        model = ModelRepository(db_path).load_trained_model(int(spec[len('model:'):]))
+        if model is None:
+            raise ValueError(f"No stored model for {spec}")
+        return PlayerSpec(spec, weights=model.weights)
+
+    raise ValueError(
+        f"Unknown player {spec!r}, expected an archetype ({', '.join(ARCHETYPE_CLASSES)}), "
+        f"'default', 'model:<id>' or 'file:<path>'"
+    )
+
+
+def _artifact_spec(label: str, path: Path) -> PlayerSpec:
+    with open(path, 'r', encoding='utf-8') as json_file:
+        return PlayerSpec(label, weights=model_from_artifact(json.load(json_file)).weights)
+
+
+def plan_chunks(players_1: List[PlayerSpec], players_2: List[PlayerSpec], games: int,
+                chunk_games: int = DEFAULT_CHUNK_GAMES) -> List[SimulationChunk]:
+    """Chunks of at most `chunk_games` games, matchup by matchup"""
+    for spec in players_1:
+        if spec.is_model:
+            raise ValueError(f"{spec.label} is a model, models only play as player 2")
+
+    chunks = []
+    for matchup, (player_1, player_2) in enumerate(product(players_1, players_2)):
+        for first_game in range(0, games, chunk_games):
+            chunks.append(SimulationChunk(len(chunks), matchup, player_1, player_2,
+                                          first_game, min(first_game + chunk_games, games)))
+    return chunks
+
+
+# ----------------------------
+# Simulation (worker processes)
+# ----------------------------
+def _make_player(spec: PlayerSpec, model: Optional[TrainedModel], rng) -> Player:
+    if model is not None:
+        return ArtificialPlayer(model, rng)
+    return DummyPlayer(ARCHETYPE_CLASSES[spec.archetype], rng)
+
+
+def simulate_chunk(chunk: SimulationChunk, max_turns: int, run_seed: int,
+                   with_samples: bool = False) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, np.ndarray]]]:
+    """
+    Play the games of one chunk.
+
+    Returns:
+        One result dict per match, and the chunk's samples as arrays when `with_samples`
+    """
+    model_2 = TrainedModel(chunk.player_2.weights) if chunk.player_2.is_model else None
+
+    results = []
+    features, labels, turns, matches = [], [], [], []
+    for game_index in range(chunk.first_game, chunk.end_game):
+        rngs = spawn_match_rngs(run_seed, chunk.matchup, game_index)
+        player_1 = _make_player(chunk.player_1, None, rngs.player_1)
+        player_2 = _make_player(chunk.player_2, model_2, rngs.player_2)
+
+        game = DuelGame(player_1, player_2, max_turns, rngs.engine, dodge_rng=rngs.dodge)
+        tracker = Tracker(game)
+        game.set_tracker(tracker)
+        player_1.set_game(game)
+        player_1.set_opponent(player_2)
+        player_2.set_game(game)
+        player_2.set_opponent(player_1)
+
+        game.play_game()
+
+        winner = None if game.winner is None else (1 if game.winner is player_1 else 2)
+        results.append({
+            'player_1': chunk.player_1.label,
+            'player_2': chunk.player_2.label,
+            'matchup': chunk.matchup,
+            'game': game_index,
+            'winner': winner,
+            'turns': game.turn,
+            'player_1_health': player_1.health,
+            'player_2_health': player_2.health,
+        })
+
+        if with_samples:
+            for sample in tracker.get_samples():
+                features.append(sample.features)
+                labels.append(int(sample.label))
+                turns.append(sample.turn)
+            matches.extend([(chunk.matchup, game_index)] * len(tracker.get_samples()))
+
+    samples = None
+    if with_samples:
+        samples = {
+            'features': np.array(features, dtype=np.float64).reshape(-1, len(feature_names)),
+            'labels': np.array(labels, dtype=np.int8),
+            'turns': np.array(turns, dtype=np.int32),
+            # (matchup, game) of every sample
+            'match': np.array(matches, dtype=np.int32).reshape(-1, 2),
+        }
+    return results, samples
+
+
+# ----------------------------
+# Streaming (main process)
+# ----------------------------
+def iter_chunk_results(chunks: List[SimulationChunk], max_turns: int, run_seed: int, with_samples: bool = False,
+                       worker_count: Optional[int] = None) -> Iterator[Tuple[SimulationChunk, List[Dict[str, Any]], Any]]:
+    """
+    Simulate `chunks` and yield (chunk, results, samples) in chunk order,
+    keeping at most two chunks per worker in flight.
+    """
+    worker_count = worker_count or os.cpu_count() or 1
+    if worker_count == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield (chunk, *simulate_chunk(chunk, max_turns, run_seed, with_samples))
+        return
+
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        yield from _bounded_ordered_map(executor, chunks, max_turns, run_seed, with_samples, 2 * worker_count)
+
+
+def _bounded_ordered_map(executor: Executor, chunks: List[SimulationChunk], max_turns: int, run_seed: int,
+                         with_samples: bool, window: int):
+    pending: deque[Tuple[SimulationChunk, Future]] = deque()
+    remaining = iter(chunks)
+    for chunk in remaining:
+        pending.append((chunk, executor.submit(simulate_chunk, chunk, max_turns, run_seed, with_samples)))
+        if len(pending) >= window:
+            break
+
+    while pending:
+        chunk, future = pending.popleft()
+        results, samples = future.result()
+        next_chunk = next(remaining, None)
+        if next_chunk is not None:
+            pending.append((next_chunk, executor.submit(simulate_chunk, next_chunk, max_turns, run_seed, with_samples)))
+        yield chunk, results, samples
+
+
+def run_simulation(chunks: List[SimulationChunk], max_turns: int, run_seed: int, results_file,
+                   samples_dir: Optional[str] = None, worker_count: Optional[int] = None) -> Dict[str, float]:
+    """
+    Stream the results of `chunks` to `results_file` (JSONL) and their samples
+    to `samples_dir`, returns throughput statistics
+    """
+    if samples_dir is not None:
+        os.makedirs(samples_dir, exist_ok=True)
+
+    started = perf_counter()
+    matches = turns = sample_count = 0
+    for chunk, results, samples in iter_chunk_results(chunks, max_turns, run_seed, samples_dir is not None,
+                                                      worker_count):
+        results_file.write(''.join(json.dumps(result) + '\n' for result in results))
+        matches += len(results)
+        turns += sum(result['turns'] for result in results)
+        if samples is not None:
+            np.savez(os.path.join(samples_dir, f'samples-{chunk.index:05d}.npz'), **samples)
+            sample_count += len(samples['labels'])
+    results_file.flush()
+
+    seconds = perf_counter() - started
+    return {
+        'matches': matches,
+        'turns': turns,
+        'samples': sample_count,
+        'seconds': seconds,
+        'matches_per_second': matches / seconds if seconds else 0.0,
+        'turns_per_second': turns / seconds if seconds else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog='python -m duel_game.duel_sim')
+    parser.add_argument('--player-1', nargs='+', required=True, help='archetype names')
+    parser.add_argument('--player-2', nargs='+', required=True,
+                        help="archetype names, 'default', 'model:<id>' or 'file:<path>'")
+    parser.add_argument('--db', default=None, help='database of the model:<id> players')
+    parser.add_argument('--games', type=int, default=100, help='games per matchup')
+    parser.add_argument('--max-turns', type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=None, help='processes, all cores by default')
+    parser.add_argument('--chunk-games', type=int, default=DEFAULT_CHUNK_GAMES)
+    parser.add_argument('--output', default='-', help="results JSONL file, '-' for stdout")
+    parser.add_argument('--samples-dir', default=None, help='write the Tracker samples of every chunk here as NPZ')
+    args = parser.parse_args(argv)
+
+    try:
+        players_1 = [parse_player_spec(spec, args.db) for spec in args.player_1]
+        players_2 = [parse_player_spec(spec, args.db) for spec in args.player_2]
+        chunks = plan_chunks(players_1, players_2, args.games, args.chunk_games)
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+
+    if args.output == '-':
+        stats = run_simulation(chunks, args.max_turns, args.seed, sys.stdout, args.samples_dir, args.workers)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as results_file:
+            stats = run_simulation(chunks, args.max_turns, args.seed, results_file, args.samples_dir, args.workers)
+
+    print(
+        f"{stats['matches']} matches, {stats['turns']} turns, {stats['samples']} samples in {stats['seconds']:.2f}s "
+        f"({stats['matches_per_second']:.0f} matches/s, {stats['turns_per_second']:.0f} turns/s)",
+        file=sys.stderr
+    )
+
+
+if __name__ == '__main__':
+    main()
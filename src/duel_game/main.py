@@ -1,32 +1,62 @@
 from duel_game.core.game import DuelGame
 from duel_game.core.presenter import Presenter
+from duel_game.core.input_source import InputSource, ConsoleInput, RecordingInput
 from duel_game.core.player import Player, ArtificialPlayer
-from duel_game.core.ml_model import TrainedModel
 from duel_game.core.helpers import get_base_path, is_in_bundled
+from duel_game.core.replay import ReplayWriter, MatchRecorder
 from duel_game.dataset.data_processor import Tracker
+from duel_game.dataset.human_capture import HumanGameCapture
+from duel_game.ml_model.model_provider import ArtifactModelProvider, RegistryModelProvider
 
 from dotenv import load_dotenv
-from typing import List
-import json
 from pathlib import Path 
+from typing import TextIO
 import os
 
 if not is_in_bundled():
     load_dotenv(get_base_path() / '.env')
 
 default_model_path = os.path.join(get_base_path(), 'default_model.json')
+# human matches are appended to this replay log when set
+replay_log_path = os.getenv('REPLAY_LOG_PATH')
+# when set, the AI plays the newest model of this database instead of default_model.json
+model_registry_path = os.getenv('MODEL_REGISTRY_PATH')
+# when set, every line the player types is appended to this decision file (replayable with ScriptedInput)
+input_record_path = os.getenv('INPUT_RECORD_PATH')
+# when set, the samples of human games are stored in this database (and their replays in REPLAY_LOG_PATH)
+human_capture_path = os.getenv('HUMAN_CAPTURE_DB_PATH')
 
 def main():
+    # both sources are watched and a newer model is swapped in between turns, without a restart
+    if model_registry_path:
+        model_provider = RegistryModelProvider(model_registry_path)
+    else:
+        model_provider = ArtifactModelProvider(default_model_path)
+
+    capture = HumanGameCapture(human_capture_path, replay_log_path) if human_capture_path else None
+    try:
+        with model_provider:
+            if input_record_path:
+                with open(input_record_path, 'a', encoding='utf-8') as record:
+                    play_sessions(model_provider, RecordingInput(ConsoleInput(), record), capture=capture)
+            else:
+                play_sessions(model_provider, capture=capture)
+    finally:
+        if capture is not None:
+            capture.close()
+
+# input_source, output and delays are passed to every Presenter, see duel_game.core.input_source
+# to drive the menus and games from scripts or policies
+# capture -> HumanGameCapture the finished games are queued to
+def play_sessions(model_provider, input_source: InputSource|None = None, output: TextIO|None = None, delays: bool = True,
+                  capture: HumanGameCapture|None = None):
     a_game_played = False
     lang='en'
     while True:
-        presenter = Presenter(lang)
+        presenter = Presenter(lang, input_source, output, delays)
 
         player = Player()
-        model = load_default_model(default_model_path)
-
-        ai_brain = TrainedModel(model["weights"])
-        ai_opponent = ArtificialPlayer(ai_brain)
+        ai_opponent = ArtificialPlayer(model_provider)
         
         game = DuelGame(player, ai_opponent, headless=False, presenter=presenter)
         tracker = Tracker(game)
@@ -42,7 +72,16 @@ def main():
         
         choice = presenter.main_menu()
         if choice == '1':
-            game.play_game()
+            if capture is not None:
+                game.set_recorder(capture.match_recorder(('human', model_provider.current().source)))
+                game.play_game()
+                capture.submit_game(tracker)
+            elif replay_log_path:
+                with ReplayWriter(replay_log_path) as replay_writer:
+                    game.set_recorder(MatchRecorder(replay_writer, ('human', model_provider.current().source)))
+                    game.play_game()
+            else:
+                game.play_game()
             a_game_played = True
         elif choice == '2':
             presenter.display_help()
@@ -53,9 +92,5 @@ def main():
         else:
             raise ValueError('unexpected choice value ' + str(choice))
 
-def load_default_model(model_file_path: str) -> dict[int, List[float]]:    
-    with open(model_file_path, 'r', encoding='utf-8') as json_file:
-        return json.load(json_file)
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,245 @@
+"""
+Early-stopping tournament evaluation of a candidate model against a baseline.
+
+For every DummyPlayer archetype the candidate and the baseline each play the
+same matches: game i of a pairing uses the random streams of
+(run_seed, opponent index, i) for both models (common random numbers), so
+the opponent, engine and dodge rolls only differ where the models' decisions
+differ. Games are played in growing batches. After every batch a sequential
+test on the discordant pairs (games one model won and the other did not)
+decides whether one model is better. The pairing stops as soon as the
+configured confidence is reached, or when the fixed game budget is used up.
+
+    python -m duel_game.ml_model.evaluation --db data/database.sqlite --model-id 3 [--seed 1] [--method sprt|bayes]
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+import argparse
+import json
+import math
+
+from duel_game.core.game import DuelGame
+from duel_game.core.helpers import get_base_path
+from duel_game.core.ml_model import ShadowScorer, TrainedModel
+from duel_game.core.player import ArtificialPlayer, DummyPlayer
+from duel_game.core.seeding import spawn_match_rngs
+from duel_game.dataset.data_processor import Tracker
+from duel_game.dataset.feature_schema import model_from_artifact
+from duel_game.dataset.generation import ARCHETYPE_CLASSES, ARCHETYPE_ORDER
+
+METHODS = ('sprt', 'bayes')
+
+CANDIDATE = 'candidate'
+BASELINE = 'baseline'
+INCONCLUSIVE = 'inconclusive'
+
+
+def load_default_model() -> TrainedModel:
+    with open(get_base_path() / 'default_model.json', 'r', encoding='utf-8') as json_file:
+        return model_from_artifact(json.load(json_file))
+
+
+def play_model_match(model: TrainedModel, opponent_name: str, max_turns: int, run_seed: int, *match_key: int,
+                     shadow: Optional[ShadowScorer] = None) -> float:
+    """
+    Play one headless match of `model` (player 2, as in the game) against a
+    DummyPlayer archetype with random streams derived from (run_seed, match_key).
+    `shadow` scores its models on every turn without changing the match.
+
+    Returns:
+        1.0 for a model win, 0.0 for a loss, 0.5 for a draw or turn limit
+    """
+    rngs = spawn_match_rngs(run_seed, *match_key)
+
+    opponent = DummyPlayer(ARCHETYPE_CLASSES[opponent_name], rngs.player_1)
+    ai_player = ArtificialPlayer(model, rngs.player_2, shadow)
+
+    game = DuelGame(opponent, ai_player, max_turns, rngs.engine, dodge_rng=rngs.dodge)
+    game.set_tracker(Tracker(game))
+
+    opponent.set_game(game)
+    opponent.set_opponent(ai_player)
+    ai_player.set_game(game)
+    ai_player.set_opponent(opponent)
+
+    game.play_game()
+
+    if game.winner is None:
+        return 0.5
+    return 1.0 if game.winner is ai_player else 0.0
+
+
+def sprt_decision(candidate_better: int, baseline_better: int, confidence: float, delta: float) -> Tuple[str, float]:
+    """
+    Wald's SPRT on the discordant pairs, H0: P(candidate better) = 0.5 - delta
+    against H1: 0.5 + delta, with both error rates 1 - confidence.
+
+    Returns:
+        (decision, log-likelihood ratio)
+    """
+    p0, p1 = 0.5 - delta, 0.5 + delta
+    llr = candidate_better * math.log(p1 / p0) + baseline_better * math.log((1 - p1) / (1 - p0))
+    error = 1 - confidence
+    upper = math.log((1 - error) / error)
+
+    if llr >= upper:
+        return CANDIDATE, llr
+    if llr <= -upper:
+        return BASELINE, llr
+    return INCONCLUSIVE, llr
+
+
+def bayes_decision(candidate_better: int, baseline_better: int, confidence: float) -> Tuple[str, float]:
+    """
+    Posterior probability that the candidate wins more discordant pairs,
+    P(p > 0.5) under a Beta(1 + candidate_better, 1 + baseline_better) posterior.
+
+    Returns:
+        (decision, posterior probability)
+    """
+    # for integer Beta parameters P(p <= 1/2) = P(Binomial(a + b - 1, 1/2) >= a)
+    a, b = 1 + candidate_better, 1 + baseline_better
+    n = a + b - 1
+    probability_below = sum(math.comb(n, k) for k in range(a, n + 1)) / 2 ** n
+    probability = 1 - probability_below
+
+    if probability >= confidence:
+        return CANDIDATE, probability
+    if probability <= 1 - confidence:
+        return BASELINE, probability
+    return INCONCLUSIVE, probability
+
+
+@dataclass(frozen=True)
+class PairingResult:
+    opponent_name: str
+    games: int
+    candidate_score: float
+    baseline_score: float
+    candidate_better: int
+    baseline_better: int
+    decision: str
+    statistic: float
+
+    @property
+    def candidate_win_rate(self) -> float:
+        return self.candidate_score / self.games if self.games else 0.0
+
+    @property
+    def baseline_win_rate(self) -> float:
+        return self.baseline_score / self.games if self.games else 0.0
+
+
+@dataclass(frozen=True)
+class EvaluationReport:
+    method: str
+    confidence: float
+    games_per_opponent_budget: int
+    pairings: List[PairingResult]
+
+    @property
+    def budget_games(self) -> int:
+        """Games the fixed evaluation plays (both models, every opponent)"""
+        return 2 * self.games_per_opponent_budget * len(self.pairings)
+
+    @property
+    def games_played(self) -> int:
+        return 2 * sum(pairing.games for pairing in self.pairings)
+
+    @property
+    def games_saved(self) -> int:
+        return self.budget_games - self.games_played
+
+
+def evaluate_pairing(candidate: TrainedModel, baseline: TrainedModel, opponent_name: str, opponent_index: int,
+                     run_seed: int, max_games: int = 1000, max_turns: int = 50, method: str = 'sprt',
+                     confidence: float = 0.95, delta: float = 0.1, initial_batch: int = 32) -> PairingResult:
+    """Play batches of paired games against one archetype until the sequential test decides"""
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
+    if not 0.5 < confidence < 1:
+        raise ValueError(f"confidence must be in (0.5, 1), got {confidence}")
+
+    games = 0
+    candidate_score = baseline_score = 0.0
+    candidate_better = baseline_better = 0
+    batch = initial_batch
+    decision, statistic = INCONCLUSIVE, 0.0
+
+    while games < max_games:
+        for game_index in range(games, min(games + batch, max_games)):
+            candidate_outcome = play_model_match(candidate, opponent_name, max_turns, run_seed, opponent_index, game_index)
+            baseline_outcome = play_model_match(baseline, opponent_name, max_turns, run_seed, opponent_index, game_index)
+
+            candidate_score += candidate_outcome
+            baseline_score += baseline_outcome
+            candidate_better += candidate_outcome > baseline_outcome
+            baseline_better += baseline_outcome > candidate_outcome
+            games += 1
+
+        if method == 'sprt':
+            decision, statistic = sprt_decision(candidate_better, baseline_better, confidence, delta)
+        else:
+            decision, statistic = bayes_decision(candidate_better, baseline_better, confidence)
+
+        if decision != INCONCLUSIVE:
+            break
+        batch *= 2
+
+    return PairingResult(opponent_name, games, candidate_score, baseline_score,
+                         candidate_better, baseline_better, decision, statistic)
+
+
+def evaluate_candidate(candidate: TrainedModel, baseline: Optional[TrainedModel] = None, run_seed: int = 1,
+                       opponents: Sequence[str] = ARCHETYPE_ORDER, max_games: int = 1000, max_turns: int = 50,
+                       method: str = 'sprt', confidence: float = 0.95, delta: float = 0.1,
+                       initial_batch: int = 32) -> EvaluationReport:
+    """
+    Compare `candidate` with `baseline` (the default model when None) against
+    every opponent archetype, stopping each pairing early once decided.
+
+    Args:
+        max_games: Fixed per-opponent budget, also the upper bound per pairing
+        method: 'sprt' or 'bayes'
+        confidence: 1 - error rate of the SPRT, or the posterior probability threshold
+        delta: SPRT indifference zone around 0.5 for P(candidate better | discordant)
+        initial_batch: Games before the first test, batches double afterwards
+    """
+    baseline = baseline or load_default_model()
+    pairings = [
+        evaluate_pairing(candidate, baseline, opponent_name, ARCHETYPE_ORDER.index(opponent_name), run_seed,
+                         max_games, max_turns, method, confidence, delta, initial_batch)
+        for opponent_name in opponents
+    ]
+    return EvaluationReport(method, confidence, max_games, pairings)
+
+
+def main(argv: Optional[List[str]] = None):
+    from duel_game.ml_model.model_repo import ModelRepository
+
+    parser = argparse.ArgumentParser(prog='python -m duel_game.ml_model.evaluation')
+    parser.add_argument('--model-id', type=int, required=True, help='candidate model in the model repository')
+    parser.add_argument('--db', required=True, help='model database file')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--method', choices=METHODS, default='sprt')
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--max-games', type=int, default=1000)
+    parser.add_argument('--max-turns', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    model = ModelRepository(args.db).load_trained_model(args.model_id)
+    if model is None:
+        raise SystemExit(f"Model {args.model_id} not found in {args.db}")
+
+    report = evaluate_candidate(model, None, args.seed, max_games=args.max_games,
+                                max_turns=args.max_turns, method=args.method, confidence=args.confidence)
+
+    for pairing in report.pairings:
+        print(f"{pairing.opponent_name:<13} {pairing.decision:<12} games={pairing.games:<5} "
+              f"candidate={pairing.candidate_win_rate:.3f} baseline={pairing.baseline_win_rate:.3f}")
+    print(f"Played {report.games_played} of {report.budget_games} budget games ({report.games_saved} saved)")
+
+
+if __name__ == '__main__':
+    main()
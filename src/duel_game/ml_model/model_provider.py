@@ -0,0 +1,178 @@
+"""
+Hot-reloadable serving model.
+
+A model provider owns the model the AI plays with and replaces it while
+games are running:
+
+    with ArtifactModelProvider('default_model.json') as provider:
+        ai_opponent = ArtificialPlayer(provider)
+        ...
+
+A background thread polls the source every `poll_interval` seconds. When the
+source changed (the artifact file's mtime and size, or a newer entry in the
+models table) the new weights are loaded and compiled on that thread, and
+only the finished TrainedModel is published as a new ModelHandle. Publishing
+is a single reference swap, so readers see either the old or the new handle,
+never a half-loaded model. ArtificialPlayer reads the handle once at the
+start of every turn, so a swap takes effect between turns.
+
+A source that fails to load (a partially written file, weights for another
+feature schema) is reported and skipped; the current model keeps serving.
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Optional
+import json
+import os
+import threading
+
+from duel_game.core.ml_model import TrainedModel
+from duel_game.dataset.feature_schema import model_from_artifact
+from duel_game.ml_model.model_repo import ModelRepository
+
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+@dataclass(frozen=True)
+class ModelHandle:
+    version: int    # 1 for the first model, +1 for every swap
+    source: str     # what was loaded, e.g. "models:12"
+    model: TrainedModel
+
+
+class ModelProvider(ABC):
+    """
+    Base provider. Subclasses implement _revision_value(), a cheap value that changes
+    whenever the source does, and _load(revision), which builds the model.
+    The first model is loaded synchronously, so a broken source fails here.
+    """
+
+    def __init__(self, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.last_error: Optional[BaseException] = None
+
+        self._handle: Optional[ModelHandle] = None
+        self._revision: Any = None
+        self._attempted_revision: Any = None
+        self._failed_revision: Any = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+        if not self.refresh():
+            raise ValueError(f"{type(self).__name__} found no model to serve")
+
+    def current(self) -> ModelHandle:
+        """The handle to predict with; read it once per turn"""
+        return self._handle
+
+    def refresh(self) -> bool:
+        """
+        Load the source if it changed since the last successful load.
+
+        Returns:
+            True when a new model was published
+
+        Raises:
+            Whatever loading raised; the current model stays published
+        """
+        with self._refresh_lock:
+            revision = self._revision_or_none()
+            if revision is None or revision == self._revision:
+                return False
+
+            self._attempted_revision = revision
+            model, source = self._load(revision)
+            version = 1 if self._handle is None else self._handle.version + 1
+            self._handle = ModelHandle(version, source, model)
+            self._revision = revision
+            if version > 1:
+                self.reloads += 1
+            return True
+
+    def start(self) -> 'ModelProvider':
+        """Start polling the source on a daemon thread"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='model-provider', daemon=True)
+            self.thread.start()
+        return self
+
+    def close(self) -> None:
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                self.failed_reloads += 1
+                self.last_error = e
+                # report a broken source once, not on every poll
+                if self._attempted_revision != self._failed_revision:
+                    self._failed_revision = self._attempted_revision
+                    print(f"Model reload failed, still serving {self._handle.source}: {e}")
+
+    def _revision_or_none(self) -> Any:
+        try:
+            return self._revision_value()
+        except OSError:
+            return None
+
+    @abstractmethod
+    def _revision_value(self) -> Any:
+        pass
+
+    @abstractmethod
+    def _load(self, revision: Any) -> tuple[TrainedModel, str]:
+        pass
+
+
+class ArtifactModelProvider(ModelProvider):
+    """
+    Serves a model artifact file ({"weights": ..., "feature_schema": ...}).
+    Replace the file atomically (write a temporary file, then os.replace) so
+    a poll never reads it half written.
+    """
+
+    def __init__(self, path: str, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.path = str(path)
+        super().__init__(poll_interval)
+
+    def _revision_value(self) -> Any:
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self, revision: Any) -> tuple[TrainedModel, str]:
+        with open(self.path, 'r', encoding='utf-8') as json_file:
+            model = model_from_artifact(json.load(json_file))
+        return model, f"{os.path.basename(self.path)}@{revision[0]}"
+
+
+class RegistryModelProvider(ModelProvider):
+    """Serves the newest ModelRepository entry, optionally only among the models of one run"""
+
+    def __init__(self, db_path: str, run_id: Optional[int] = None, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.repository = ModelRepository(db_path)
+        self.run_id = run_id
+        super().__init__(poll_interval)
+
+    def _revision_value(self) -> Any:
+        return self.repository.get_latest_model_id(self.run_id)
+
+    def _load(self, revision: Any) -> tuple[TrainedModel, str]:
+        model = self.repository.load_trained_model(revision)
+        if model is None:
+            raise ValueError(f"Model {revision} was deleted before it could be loaded")
+        return model, f"models:{revision}"
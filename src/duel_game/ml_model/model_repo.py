@@ -9,12 +9,32 @@ import random
 from functools import reduce
 
 from duel_game.core.essential_types import Action
+from duel_game.core.ml_model import TrainedModel
+from duel_game.dataset.migrations import Migration, MigrationRunner, add_column_if_missing
+from duel_game.dataset.feature_schema import (FEATURE_SCHEMA_FINGERPRINT, create_schema_table, stored_feature_adapter,
+                                              adapt_weights)
+
+# Version 1 is the models table _init_database creates (see dataset/migrations.py)
+MODEL_MIGRATIONS = (
+    Migration(1, 'baseline'),
+    # delete_model and per-run lookups filter on run_id
+    Migration(2, 'index models by run', apply=lambda conn: conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_models_run_id ON models(run_id)"
+    )),
+    # models saved before fingerprints keep a NULL feature_schema and are loaded as they are
+    Migration(3, 'feature schema fingerprints', apply=lambda conn: add_column_if_missing(
+        conn, 'models', 'feature_schema', 'TEXT'
+    )),
+)
 
 
 class ModelRepository:
-    def __init__(self, db_path: str = "../../data/database.sqlite"):
+    def __init__(self, db_path: str = "../../data/database.sqlite", auto_migrate: bool = True):
         self.db_path = db_path
         self._init_database()
+        if auto_migrate:
+            with sqlite3.connect(self.db_path) as conn:
+                MigrationRunner(conn, 'models', MODEL_MIGRATIONS).migrate()
     
     def _init_database(self):
         """Initialize database with models table if it doesn't exist"""
@@ -29,18 +49,23 @@ class ModelRepository:
                 weights_json TEXT NOT NULL,
                 accuracy REAL,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                feature_schema TEXT,
                 
                 FOREIGN KEY (run_id)
                     REFERENCES dataset_run(id)
                     ON DELETE CASCADE
             );
             """)
+
+            create_schema_table(conn)
             
             conn.commit()
     
-    def save_model(self, run_id: int, weights: Dict[int, List[float]], accuracy: Optional[float] = None) -> int:
+    def save_model(self, run_id: int, weights: Dict[int, List[float]], accuracy: Optional[float] = None,
+                   feature_schema: str = FEATURE_SCHEMA_FINGERPRINT) -> int:
         """
-        Save model weights to database
+        Save model weights to database, with the fingerprint of the feature
+        schema they were trained on (the current one by default)
         Returns the model ID
         """
         with sqlite3.connect(self.db_path) as conn:
@@ -51,9 +76,9 @@ class ModelRepository:
             
             # Insert or replace (to update existing model for this run)
             cursor.execute("""
-            INSERT INTO models (run_id, weights_json, accuracy, created_at)
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            """, (run_id, weights_json, accuracy))
+            INSERT INTO models (run_id, weights_json, accuracy, created_at, feature_schema)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?)
+            """, (run_id, weights_json, accuracy, feature_schema))
             
             model_id = cursor.lastrowid
             
@@ -72,7 +97,7 @@ class ModelRepository:
             cursor = conn.cursor()
             
             cursor.execute("""
-            SELECT id, run_id, weights_json, accuracy, created_at
+            SELECT id, run_id, weights_json, accuracy, created_at, feature_schema
             FROM models WHERE id = ?
             """, (model_id,))
             
@@ -84,9 +109,32 @@ class ModelRepository:
                     'run_id': row['run_id'],
                     'weights': weights,
                     'accuracy': row['accuracy'],
-                    'created_at': row['created_at']
+                    'created_at': row['created_at'],
+                    'feature_schema': row['feature_schema']
                 }
             return None
+
+    def load_trained_model(self, model_id: int) -> Optional[TrainedModel]:
+        """
+        TrainedModel of a stored model, its weights checked against the
+        current feature schema and reordered when needed
+        Raises FeatureSchemaMismatch when the weights cannot be adapted
+        """
+        model = self.get_model(model_id)
+        if model is None:
+            return None
+        with sqlite3.connect(self.db_path) as conn:
+            adapter = stored_feature_adapter(conn, model['feature_schema'])
+        return TrainedModel(adapt_weights(model['weights'], adapter))
+    
+    def get_latest_model_id(self, run_id: Optional[int] = None) -> Optional[int]:
+        """Id of the newest model, optionally among the models of one run"""
+        with sqlite3.connect(self.db_path) as conn:
+            if run_id is None:
+                row = conn.execute("SELECT MAX(id) FROM models").fetchone()
+            else:
+                row = conn.execute("SELECT MAX(id) FROM models WHERE run_id = ?", (run_id,)).fetchone()
+            return row[0]
     
     def get_all_models(self) -> List[dict]:
         """Get all models in database"""
@@ -95,7 +143,7 @@ class ModelRepository:
             cursor = conn.cursor()
             
             cursor.execute("""
-            SELECT id, run_id, weights_json, accuracy, created_at
+            SELECT id, run_id, weights_json, accuracy, created_at, feature_schema
             FROM models ORDER BY created_at DESC
             """)
             
@@ -106,7 +154,8 @@ class ModelRepository:
                     'run_id': row['run_id'],
                     'weights': json.loads(row['weights_json']),
                     'accuracy': row['accuracy'],
-                    'created_at': row['created_at']
+                    'created_at': row['created_at'],
+                    'feature_schema': row['feature_schema']
                 })
             return models
     
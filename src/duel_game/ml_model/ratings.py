@@ -0,0 +1,448 @@
+"""
+Glicko-2 rating ledger for policy variants and stored models.
+
+Rated players are identified by a key: "policy:<archetype>:<params hash>" for
+a DummyPlayer archetype with a set of knob values (see policy_params), or
+"model:<id>" for a ModelRepository entry. Match outcomes are ingested in bulk
+as (player, opponent, score, games) rows, where the score is the points the
+player took from those games (1 per win, 0.5 per draw). They are queued in
+the open rating period. close_period() rates every player at once from the
+queued outcomes, as Glicko-2 prescribes, and grows the deviation of players
+who did not play.
+
+schedule_matches() picks the pairings whose next game is expected to shrink
+the rating deviations the most, so the least certain ratings are resolved
+with the fewest simulated games.
+"""
+from __future__ import annotations
+from typing import Dict, Iterable, List, Any, Optional, Sequence, Tuple, TYPE_CHECKING
+import hashlib
+import json
+import math
+import sqlite3
+
+import numpy as np
+
+from duel_game.dataset.migrations import Migration, MigrationRunner
+from duel_game.dataset.run_config import get_run_configuration
+
+if TYPE_CHECKING:
+    from duel_game.ml_model.evaluation import EvaluationReport
+
+INITIAL_RATING = 1500.0
+INITIAL_DEVIATION = 350.0
+INITIAL_VOLATILITY = 0.06
+DEFAULT_TAU = 0.5
+
+# Glicko-2 works on this scale internally
+_SCALE = 173.7178
+_CONVERGENCE = 1e-6
+
+# Version 1 is the tables RatingLedger._create_tables creates
+RATING_MIGRATIONS = (
+    Migration(1, 'baseline'),
+)
+
+# config prefix of every archetype's knobs (RandomBiased knobs are RANDOM_BIASED_*)
+_POLICY_PARAM_PREFIXES = {
+    "Aggressive": "AGGRESSIVE_",
+    "Defensive": "DEFENSIVE_",
+    "Balanced": "BALANCED_",
+    "Healer": "HEALER_",
+    "Opportunist": "OPPORTUNIST_",
+    "RandomBiased": "RANDOM_BIASED_",
+}
+
+
+# ----------------------------
+# Player keys
+# ----------------------------
+def policy_params(policy_name: str, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Knob values the archetype plays with (the opponent lists and distributions are not knobs)"""
+    if policy_name not in _POLICY_PARAM_PREFIXES:
+        raise ValueError(f"Unknown policy {policy_name!r}, expected one of {sorted(_POLICY_PARAM_PREFIXES)}")
+    config = config if config is not None else get_run_configuration()
+    prefix = _POLICY_PARAM_PREFIXES[policy_name]
+    return {
+        name: value for name, value in config.items()
+        if name.startswith(prefix) and not name.endswith(('_OPPONENTS', '_DISTRIBUTION'))
+    }
+
+
+def params_hash(params: Dict[str, Any]) -> str:
+    encoded = json.dumps(params, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+def policy_key(policy_name: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Key of an archetype with `params` (the current configuration when None)"""
+    params = params if params is not None else policy_params(policy_name)
+    return f"policy:{policy_name}:{params_hash(params)}"
+
+
+def model_key(model_id: int) -> str:
+    return f"model:{model_id}"
+
+
+# ----------------------------
+# Glicko-2
+# ----------------------------
+def _g(phi: np.ndarray) -> np.ndarray:
+    return 1 / np.sqrt(1 + 3 * phi ** 2 / math.pi ** 2)
+
+
+def _expected(mu: np.ndarray, opponent_mu: np.ndarray, opponent_phi: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-_g(opponent_phi) * (mu - opponent_mu)))
+
+
+def _new_volatility(phi: float, sigma: float, v: float, delta: float, tau: float) -> float:
+    """Step 5 of Glickman's Glicko-2 procedure (Illinois iteration)"""
+    a = math.log(sigma ** 2)
+
+    def f(x):
+        ex = math.exp(x)
+        return ex * (delta ** 2 - phi ** 2 - v - ex) / (2 * (phi ** 2 + v + ex) ** 2) - (x - a) / tau ** 2
+
+    upper_a = a
+    if delta ** 2 > phi ** 2 + v:
+        lower_b = math.log(delta ** 2 - phi ** 2 - v)
+    else:
+        k = 1
+        while f(a - k * tau) < 0:
+            k += 1
+        lower_b = a - k * tau
+
+    f_a, f_b = f(upper_a), f(lower_b)
+    while abs(lower_b - upper_a) > _CONVERGENCE:
+        c = upper_a + (upper_a - lower_b) * f_a / (f_b - f_a)
+        f_c = f(c)
+        if f_c * f_b <= 0:
+            upper_a, f_a = lower_b, f_b
+        else:
+            f_a /= 2
+        lower_b, f_b = c, f_c
+
+    return math.exp(upper_a / 2)
+
+
+def glicko2_update(rating: float, deviation: float, volatility: float,
+                   opponent_ratings: Sequence[float], opponent_deviations: Sequence[float],
+                   scores: Sequence[float], games: Optional[Sequence[int]] = None,
+                   tau: float = DEFAULT_TAU) -> Tuple[float, float, float]:
+    """
+    Rate one player over a rating period.
+
+    Args:
+        opponent_ratings, opponent_deviations: Pre-period ratings of the opponents
+        scores: Points scored against each opponent
+        games: Games played against each opponent (1 each when None)
+
+    Returns:
+        (rating, deviation, volatility) after the period
+    """
+    mu = (rating - INITIAL_RATING) / _SCALE
+    phi = deviation / _SCALE
+
+    if len(scores) == 0:
+        return rating, min(math.sqrt(phi ** 2 + volatility ** 2) * _SCALE, INITIAL_DEVIATION), volatility
+
+    opponent_mu = (np.asarray(opponent_ratings, dtype=float) - INITIAL_RATING) / _SCALE
+    opponent_phi = np.asarray(opponent_deviations, dtype=float) / _SCALE
+    scores = np.asarray(scores, dtype=float)
+    games = np.ones_like(scores) if games is None else np.asarray(games, dtype=float)
+
+    g = _g(opponent_phi)
+    expected = _expected(mu, opponent_mu, opponent_phi)
+    v = 1 / float(np.sum(games * g ** 2 * expected * (1 - expected)))
+    improvement = float(np.sum(g * (scores - games * expected)))
+    delta = v * improvement
+
+    new_volatility = _new_volatility(phi, volatility, v, delta, tau)
+    pre_phi = math.sqrt(phi ** 2 + new_volatility ** 2)
+    new_phi = 1 / math.sqrt(1 / pre_phi ** 2 + 1 / v)
+    new_mu = mu + new_phi ** 2 * improvement
+
+    return new_mu * _SCALE + INITIAL_RATING, min(new_phi * _SCALE, INITIAL_DEVIATION), new_volatility
+
+
+# ----------------------------
+# Ledger
+# ----------------------------
+class RatingLedger:
+    def __init__(self, db_path: str = "database.db", tau: float = DEFAULT_TAU, auto_migrate: bool = True):
+        """
+        Args:
+            db_path: SQLite database file, may be shared with the dataset and model repositories
+            tau: Glicko-2 system constant, lower values change volatilities more slowly
+            auto_migrate: Apply pending schema migrations on open (see dataset/migrations.py)
+        """
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.tau = tau
+        self._create_tables()
+        if auto_migrate:
+            MigrationRunner(self.conn, 'ratings', RATING_MIGRATIONS).migrate()
+
+    def _create_tables(self):
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS rated_players (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_key TEXT NOT NULL UNIQUE,
+            kind TEXT NOT NULL,
+            params_json TEXT,
+            rating REAL NOT NULL,
+            deviation REAL NOT NULL,
+            volatility REAL NOT NULL,
+            games INTEGER NOT NULL DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        """)
+
+        # queued outcomes have period NULL until their rating period is closed
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS rating_outcomes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_id INTEGER NOT NULL,
+            opponent_id INTEGER NOT NULL,
+            score REAL NOT NULL,
+            games INTEGER NOT NULL,
+            period INTEGER,
+
+            FOREIGN KEY (player_id) REFERENCES rated_players(id) ON DELETE CASCADE,
+            FOREIGN KEY (opponent_id) REFERENCES rated_players(id) ON DELETE CASCADE
+        );
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_rating_outcomes_period ON rating_outcomes(period)")
+
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS rating_history (
+            player_id INTEGER NOT NULL,
+            period INTEGER NOT NULL,
+            rating REAL NOT NULL,
+            deviation REAL NOT NULL,
+            volatility REAL NOT NULL,
+
+            PRIMARY KEY (player_id, period),
+            FOREIGN KEY (player_id) REFERENCES rated_players(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """)
+
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS rating_periods (
+            period INTEGER PRIMARY KEY,
+            outcomes INTEGER NOT NULL,
+            games INTEGER NOT NULL,
+            closed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        """)
+        self.conn.commit()
+
+    # ----------------------------
+    # Players
+    # ----------------------------
+    def _player_id(self, player_key: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """Id of the player, added at the initial rating when new (the caller commits)"""
+        kind = player_key.split(':', 1)[0]
+        if kind not in ('policy', 'model'):
+            raise ValueError(f"Player keys start with 'policy:' or 'model:', got {player_key!r}")
+
+        self.conn.execute("""
+            INSERT INTO rated_players (player_key, kind, params_json, rating, deviation, volatility)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (player_key) DO NOTHING
+        """, (player_key, kind, json.dumps(params) if params is not None else None,
+              INITIAL_RATING, INITIAL_DEVIATION, INITIAL_VOLATILITY))
+        return self.conn.execute("SELECT id FROM rated_players WHERE player_key = ?", (player_key,)).fetchone()[0]
+
+    def register_policy(self, policy_name: str, params: Optional[Dict[str, Any]] = None) -> str:
+        params = params if params is not None else policy_params(policy_name)
+        key = policy_key(policy_name, params)
+        self._player_id(key, params)
+        self.conn.commit()
+        return key
+
+    def register_model(self, model_id: int) -> str:
+        key = model_key(model_id)
+        self._player_id(key)
+        self.conn.commit()
+        return key
+
+    def get_rating(self, player_key: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("""
+            SELECT player_key, kind, params_json, rating, deviation, volatility, games
+            FROM rated_players WHERE player_key = ?
+        """, (player_key,)).fetchone()
+        return self._player_dict(row) if row else None
+
+    def leaderboard(self, kind: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Players by conservative rating (rating - 2 deviations), the most certain first among equals"""
+        rows = self.conn.execute(f"""
+            SELECT player_key, kind, params_json, rating, deviation, volatility, games
+            FROM rated_players
+            {'WHERE kind = :kind' if kind else ''}
+            ORDER BY rating - 2 * deviation DESC, deviation
+            LIMIT :limit
+        """, {'kind': kind, 'limit': limit}).fetchall()
+        return [self._player_dict(row) for row in rows]
+
+    @staticmethod
+    def _player_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'player_key': row['player_key'],
+            'kind': row['kind'],
+            'params': json.loads(row['params_json']) if row['params_json'] else None,
+            'rating': row['rating'],
+            'deviation': row['deviation'],
+            'volatility': row['volatility'],
+            'games': row['games'],
+        }
+
+    # ----------------------------
+    # Outcomes
+    # ----------------------------
+    def record_outcomes(self, outcomes: Iterable[Tuple[str, str, float, int]]) -> int:
+        """
+        Queue (player key, opponent key, player score, games) rows in the open
+        rating period, registering unknown players. Both sides are rated from
+        one row. Returns the number of games queued.
+        """
+        ids: Dict[str, int] = {}
+        rows = []
+        for player, opponent, score, games in outcomes:
+            if games < 1 or not 0 <= score <= games:
+                raise ValueError(f"Score {score} is not possible in {games} games")
+            if player == opponent:
+                raise ValueError(f"{player!r} cannot be rated against itself")
+            for key in (player, opponent):
+                if key not in ids:
+                    ids[key] = self._player_id(key)
+            rows.append((ids[player], ids[opponent], score, games))
+
+        self.conn.executemany(
+            "INSERT INTO rating_outcomes (player_id, opponent_id, score, games) VALUES (?, ?, ?, ?)", rows
+        )
+        self.conn.commit()
+        return sum(row[3] for row in rows)
+
+    def record_evaluation(self, report: EvaluationReport, candidate_key: str, baseline_key: str) -> int:
+        """Queue every game of an evaluation run (evaluation.py) against the archetypes it played"""
+        outcomes = []
+        for pairing in report.pairings:
+            if pairing.games == 0:
+                continue
+            opponent = self.register_policy(pairing.opponent_name)
+            outcomes.append((candidate_key, opponent, pairing.candidate_score, pairing.games))
+            outcomes.append((baseline_key, opponent, pairing.baseline_score, pairing.games))
+        return self.record_outcomes(outcomes)
+
+    def pending_games(self) -> int:
+        return self.conn.execute("SELECT COALESCE(SUM(games), 0) FROM rating_outcomes WHERE period IS NULL").fetchone()[0]
+
+    def close_period(self) -> Dict[str, int]:
+        """
+        Rate every player from the queued outcomes against the opponents'
+        pre-period ratings, and grow the deviation of players without games.
+        """
+        players = {
+            row['id']: (row['rating'], row['deviation'], row['volatility'])
+            for row in self.conn.execute("SELECT id, rating, deviation, volatility FROM rated_players")
+        }
+
+        # every outcome row counts for both sides
+        results: Dict[int, List[Tuple[int, float, int]]] = {player_id: [] for player_id in players}
+        outcome_rows = 0
+        for row in self.conn.execute("SELECT player_id, opponent_id, score, games FROM rating_outcomes WHERE period IS NULL"):
+            results[row['player_id']].append((row['opponent_id'], row['score'], row['games']))
+            results[row['opponent_id']].append((row['player_id'], row['games'] - row['score'], row['games']))
+            outcome_rows += 1
+
+        period = self.conn.execute("SELECT COALESCE(MAX(period), 0) + 1 FROM rating_periods").fetchone()[0]
+        updates = []
+        for player_id, (rating, deviation, volatility) in players.items():
+            opponents = results[player_id]
+            new_rating, new_deviation, new_volatility = glicko2_update(
+                rating, deviation, volatility,
+                [players[opponent][0] for opponent, _, _ in opponents],
+                [players[opponent][1] for opponent, _, _ in opponents],
+                [score for _, score, _ in opponents],
+                [games for _, _, games in opponents],
+                self.tau
+            )
+            updates.append((new_rating, new_deviation, new_volatility,
+                            sum(games for _, _, games in opponents), player_id))
+
+        games = sum(update[3] for update in updates) // 2
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE rated_players SET rating = ?, deviation = ?, volatility = ?, games = games + ? WHERE id = ?",
+                updates
+            )
+            self.conn.executemany(
+                "INSERT INTO rating_history (player_id, period, rating, deviation, volatility) VALUES (?, ?, ?, ?, ?)",
+                [(player_id, period, rating, deviation, volatility)
+                 for rating, deviation, volatility, _, player_id in updates]
+            )
+            self.conn.execute("UPDATE rating_outcomes SET period = ? WHERE period IS NULL", (period,))
+            self.conn.execute(
+                "INSERT INTO rating_periods (period, outcomes, games) VALUES (?, ?, ?)", (period, outcome_rows, games)
+            )
+
+        return {'period': period, 'outcomes': outcome_rows, 'games': games, 'players': len(players)}
+
+    # ----------------------------
+    # Scheduling
+    # ----------------------------
+    def schedule_matches(self, count: int, player_keys: Optional[Sequence[str]] = None) -> List[Tuple[str, str]]:
+        """
+        Pick `count` games, greedily taking the pairing whose game is expected
+        to reduce the two rating variances the most, then assuming it was
+        played before picking the next one.
+
+        Models only play as the ArtificialPlayer against a DummyPlayer, so no
+        model is paired with another model. Model games are returned as
+        (policy key, model key), in player order.
+        """
+        rows = self.conn.execute("SELECT player_key, kind, rating, deviation FROM rated_players").fetchall()
+        if player_keys is not None:
+            wanted = set(player_keys)
+            rows = [row for row in rows if row['player_key'] in wanted]
+        if len(rows) < 2 or count < 1:
+            return []
+
+        keys = [row['player_key'] for row in rows]
+        is_model = np.array([row['kind'] == 'model' for row in rows])
+        mu = (np.array([row['rating'] for row in rows]) - INITIAL_RATING) / _SCALE
+        phi = np.array([row['deviation'] for row in rows]) / _SCALE
+
+        playable = ~(is_model[:, None] & is_model[None, :])
+        np.fill_diagonal(playable, False)
+        if not playable.any():
+            return []
+
+        schedule = []
+        for _ in range(count):
+            # Fisher information one game adds to each side, info[i, j] for player i against j
+            expected = _expected(mu[:, None], mu[None, :], phi[None, :])
+            info = _g(phi[None, :]) ** 2 * expected * (1 - expected)
+            variance = phi ** 2
+            after = 1 / (1 / variance[:, None] + info)
+            reduction = (variance[:, None] - after) + (variance[:, None] - after).T
+            reduction = np.where(playable, reduction, -np.inf)
+
+            i, j = np.unravel_index(np.argmax(reduction), reduction.shape)
+            phi[i] = math.sqrt(after[i, j])
+            phi[j] = math.sqrt(after[j, i])
+            if is_model[i] or (not is_model[j] and keys[i] > keys[j]):
+                i, j = j, i
+            schedule.append((keys[i], keys[j]))
+
+        return schedule
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,408 @@
+import pytest
+
+from duel_game.dataset.dataset_repo import DatasetRepository, FEATURE_COLUMNS
+from duel_game.dataset.generation import play_seeded_match
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = DatasetRepository(str(tmp_path / 'database.db'))
+    yield repo
+    repo.close()
+
+
+@pytest.fixture
+def run_id(repo):
+    template_id = repo.create_config_template('{"test": true}', 1, 'test')
+    return repo.create_run(template_id, 'test run', seed=1)
+
+
+@pytest.fixture
+def samples():
+    return [
+        sample
+        for game_index in range(5)
+        for sample in play_seeded_match('Aggressive', 'Healer', 30, 11, game_index).get_samples()
+    ]
+
+
+def test_migrated_columnar_run_matches_json_run(repo, run_id, samples):
+    sample_ids = repo.store_samples(samples, run_id)
+    json_samples = repo.get_run_samples(run_id)
+    assert sample_ids == [s['id'] for s in json_samples]
+
+    assert repo.migrate_run_to_columnar(run_id) == len(samples)
+    columnar_samples = repo.get_run_samples(run_id)
+
+    assert [s['features'] for s in columnar_samples] == [s['features'] for s in json_samples]
+    assert [s['label'] for s in columnar_samples] == [s['label'] for s in json_samples]
+
+
+def test_run_summary_is_maintained_by_triggers(repo, run_id, samples):
+    repo.store_samples(samples[:10], run_id)
+    repo.store_samples_columnar(samples[10:], run_id)
+
+    expected_labels = {}
+    for sample in samples:
+        expected_labels[int(sample.label)] = expected_labels.get(int(sample.label), 0) + 1
+
+    stats = repo.get_sample_statistics(run_id)
+    assert stats['total_samples'] == len(samples)
+    assert stats['label_distribution'] == expected_labels
+    assert stats['first_sample'] is not None and stats['last_sample'] is not None
+    assert repo.get_run_info(run_id)['sample_count'] == len(samples)
+
+    # moving the JSON rows to the columnar layout keeps the totals
+    repo.migrate_run_to_columnar(run_id)
+    assert repo.get_sample_statistics(run_id) == stats
+
+    repo.conn.execute("DELETE FROM samples_columnar WHERE run_id = ? AND label = 1", (run_id,))
+    repo.conn.commit()
+    expected_labels.pop(1, None)
+    stats = repo.get_sample_statistics(run_id)
+    assert stats['label_distribution'] == expected_labels
+    assert repo.get_run_info(run_id)['sample_count'] == sum(expected_labels.values())
+
+    repo.rebuild_run_summary(run_id)
+    rebuilt = repo.get_sample_statistics(run_id)
+    assert (rebuilt['total_samples'], rebuilt['label_distribution']) == (stats['total_samples'], expected_labels)
+
+    assert repo.delete_run(run_id)
+    assert repo.get_sample_statistics(run_id)['total_samples'] == 0
+
+
+def test_deduplicated_run_stores_each_vector_once(repo, run_id, samples):
+    # the same games twice: every vector is a duplicate the second time
+    first = repo.store_samples_deduplicated(samples, run_id)
+    second = repo.store_samples_deduplicated(samples, run_id)
+    assert first['new_vectors'] == first['unique_vectors'] <= len(samples)
+    assert second['new_vectors'] == 0
+
+    expected = sorted((s.features, int(s.label)) for s in samples * 2)
+    assert sorted((s['features'], s['label']) for s in repo.get_run_samples(run_id)) == expected
+    assert repo.get_run_info(run_id)['sample_count'] == 2 * len(samples)
+
+    X, y, counts = repo.get_weighted_samples(run_id)
+    assert len(X) == first['unique_vectors'] and sum(counts) == 2 * len(samples)
+
+    report = repo.get_dedup_report(run_id)
+    assert report['samples'] == 2 * len(samples)
+    assert report['training_rows'] == first['unique_vectors']
+    assert report['bytes_saved'] > 0
+
+    assert repo.delete_run(run_id)
+    assert repo.prune_sample_vectors() == first['unique_vectors']
+
+
+def test_a_failed_columnar_batch_is_rolled_back(repo, run_id, samples):
+    import sqlite3
+    from dataclasses import replace
+
+    broken = samples[:5] + [replace(samples[0], features=[object()] * len(FEATURE_COLUMNS))]
+    with pytest.raises(sqlite3.Error):
+        repo.store_samples_columnar(broken, run_id)
+
+    # the next write's commit must not pick up the rows inserted before the failure
+    repo.create_run(repo.get_run_info(run_id)['template_id'], 'next run', seed=2)
+    assert repo.get_run_info(run_id)['sample_count'] == 0
+    assert repo.get_run_samples(run_id) == []
+
+
+def test_columnar_aggregates_are_computed_in_sqlite(repo, run_id, samples):
+    repo.store_samples_columnar(samples, run_id, archetype='aggressive')
+
+    balance = repo.get_class_balance(run_id, group_by='low_hp')
+    expected = {}
+    low_hp_index = FEATURE_COLUMNS.index('low_hp')
+    for sample in samples:
+        by_label = expected.setdefault(sample.features[low_hp_index], {})
+        by_label[int(sample.label)] = by_label.get(int(sample.label), 0) + 1
+    assert balance == expected
+
+    means = repo.get_feature_means(run_id)
+    assert means['player_hp'] == pytest.approx(sum(s.features[0] for s in samples) / len(samples))
+
+    X, y = repo.get_training_subset(run_id, labels=[1], feature_ranges={'player_stamina': (0.5, None)})
+    stamina_index = FEATURE_COLUMNS.index('player_stamina')
+    expected_rows = [s for s in samples if int(s.label) == 1 and s.features[stamina_index] >= 0.5]
+    assert y == [1] * len(expected_rows)
+    assert X == [s.features for s in expected_rows]
+
+    with pytest.raises(ValueError):
+        repo.get_class_balance(run_id, group_by='not_a_feature')
+
+
+def test_high_throughput_mode_group_commits_from_many_producers(tmp_path, samples):
+    from concurrent.futures import ThreadPoolExecutor
+
+    repo = DatasetRepository(str(tmp_path / 'wal.db'), high_throughput=True,
+                             writer_queue_size=2, group_commit_rows=len(samples) * 3)
+    try:
+        assert repo.conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+        template_id = repo.create_config_template('{"test": "wal"}', 1, 'wal')
+        run_id = repo.create_run(template_id, 'wal run', seed=1)
+        # metadata writes are committed immediately and visible to readers
+        assert repo.get_run_info(run_id)['template_id'] == template_id
+
+        with ThreadPoolExecutor(max_workers=4) as producers:
+            futures = list(producers.map(lambda _: repo.store_samples_async(samples, run_id), range(8)))
+        for future in futures:
+            assert len(future.result()) == len(samples)
+
+        repo.flush()
+        assert len(repo.get_run_samples(run_id)) == 8 * len(samples)
+        assert repo._writer.commits < 8
+    finally:
+        repo.close()
+
+
+def test_a_failed_write_leaves_nothing_in_the_pending_group(tmp_path, samples):
+    from dataclasses import replace
+
+    repo = DatasetRepository(str(tmp_path / 'wal.db'), high_throughput=True, group_commit_rows=len(samples) * 10)
+    try:
+        template_id = repo.create_config_template('{"test": "savepoint"}', 1, 'savepoint')
+        run_id = repo.create_run(template_id, 'savepoint run', seed=1)
+
+        repo.store_samples_async(samples, run_id)
+        # fails on its last row, after the others were inserted
+        broken = samples + [replace(samples[0], features=[object()] * len(FEATURE_COLUMNS))]
+        with pytest.raises(TypeError):
+            repo.store_samples_async(broken, run_id).result()
+
+        repo.flush()
+        assert len(repo.get_run_samples(run_id)) == len(samples)
+        assert repo.get_run_info(run_id)['sample_count'] == len(samples)
+    finally:
+        repo.close()
+
+
+def test_group_commit_counts_rows_of_keyword_calls(tmp_path, samples):
+    repo = DatasetRepository(str(tmp_path / 'wal.db'), high_throughput=True,
+                             group_commit_rows=len(samples), group_commit_interval=60)
+    try:
+        template_id = repo.create_config_template('{"test": "rows"}', 1, 'rows')
+        run_id = repo.create_run(template_id, 'rows run', seed=1)
+        commits = repo._writer.commits
+
+        features = [s.features for s in samples]
+        labels = [int(s.label) for s in samples]
+        # a full group is committed (and resolved) right away, not after the interval
+        assert repo.store_samples_array(features=features, labels=labels, run_id=run_id).result(timeout=5) == len(samples)
+        assert repo.store_samples_deduplicated(samples=samples, run_id=run_id).result(timeout=5)['samples'] == len(samples)
+        assert repo._writer.commits == commits + 2
+        assert repo._writer.rows_written == 2 + 2 * len(samples)
+    finally:
+        repo.close()
+
+
+def test_a_failed_group_commit_fails_its_writes_instead_of_hanging(tmp_path, samples, monkeypatch):
+    import sqlite3
+
+    class FailingCommits:
+        failing = False
+
+        def __init__(self, conn):
+            self._conn = conn
+
+        def __getattr__(self, name):
+            return getattr(self._conn, name)
+
+        def commit(self):
+            if FailingCommits.failing:
+                raise sqlite3.OperationalError('disk I/O error')
+            self._conn.commit()
+
+    open_writer_repository = DatasetRepository._open_writer_repository
+
+    def open_failing_writer_repository(self):
+        repository = open_writer_repository(self)
+        repository.conn = FailingCommits(repository.conn)
+        return repository
+
+    monkeypatch.setattr(DatasetRepository, '_open_writer_repository', open_failing_writer_repository)
+    repo = DatasetRepository(str(tmp_path / 'wal.db'), high_throughput=True,
+                             group_commit_rows=len(samples) * 2, group_commit_interval=60)
+    try:
+        template_id = repo.create_config_template('{"test": "commit"}', 1, 'commit')
+        run_id = repo.create_run(template_id, 'commit run', seed=1)
+
+        FailingCommits.failing = True
+        grouped = repo.store_samples_async(samples, run_id)
+        # the second batch fills the group and its commit fails
+        committing = repo.store_samples_async(samples, run_id)
+        queued = []
+        for _ in range(3):
+            try:
+                queued.append(repo.store_samples_async(samples, run_id))
+            except RuntimeError:
+                pass
+
+        for future in [grouped, committing] + queued:
+            with pytest.raises(sqlite3.OperationalError):
+                future.result(timeout=5)
+        with pytest.raises(RuntimeError):
+            repo.flush()
+        with pytest.raises(RuntimeError):
+            repo.store_samples_async(samples, run_id)
+        assert repo.get_run_info(run_id)['sample_count'] == 0
+    finally:
+        repo.close()
+
+
+def test_sharded_generation_merges_into_one_reproducible_run(tmp_path):
+    import math
+    from duel_game.dataset.generation import generate_run_samples
+    from duel_game.dataset.run_config import get_run_configuration
+    from duel_game.dataset.sharding import generate_run_sharded, shard_db_path
+
+    config = get_run_configuration()
+    config['SAMPLES_COUNT_PER_RUN'] = 300
+    main_db = tmp_path / 'main.db'
+
+    run_id = generate_run_sharded(main_db, seed=5, config=config, run_label='sharded', worker_count=3)
+    second_run_id = generate_run_sharded(main_db, seed=6, config=config, run_label='sharded', worker_count=2)
+
+    expected = generate_run_samples(config, 5, math.ceil(300 * 1.05))
+    with DatasetRepository(str(main_db)) as repo:
+        stored = repo.get_run_samples(run_id)
+        assert [s['features'] for s in stored] == [s.features for s in expected]
+        assert [s['label'] for s in stored] == [int(s.label) for s in expected]
+
+        run_info = repo.get_run_info(run_id)
+        assert run_info['sample_count'] == len(expected)
+        assert run_info['seed'] == 5
+        # both runs share the deduplicated template
+        assert repo.get_run_info(second_run_id)['template_id'] == run_info['template_id']
+        assert len(repo.search_config_templates()) == 1
+
+    assert not shard_db_path(main_db, 0).exists()
+
+
+def test_keyset_pages_cover_runs_templates_and_samples(repo, samples):
+    template_ids = [
+        repo.create_config_template(f'{{"template": {i}}}', 1 + i % 2, label, '')
+        for i, label in enumerate(['aggressive sweep', 'defensive sweep', 'baseline', 'Aggressive long'])
+    ]
+    run_ids = [repo.create_run(template_ids[i % 4], f'run {i % 3}', seed=i) for i in range(10)]
+
+    seen, page_token = [], None
+    while True:
+        page = repo.list_runs(page_size=3, page_token=page_token)
+        seen += [run['id'] for run in page.items]
+        if page.next_page_token is None:
+            break
+        page_token = page.next_page_token
+    assert seen == run_ids
+
+    assert [r['id'] for r in repo.list_runs(label='run 1').items] == run_ids[1::3]
+    assert {r['app_version'] for r in repo.list_runs(app_version=2).items} == {2}
+    assert [r['id'] for r in repo.list_runs(run_index_prefix='1.1.').items] == run_ids[0::4]
+
+    # FTS5 substring search is case-insensitive like the LIKE it replaces
+    assert [t['id'] for t in repo.list_config_templates(label_query='ggress').items] == [template_ids[0], template_ids[3]]
+    assert {t['id'] for t in repo.search_config_templates('sweep')} == {template_ids[0], template_ids[1]}
+
+    with pytest.raises(ValueError):
+        repo.list_runs(label='run 2', page_token=repo.list_runs(page_size=1).next_page_token)
+
+    repo.store_samples(samples, run_ids[0])
+    labels = [int(s.label) for s in samples]
+    assert [s['label'] for s in repo.iter_run_samples(run_ids[0], page_size=7)] == labels
+    first_page = repo.get_run_samples_page(run_ids[0], labels=[1], page_size=5)
+    assert [s['label'] for s in first_page.items] == [1] * min(5, labels.count(1))
+
+
+@pytest.mark.parametrize('codec', ['zlib', 'lzma'])
+def test_archived_run_streams_back_its_samples(repo, run_id, samples, codec):
+    import numpy as np
+
+    repo.store_samples(samples, run_id)
+    stats = repo.get_sample_statistics(run_id)
+    live_batches = list(repo.iter_run_batches(run_id, batch_size=64))
+
+    report = repo.archive_run(run_id, codec=codec, block_rows=50)
+    assert report['samples'] == len(samples)
+    assert report['compression_ratio'] > 1
+    assert repo.conn.execute("SELECT COUNT(*) FROM samples WHERE run_id = ?", (run_id,)).fetchone()[0] == 0
+    assert repo.get_sample_statistics(run_id) == stats
+    assert repo.get_run_info(run_id)['sample_count'] == len(samples)
+
+    archived_batches = list(repo.iter_run_batches(run_id))
+    assert [len(labels) for _, labels in archived_batches[:-1]] == [50] * (len(archived_batches) - 1)
+    assert np.array_equal(np.concatenate([f for f, _ in archived_batches]), np.concatenate([f for f, _ in live_batches]))
+    assert np.array_equal(np.concatenate([l for _, l in archived_batches]), [int(s.label) for s in samples])
+
+    paged = list(repo.iter_run_samples(run_id, labels=[1], page_size=7))
+    assert [s['id'] for s in paged] == [i for i, s in enumerate(samples) if int(s.label) == 1]
+    assert repo.get_run_samples(run_id)[3]['features'] == pytest.approx(samples[3].features, abs=1e-6)
+
+    with pytest.raises(ValueError):
+        repo.archive_run(run_id)
+
+
+def test_a_mixed_layout_run_is_read_from_every_layout(repo, run_id, samples):
+    json_part, columnar_part, vector_part = samples[:10], samples[10:50], samples[50:]
+    repo.store_samples(json_part, run_id)
+    repo.store_samples_columnar(columnar_part, run_id)
+    repo.store_samples_deduplicated(vector_part, run_id)
+    assert repo.get_run_info(run_id)['sample_count'] == len(samples)
+
+    read = repo.get_run_samples(run_id)
+    assert len(read) == len(samples)
+    assert [s['label'] for s in read[:50]] == [int(s.label) for s in json_part + columnar_part]
+
+    paged = list(repo.iter_run_samples(run_id, page_size=7))
+    assert sum(s.get('count', 1) for s in paged) == len(samples)
+    assert [s['label'] for s in paged[:50]] == [s['label'] for s in read[:50]]
+
+    labelled = list(repo.iter_run_samples(run_id, labels=[1], page_size=3))
+    assert sum(s.get('count', 1) for s in labelled) == sum(int(s.label) == 1 for s in samples)
+
+    assert sum(len(labels) for _, labels in repo.iter_run_batches(run_id, batch_size=16)) == len(samples)
+    with pytest.raises(ValueError):
+        repo.get_run_samples_page(run_id, archetype='aggressive')
+
+
+def test_archiving_a_mixed_layout_run_keeps_every_sample(repo, run_id, samples, monkeypatch):
+    json_part, columnar_part, vector_part = samples[:10], samples[10:50], samples[50:]
+    repo.store_samples(json_part, run_id)
+    repo.store_samples_columnar(columnar_part, run_id)
+    repo.store_samples_deduplicated(vector_part, run_id)
+    stats = repo.get_sample_statistics(run_id)
+    live_labels = [s['label'] for s in repo.get_run_samples(run_id)]
+    live_batches = [int(label) for _, labels in repo.iter_run_batches(run_id, batch_size=16) for label in labels]
+    assert len(live_labels) == len(samples)
+
+    # an archive missing some live rows is refused before anything is deleted
+    monkeypatch.setattr(repo, '_live_layouts', lambda run_id: ['json'])
+    with pytest.raises(ValueError):
+        repo.archive_run(run_id)
+    assert not repo.is_run_archived(run_id)
+    assert repo.conn.execute("SELECT COUNT(*) FROM samples_columnar WHERE run_id = ?", (run_id,)).fetchone()[0] == 40
+    monkeypatch.undo()
+
+    report = repo.archive_run(run_id)
+    assert report['samples'] == len(samples)
+    assert repo.get_run_info(run_id)['sample_count'] == len(samples)
+    assert repo.get_sample_statistics(run_id) == stats
+
+    # the same rows, in the same order, before and after archiving
+    archived_labels = [s['label'] for s in repo.get_run_samples(run_id)]
+    assert archived_labels == live_labels
+    assert archived_labels[:50] == [int(s.label) for s in json_part + columnar_part]
+    assert sorted(archived_labels[50:]) == sorted(int(s.label) for s in vector_part)
+    archived_batches = [int(label) for _, labels in repo.iter_run_batches(run_id, batch_size=16) for label in labels]
+    assert archived_batches == live_batches == live_labels
+    assert sum(s.get('count', 1) for s in repo.iter_run_samples(run_id, page_size=7)) == len(samples)
+
+
+def test_create_run_takes_seed_and_note_by_keyword_only(repo):
+    template_id = repo.create_config_template('{"test": "keywords"}', 1, 'keywords')
+    # the old (template, label, samples_count, seed, note) order must not shift silently
+    with pytest.raises(TypeError):
+        repo.create_run(template_id, 'old order', 0, 7, 'note')
+
+    run_id = repo.create_run(template_id, 'run', seed=7, note='note')
+    assert (repo.get_run_info(run_id)['seed'], repo.get_run_info(run_id)['sample_count']) == (7, 0)
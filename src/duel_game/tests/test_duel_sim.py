@@ -0,0 +1,38 @@
+import json
+
+import numpy as np
+import pytest
+
+from duel_game.dataset.generation import play_seeded_match
+from duel_game.duel_sim import main, parse_player_spec, plan_chunks
+
+
+def test_simulation_output_does_not_depend_on_the_worker_count(tmp_path, capsys):
+    outputs = []
+    for workers in (1, 2):
+        output = tmp_path / f'results-{workers}.jsonl'
+        main(['--player-1', 'Aggressive', 'Healer', '--player-2', 'Defensive', 'default',
+              '--games', '10', '--chunk-games', '3', '--seed', '6', '--workers', str(workers),
+              '--output', str(output), '--samples-dir', str(tmp_path / f'samples-{workers}')])
+        assert '40 matches' in capsys.readouterr().err
+        outputs.append([json.loads(line) for line in output.read_text().splitlines()])
+
+    assert outputs[0] == outputs[1]
+    assert [(result['matchup'], result['game']) for result in outputs[0]] == \
+        [(matchup, game) for matchup in range(4) for game in range(10)]
+
+    # matchup 0 is Aggressive vs Defensive, seeded like generation's matches
+    tracker = play_seeded_match('Aggressive', 'Defensive', 50, 6, 0, 1)
+    chunk = np.load(tmp_path / 'samples-2' / 'samples-00000.npz')
+    in_game = (chunk['match'] == [0, 1]).all(axis=1)
+    assert np.array_equal(chunk['features'][in_game], [sample.features for sample in tracker.get_samples()])
+    assert outputs[0][1]['turns'] == tracker.get_samples()[-1].turn
+
+
+def test_models_are_refused_as_player_1():
+    with pytest.raises(ValueError):
+        plan_chunks([parse_player_spec('default')], [parse_player_spec('Healer')], 1)
+    with pytest.raises(ValueError):
+        parse_player_spec('model:1')
+    with pytest.raises(ValueError):
+        parse_player_spec('Berserker')
@@ -0,0 +1,39 @@
+import pytest
+
+from duel_game.core.ml_model import TrainedModel
+from duel_game.ml_model.evaluation import (
+    evaluate_candidate, load_default_model, sprt_decision, bayes_decision, BASELINE, CANDIDATE, INCONCLUSIVE
+)
+
+
+def test_identical_models_share_every_outcome_and_use_the_full_budget():
+    model = load_default_model()
+    report = evaluate_candidate(model, model, run_seed=5, opponents=['Aggressive', 'Healer'], max_games=48)
+
+    for pairing in report.pairings:
+        # common random numbers: the same model replays the same games exactly
+        assert pairing.candidate_better == pairing.baseline_better == 0
+        assert pairing.candidate_score == pairing.baseline_score
+        assert pairing.decision == INCONCLUSIVE and pairing.games == 48
+    assert report.games_saved == 0 and report.games_played == report.budget_games == 192
+
+
+@pytest.mark.parametrize('method', ['sprt', 'bayes'])
+def test_a_weaker_candidate_is_rejected_early(method):
+    baseline = load_default_model()
+    weaker = TrainedModel({action: [-weight for weight in weights] for action, weights in baseline.weights.items()})
+    report = evaluate_candidate(weaker, baseline, run_seed=1, opponents=['Defensive', 'RandomBiased'],
+                                max_games=1000, method=method)
+
+    assert [pairing.decision for pairing in report.pairings] == [BASELINE, BASELINE]
+    assert all(pairing.games < 1000 for pairing in report.pairings)
+    assert report.games_saved == report.budget_games - report.games_played > 0
+
+
+def test_sequential_decisions_are_symmetric():
+    assert sprt_decision(30, 5, 0.95, 0.1)[0] == CANDIDATE
+    assert sprt_decision(5, 30, 0.95, 0.1)[0] == BASELINE
+    assert sprt_decision(10, 10, 0.95, 0.1) == (INCONCLUSIVE, 0.0)
+    assert bayes_decision(10, 10, 0.95) == (INCONCLUSIVE, pytest.approx(0.5))
+    assert bayes_decision(20, 3, 0.95)[0] == CANDIDATE
+    assert bayes_decision(3, 20, 0.95)[0] == BASELINE
@@ -0,0 +1,80 @@
+import json
+
+import numpy as np
+import pytest
+
+from duel_game.core.helpers import get_base_path
+from duel_game.dataset.dataset_repo import DatasetRepository
+from duel_game.dataset.feature_schema import (FEATURE_SCHEMA, FEATURE_SCHEMA_FINGERPRINT, FeatureSchemaMismatch,
+                                              model_from_artifact, schema_fingerprint)
+from duel_game.dataset.generation import play_seeded_match
+from duel_game.ml_model.model_repo import ModelRepository
+
+
+def _register(repo, schema):
+    fingerprint = schema_fingerprint(schema)
+    repo.conn.execute("INSERT INTO feature_schemas (fingerprint, schema_json) VALUES (?, ?)",
+                      (fingerprint, json.dumps(schema)))
+    return fingerprint
+
+
+def test_runs_are_adapted_or_refused_by_their_feature_schema(tmp_path):
+    samples = play_seeded_match('Balanced', 'Healer', 30, 4, 0).get_samples()
+    expected = [sample.features for sample in samples]
+
+    # the same features stored in reverse order, and with another normalization
+    reversed_schema = {**FEATURE_SCHEMA, 'features': FEATURE_SCHEMA['features'][::-1]}
+    renormalized_schema = {**FEATURE_SCHEMA, 'MAX_TURN': 100}
+
+    with DatasetRepository(str(tmp_path / 'database.db')) as repo:
+        template_id = repo.create_config_template('{"test": true}', 1, 'test')
+        current, reordered, renormalized, legacy = (repo.create_run(template_id, label, seed=1)
+                                                    for label in ('current', 'reordered', 'renormalized', 'legacy'))
+        assert repo.get_run_info(current)['feature_schema'] == FEATURE_SCHEMA_FINGERPRINT
+
+        repo.store_samples(samples, current)
+        repo.store_samples_array(np.array(expected)[:, ::-1], np.array([int(s.label) for s in samples]), reordered)
+        repo.store_samples(samples, renormalized)
+        repo.store_samples(samples, legacy)
+        for run_id, fingerprint in ((reordered, _register(repo, reversed_schema)),
+                                    (renormalized, _register(repo, renormalized_schema)), (legacy, None)):
+            repo.conn.execute("UPDATE dataset_run SET feature_schema = ? WHERE id = ?", (fingerprint, run_id))
+        repo.conn.commit()
+
+        for run_id in (current, reordered, legacy):
+            assert [sample['features'] for sample in repo.get_run_samples(run_id)] == expected
+            assert [sample['features'] for sample in repo.iter_run_samples(run_id, page_size=7)] == expected
+            batches = list(repo.iter_run_batches(run_id))
+            assert np.allclose(np.concatenate([features for features, _ in batches]), expected)
+
+        with pytest.raises(FeatureSchemaMismatch):
+            repo.get_run_samples(renormalized)
+        with pytest.raises(FeatureSchemaMismatch):
+            next(repo.iter_run_batches(renormalized))
+
+
+def test_model_weights_are_checked_against_the_feature_schema(tmp_path):
+    with open(get_base_path() / 'default_model.json', encoding='utf-8') as json_file:
+        artifact = json.load(json_file)
+    default_model = model_from_artifact(artifact)
+
+    db_path = str(tmp_path / 'database.db')
+    with DatasetRepository(db_path) as repo:
+        template_id = repo.create_config_template('{"test": true}', 1, 'test')
+        run_id = repo.create_run(template_id, 'run', seed=1)
+        reversed_fingerprint = _register(repo, {**FEATURE_SCHEMA, 'features': FEATURE_SCHEMA['features'][::-1]})
+        repo.conn.commit()
+
+    models = ModelRepository(db_path)
+    current_id = models.save_model(run_id, artifact['weights'], 0.5)
+    reversed_weights = {action: [vector[0]] + vector[:0:-1] for action, vector in artifact['weights'].items()}
+    reversed_id = models.save_model(run_id, reversed_weights, 0.5, feature_schema=reversed_fingerprint)
+    unknown_id = models.save_model(run_id, artifact['weights'], 0.5, feature_schema='0000000000000000')
+
+    assert models.get_model(current_id)['feature_schema'] == FEATURE_SCHEMA_FINGERPRINT
+    assert models.load_trained_model(current_id).weights == default_model.weights
+    assert models.load_trained_model(reversed_id).weights == default_model.weights
+    with pytest.raises(FeatureSchemaMismatch):
+        models.load_trained_model(unknown_id)
+    with pytest.raises(FeatureSchemaMismatch):
+        model_from_artifact({**artifact, 'feature_schema': {**FEATURE_SCHEMA, 'HISTORY_LEN': 8}})
@@ -0,0 +1,35 @@
+import numpy as np
+
+from duel_game.core.replay import ReplayWriter
+from duel_game.dataset.dataset_repo import DatasetRepository
+from duel_game.dataset.featurizer import featurize_log, featurize_log_into_run
+from duel_game.dataset.generation import plan_run_pairings, play_pairing
+from duel_game.dataset.run_config import get_run_configuration
+
+
+def test_featurized_replays_match_the_tracker_samples(tmp_path):
+    config = get_run_configuration()
+    log_path = str(tmp_path / 'replays.dgr')
+    with ReplayWriter(log_path) as writer:
+        samples = [
+            sample
+            for pairing in plan_run_pairings(config, 3000)
+            for sample in play_pairing(pairing, config["MAX_TURNS_PER_GAME"], 21, writer)
+        ]
+
+    # small chunks over two processes, concatenated back in log order
+    features, labels, turns = featurize_log(log_path, worker_count=2, chunk_matches=16)
+
+    assert np.array_equal(features, np.array([sample.features for sample in samples]))
+    assert labels.tolist() == [int(sample.label) for sample in samples]
+    assert turns.tolist() == [sample.turn for sample in samples]
+
+    with DatasetRepository(str(tmp_path / 'database.db')) as repo:
+        template_id = repo.create_config_template('{"test": true}', 1, 'test')
+        run_id = featurize_log_into_run(repo, log_path, template_id, 'refeaturized', worker_count=1)
+
+        assert repo.get_run_info(run_id)['seed'] == 21
+        assert repo.get_run_info(run_id)['sample_count'] == len(samples)
+        stored = repo.get_run_samples(run_id)
+        assert len(stored) == len(samples)
+        assert stored[-1]['features'] == samples[-1].features
@@ -0,0 +1,71 @@
+import pytest
+
+from duel_game.core.seeding import spawn_match_rngs
+from duel_game.dataset.generation import generate_run_samples, generate_worker_samples, merge_worker_samples
+from duel_game.dataset.run_config import get_run_configuration
+
+
+SAMPLES_COUNT = 400
+
+
+@pytest.fixture
+def config():
+    return get_run_configuration()
+
+
+def as_rows(samples):
+    return [(tuple(s.features), s.label, s.turn) for s in samples]
+
+
+def test_match_streams_are_deterministic_and_independent():
+    first = spawn_match_rngs(7, 3, 1)
+    second = spawn_match_rngs(7, 3, 1)
+    other_match = spawn_match_rngs(7, 3, 2)
+
+    assert first.player_1.random() == second.player_1.random()
+    assert first.dodge.random() == second.dodge.random()
+    assert spawn_match_rngs(7, 3, 1).player_1.random() != spawn_match_rngs(7, 3, 1).player_2.random()
+    assert spawn_match_rngs(7, 3, 1).engine.random() != other_match.engine.random()
+
+
+def test_same_seed_reproduces_run(config):
+    first = generate_run_samples(config, 1234, SAMPLES_COUNT)
+    second = generate_run_samples(config, 1234, SAMPLES_COUNT)
+    other = generate_run_samples(config, 4321, SAMPLES_COUNT)
+
+    assert len(first) >= SAMPLES_COUNT
+    assert as_rows(first) == as_rows(second)
+    assert as_rows(first) != as_rows(other)
+
+
+@pytest.mark.parametrize("worker_count", [2, 3, 7])
+def test_sharded_run_matches_single_worker_run(config, worker_count):
+    single = generate_run_samples(config, 99, SAMPLES_COUNT)
+    sharded = merge_worker_samples([
+        generate_worker_samples(config, 99, SAMPLES_COUNT, worker_index, worker_count)
+        for worker_index in reversed(range(worker_count))
+    ])
+
+    assert as_rows(sharded) == as_rows(single)
+
+
+def test_arena_workers_fill_shared_memory_in_run_order(config, tmp_path):
+    from duel_game.dataset.arena import SimulationArena
+    from duel_game.dataset.dataset_repo import DatasetRepository
+
+    expected = generate_run_samples(config, 9, SAMPLES_COUNT)
+
+    with SimulationArena.for_run(config, SAMPLES_COUNT) as arena:
+        arena.run(9, worker_count=3)
+        assert arena.progress()['samples_written'] == len(expected)
+
+        features, labels, turns = arena.samples()
+        assert features.tolist() == [s.features for s in expected]
+        assert labels.tolist() == [int(s.label) for s in expected]
+        assert turns.tolist() == [s.turn for s in expected]
+
+        with DatasetRepository(str(tmp_path / 'arena.db')) as repo:
+            run_id = repo.create_run(repo.create_config_template('{}', 1, 'arena'), 'arena', seed=9)
+            assert repo.store_samples_array(features, labels, run_id) == len(expected)
+            assert [s['features'] for s in repo.get_run_samples(run_id)] == [s.features for s in expected]
+        del features, labels, turns
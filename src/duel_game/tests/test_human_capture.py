@@ -0,0 +1,45 @@
+import io
+import random
+
+from duel_game.core.helpers import get_base_path
+from duel_game.core.input_source import PolicyInput, ScriptedInput, feasible_actions
+from duel_game.core.replay import ReplayReader
+from duel_game.dataset.dataset_repo import DatasetRepository
+from duel_game.dataset.human_capture import HUMAN_RUN_LABEL, HumanGameCapture
+from duel_game.main import play_sessions
+from duel_game.ml_model.model_provider import ArtifactModelProvider
+
+
+def test_captured_games_are_stored_in_one_human_run(tmp_path):
+    db_path = str(tmp_path / 'database.db')
+    log_path = str(tmp_path / 'human.dgr')
+    model_provider = ArtifactModelProvider(str(get_base_path() / 'default_model.json'))
+    rng = random.Random(2)
+
+    def play(games):
+        menus = ScriptedInput(['1'] * games + ['4'])
+        play_sessions(model_provider, PolicyInput(lambda state: rng.choice(feasible_actions(state)), menus),
+                      io.StringIO(), delays=False, capture=capture)
+
+    # two processes' worth of sessions end up in the same run
+    with HumanGameCapture(db_path, log_path) as capture:
+        play(2)
+        capture.flush()
+        first_run = capture.run_id
+        assert capture.repo.get_run_info(first_run)['sample_count'] == capture.samples_submitted
+    first_samples = capture.samples_submitted
+
+    with HumanGameCapture(db_path, log_path) as capture:
+        play(1)
+    assert capture.run_id == first_run and capture.games_submitted == 1
+
+    with DatasetRepository(db_path) as repo:
+        info = repo.get_run_info(first_run)
+        assert info['label'] == HUMAN_RUN_LABEL
+        assert info['sample_count'] == first_samples + capture.samples_submitted
+
+    with ReplayReader(log_path) as replays:
+        assert len(replays) == 3
+        assert replays[0].player_labels == ('human', model_provider.current().source)
+        # every turn of a game becomes one sample
+        assert sum(len(replay.player_1_actions) for replay in replays) == info['sample_count']
@@ -0,0 +1,49 @@
+import pytest
+
+from duel_game.core import instrumentation
+from duel_game.core.instrumentation import Instrumentation
+from duel_game.dataset.generation import play_seeded_match
+
+
+@pytest.fixture
+def probe():
+    probe = instrumentation.enable()
+    yield probe
+    instrumentation.disable()
+
+
+def test_disabled_by_default():
+    assert instrumentation.active is None
+    play_seeded_match('Aggressive', 'Defensive', 10, 1, 0)
+    assert instrumentation.active is None
+
+
+def test_game_turn_hot_paths_are_timed(probe):
+    tracker = play_seeded_match('Aggressive', 'Defensive', 10, 1, 0)
+    turns = len(tracker.records)
+    snapshot = probe.snapshot()
+
+    assert snapshot['choose_action']['aggressive']['count'] == turns
+    assert snapshot['choose_action']['defensive']['count'] == turns
+    assert snapshot['tracker_record']['total']['count'] == turns
+    assert snapshot['tracker_record']['extract_features']['count'] == turns
+    assert snapshot['state_resolution']['headless']['count'] == turns
+
+
+def test_histogram_buckets_and_prometheus_export(tmp_path):
+    probe = Instrumentation(buckets=(1e-3, 1e-2))
+    probe.observe('model_predict', 'trained_model', 5e-4)
+    probe.observe('model_predict', 'trained_model', 5e-3)
+    probe.observe('model_predict', 'trained_model', 1.0)
+
+    histogram = probe.snapshot()['model_predict']['trained_model']
+    assert list(histogram['buckets'].values()) == [1, 1, 1]
+    assert histogram['count'] == 3
+
+    output_file = tmp_path / 'duel_game.prom'
+    probe.write_prometheus(output_file)
+    text = output_file.read_text()
+    assert '# TYPE duel_game_model_predict_seconds histogram' in text
+    assert 'duel_game_model_predict_seconds_bucket{model="trained_model",le="0.01"} 2' in text
+    assert 'duel_game_model_predict_seconds_bucket{model="trained_model",le="+Inf"} 3' in text
+    assert 'duel_game_model_predict_seconds_count{model="trained_model"} 3' in text
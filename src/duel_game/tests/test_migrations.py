@@ -0,0 +1,104 @@
+import sqlite3
+
+import pytest
+
+from duel_game.dataset.dataset_repo import DatasetRepository, DATASET_MIGRATIONS
+from duel_game.dataset.generation import play_seeded_match
+from duel_game.dataset.migrations import Migration, Backfill, MigrationRunner, add_column_if_missing
+from duel_game.ml_model.model_repo import ModelRepository, MODEL_MIGRATIONS
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / 'migrations.db')
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value INTEGER)")
+    conn.executemany("INSERT INTO items (value) VALUES (?)", [(i,) for i in range(25)])
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _doubling_migration(fail_on_chunk=None):
+    chunks = []
+
+    def apply_chunk(conn, keys):
+        chunks.append(keys)
+        if len(chunks) == fail_on_chunk:
+            raise RuntimeError("interrupted")
+        conn.execute(
+            "UPDATE items SET doubled = value * 2 WHERE id IN (SELECT value FROM json_each(?))", (str(keys),)
+        )
+
+    migration = Migration(1, 'add doubled', apply=lambda conn: add_column_if_missing(conn, 'items', 'doubled', 'INTEGER'),
+                          backfill=Backfill(
+                              keys_sql="SELECT id FROM items WHERE id > :after ORDER BY id LIMIT :limit",
+                              count_sql="SELECT COUNT(*) FROM items WHERE id > :after",
+                              apply_chunk=apply_chunk
+                          ))
+    return migration, chunks
+
+
+def test_interrupted_backfill_resumes_after_the_last_committed_chunk(conn):
+    migration, chunks = _doubling_migration(fail_on_chunk=3)
+    with pytest.raises(RuntimeError):
+        MigrationRunner(conn, 'test', [migration]).migrate(chunk_rows=10)
+
+    # two chunks are committed, the version is not recorded yet
+    assert conn.execute("SELECT COUNT(*) FROM items WHERE doubled IS NOT NULL").fetchone()[0] == 20
+    assert MigrationRunner(conn, 'test', [migration]).current_version() == 0
+
+    migration, chunks = _doubling_migration()
+    reports = MigrationRunner(conn, 'test', [migration]).migrate(chunk_rows=10)
+
+    assert chunks == [list(range(21, 26))]
+    assert reports[0]['rows'] == 25
+    assert conn.execute("SELECT COUNT(*) FROM items WHERE doubled = value * 2").fetchone()[0] == 25
+    assert MigrationRunner(conn, 'test', [migration]).pending() == []
+    assert conn.execute("SELECT COUNT(*) FROM schema_backfill_progress").fetchone()[0] == 0
+
+
+def test_dry_run_estimates_without_changing_the_database(conn):
+    migration, chunks = _doubling_migration()
+    reports = MigrationRunner(conn, 'test', [migration]).migrate(chunk_rows=10, dry_run=True)
+
+    assert reports[0]['rows'] == 25 and reports[0]['estimated_seconds'] >= 0
+    assert chunks == [list(range(1, 11))]
+    assert 'doubled' not in {row[1] for row in conn.execute("PRAGMA table_info(items)")}
+    assert MigrationRunner(conn, 'test', [migration]).current_version() == 0
+
+
+def test_repositories_migrate_on_open_and_backfill_old_databases(tmp_path):
+    db_path = str(tmp_path / 'database.db')
+    with DatasetRepository(db_path, auto_migrate=False) as repo:
+        template_id = repo.create_config_template('{"test": true}', 1, 'test')
+        run_id = repo.create_run(template_id, 'old run', seed=1)
+        repo.store_samples(play_seeded_match('Balanced', 'Healer', 30, 3, 0).get_samples(), run_id)
+        expected = repo.get_sample_statistics(run_id)
+        # a database from before the summary tables
+        repo.conn.execute("DELETE FROM run_summary")
+        repo.conn.execute("DELETE FROM run_label_counts")
+        repo.conn.commit()
+
+    with DatasetRepository(db_path) as repo:
+        assert repo.get_sample_statistics(run_id) == expected
+        assert MigrationRunner(repo.conn, 'dataset', DATASET_MIGRATIONS).pending() == []
+
+    ModelRepository(db_path)
+    with sqlite3.connect(db_path) as conn:
+        assert MigrationRunner(conn, 'models', MODEL_MIGRATIONS).current_version() == MODEL_MIGRATIONS[-1].version
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_models_run_id'").fetchone()
+
+
+def test_run_sample_counts_seeded_by_create_run_are_recounted(tmp_path):
+    db_path = str(tmp_path / 'database.db')
+    samples = play_seeded_match('Balanced', 'Healer', 30, 3, 0).get_samples()
+    with DatasetRepository(db_path) as repo:
+        run_id = repo.create_run(repo.create_config_template('{"test": true}', 1, 'test'), 'old run', seed=1)
+        repo.store_samples(samples, run_id)
+        # a version 3 database, whose run was created with its expected count on top of the trigger counts
+        repo.conn.execute("UPDATE dataset_run SET sample_count = sample_count + ?", (len(samples),))
+        repo.conn.execute("DELETE FROM schema_version WHERE component = 'dataset' AND version = 4")
+        repo.conn.commit()
+
+    with DatasetRepository(db_path) as repo:
+        assert repo.get_run_info(run_id)['sample_count'] == len(samples)
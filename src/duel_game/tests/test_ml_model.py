@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from duel_game.core.essential_types import Action
+from duel_game.core.ml_model import ShadowScorer, TrainedModel
+from duel_game.dataset.generation import play_seeded_match
+from duel_game.ml_model.evaluation import load_default_model, play_model_match
+
+
+def _reference_predict(weights, features):
+    return Action(int(max(weights, key=lambda c: weights[c][0] + np.dot(features, weights[c][1:]))))
+
+
+def test_compiled_predictions_match_the_per_class_scores():
+    rng = np.random.default_rng(3)
+    weights = {str(action): rng.normal(size=25).tolist() for action in (1, 2, 3, 4)}
+    inputs = [sample.features for game in range(5)
+              for sample in play_seeded_match('Opportunist', 'Healer', 50, 9, game).get_samples()]
+
+    model = TrainedModel(weights)
+    assert [model.predict(features) for features in inputs] == [_reference_predict(weights, f) for f in inputs]
+    assert model.predict(None) in (Action.ATTACK, Action.DODGE, Action.DEFENSE)
+
+    with pytest.raises(AttributeError):
+        model.weights = {action: [-weight for weight in vector] for action, vector in weights.items()}
+
+
+def test_shadow_models_are_scored_without_changing_the_match():
+    rng = np.random.default_rng(5)
+    primary = load_default_model()
+    negated = TrainedModel({action: [-weight for weight in vector] for action, vector in primary.weights.items()})
+    # a different class order and a random model, stacked into the same matmul
+    reordered = TrainedModel({action: primary.weights[action] for action in reversed(list(primary.weights))})
+    noise = TrainedModel({action: rng.normal(size=25).tolist() for action in primary.weights})
+
+    shadow = ShadowScorer([reordered, negated, noise], labels=['reordered', 'negated', 'noise'])
+    for game in range(10):
+        assert play_model_match(primary, 'Balanced', 50, 8, game, shadow=shadow) == \
+            play_model_match(primary, 'Balanced', 50, 8, game)
+
+    assert shadow.turns == len(shadow.records) > 0
+    assert all(record.shadows[0] == record.primary for record in shadow.records)
+    stats = shadow.stats()
+    assert stats['reordered']['agreement'] == 1.0
+    assert stats['negated']['agreement'] < 0.5
+    assert sum(stats['noise'][f'predicted_{action.name.lower()}'] for action in Action) == shadow.turns
+
+    # a new primary model (a ModelProvider swap) restacks the matrix
+    features = play_seeded_match('Opportunist', 'Healer', 50, 9, 0).get_samples()[-1].features
+    assert shadow.predict(negated, features, 99) == negated.predict(features)
+    assert shadow.records[-1].shadows[1] == negated.predict(features)
+
+    # several reloads between two predictions, each replaced model is freed and its ids reused
+    weight_sets = [primary.weights, negated.weights]
+    assert primary.predict(features) != negated.predict(features)
+    reloaded = TrainedModel(weight_sets[0])
+    shadow.predict(reloaded, features, 100)
+    for version in range(1, 4):
+        del reloaded
+        reloaded = TrainedModel(weight_sets[version % 2])
+    assert shadow.predict(reloaded, features, 101) == reloaded.predict(features)
@@ -0,0 +1,80 @@
+import json
+import os
+import time
+
+import pytest
+
+from duel_game.core.helpers import get_base_path
+from duel_game.dataset.dataset_repo import DatasetRepository
+from duel_game.ml_model.evaluation import play_model_match
+from duel_game.ml_model.model_provider import ArtifactModelProvider, RegistryModelProvider
+from duel_game.ml_model.model_repo import ModelRepository
+
+
+def _default_artifact():
+    with open(get_base_path() / 'default_model.json', encoding='utf-8') as json_file:
+        return json.load(json_file)
+
+
+def _negated(weights):
+    return {action: [-weight for weight in vector] for action, vector in weights.items()}
+
+
+def _replace(path, content, mtime_ns):
+    # written aside and renamed into place, as a deployment would
+    with open(str(path) + '.tmp', 'w', encoding='utf-8') as file:
+        file.write(content)
+    os.utime(str(path) + '.tmp', ns=(mtime_ns, mtime_ns))
+    os.replace(str(path) + '.tmp', path)
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "provider thread did not pick up the change"
+        time.sleep(0.01)
+
+
+def test_artifact_changes_are_swapped_in_and_broken_artifacts_are_skipped(tmp_path):
+    artifact = _default_artifact()
+    path = tmp_path / 'model.json'
+    _replace(path, json.dumps(artifact), 1_000_000_000)
+
+    with ArtifactModelProvider(str(path), poll_interval=0.01) as provider:
+        first = provider.current()
+        assert first.version == 1 and first.source == 'model.json@1000000000'
+        # a provider plays exactly like the model it serves
+        assert play_model_match(provider, 'Healer', 50, 3, 0) == play_model_match(first.model, 'Healer', 50, 3, 0)
+
+        _replace(path, '{"weights": {"1": [0.5', 2_000_000_000)
+        _wait_for(lambda: provider.failed_reloads > 0)
+        assert provider.current() is first
+
+        _replace(path, json.dumps({**artifact, 'weights': _negated(artifact['weights'])}), 3_000_000_000)
+        _wait_for(lambda: provider.current().version == 2)
+
+    assert provider.thread is None and provider.reloads == 1
+    assert provider.current().model.weights == _negated(first.model.weights)
+    assert isinstance(provider.last_error, ValueError)
+
+
+def test_registry_provider_serves_the_newest_model(tmp_path):
+    db_path = str(tmp_path / 'database.db')
+    with DatasetRepository(db_path) as repo:
+        run_id = repo.create_run(repo.create_config_template('{"test": true}', 1, 'test'), 'run', seed=1)
+
+    models = ModelRepository(db_path)
+    with pytest.raises(ValueError):
+        RegistryModelProvider(db_path)
+
+    weights = _default_artifact()['weights']
+    first_id = models.save_model(run_id, weights, 0.5)
+    provider = RegistryModelProvider(db_path)
+    assert provider.current().source == f'models:{first_id}'
+    assert provider.refresh() is False
+
+    second_id = models.save_model(run_id, _negated(weights), 0.5)
+    assert provider.refresh() is True
+    handle = provider.current()
+    assert (handle.version, handle.source) == (2, f'models:{second_id}')
+    assert RegistryModelProvider(db_path, run_id=run_id).current().source == f'models:{second_id}'
@@ -0,0 +1,94 @@
+import io
+import random
+
+import pytest
+
+from duel_game.core.essential_types import Action, GameState, PlayerState
+from duel_game.core.helpers import get_base_path
+from duel_game.core.input_source import (PolicyInput, RecordingInput, ScriptedInput, ScriptExhausted,
+                                         feasible_actions)
+from duel_game.core.messages import CATALOGS, MESSAGES, OUTCOMES
+from duel_game.core.presenter import Presenter
+from duel_game.main import play_sessions
+from duel_game.ml_model.model_provider import ArtifactModelProvider
+
+
+@pytest.fixture(scope='module')
+def model_provider():
+    return ArtifactModelProvider(str(get_base_path() / 'default_model.json'))
+
+
+def test_a_policy_plays_a_full_session_through_the_menus(model_provider):
+    rng = random.Random(3)
+    menus = ScriptedInput([
+        'x',        # invalid menu choice
+        '3', '2',   # switch to Finglish
+        '2',        # help (Enter is pressed by the policy)
+        '3', '1',   # back to English
+        '1',        # play a game
+        '4',        # exit
+    ])
+    output = io.StringIO()
+    play_sessions(model_provider, PolicyInput(lambda state: rng.choice(feasible_actions(state)), menus),
+                  output, delays=False)
+
+    transcript = output.getvalue()
+    assert menus.lines_read == 8
+    assert 'Invalid Choice' in transcript
+    assert 'Zaboon be Farsi tanzim shod' in transcript and 'Nahoeye baazi' in transcript
+    assert 'Language set to English' in transcript
+    assert 'What is your Action?\t' in transcript and 'Was a Good Game, GG...' in transcript
+
+
+def test_recorded_decisions_replay_the_same_session(model_provider, tmp_path):
+    script_path = tmp_path / 'session.txt'
+    first = io.StringIO()
+    with open(script_path, 'w', encoding='utf-8') as record:
+        record.write('# help, then Finglish, then exit\n')
+        play_sessions(model_provider, RecordingInput(ScriptedInput(['2', '', '3', '2', '4']), record), first,
+                      delays=False)
+    assert script_path.read_text(encoding='utf-8').splitlines()[1:] == ['2', '', '3', '2', '4']
+
+    replayed = io.StringIO()
+    play_sessions(model_provider, ScriptedInput.from_file(str(script_path)), replayed, delays=False)
+    assert replayed.getvalue() == first.getvalue()
+
+    with pytest.raises(ScriptExhausted):
+        play_sessions(model_provider, ScriptedInput(['2']), io.StringIO(), delays=False)
+
+
+class _CountingOutput(io.StringIO):
+    writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def test_every_outcome_is_narrated_in_every_language():
+    assert MESSAGES['en'].keys() == MESSAGES['fa'].keys()
+    assert OUTCOMES['en'].keys() == OUTCOMES['fa'].keys()
+    for catalog in CATALOGS.values():
+        for player_action in Action:
+            for ai_action in Action:
+                dodges = (True, False) if {player_action, ai_action} == {Action.ATTACK, Action.DODGE} else (None,)
+                for dodge in dodges:
+                    assert catalog.outcomes[(player_action, ai_action, dodge)].startswith(
+                        f'\n{catalog.text["action_summary"].split(":")[0]}: {player_action.name}')
+
+
+def test_a_turn_is_rendered_with_one_write_per_frame():
+    output = _CountingOutput()
+    presenter = Presenter('fa', ScriptedInput(['4', '1', '']), output, delays=False)
+    state = GameState(3, PlayerState(100, 70, False, 2, None), PlayerState(80, 40, True, 0, None))
+
+    assert presenter.on_turn_start(state) == Action.ATTACK
+    assert output.writes == 1
+    transcript = output.getvalue()
+    assert 'Nobat 3' in transcript and 'Salaamat kaamel ast' in transcript
+    assert 'Separ dar dastres nist, 2 nobat baagimaandeh' in transcript
+
+    presenter.after_decisions(Action.DODGE, Action.ATTACK, {'is_dodge_works': True}, {})
+    presenter.after_turn(2, False, None)
+    assert output.writes == 3
+    assert 'Aafarin.' in output.getvalue()
@@ -0,0 +1,57 @@
+import pytest
+
+from duel_game.ml_model.evaluation import evaluate_candidate, load_default_model
+from duel_game.ml_model.ratings import RatingLedger, glicko2_update, policy_key, policy_params, INITIAL_DEVIATION
+
+
+def test_glicko2_matches_the_reference_example():
+    # worked example from Glickman's "Example of the Glicko-2 system"
+    rating, deviation, volatility = glicko2_update(
+        1500, 200, 0.06, [1400, 1550, 1700], [30, 100, 300], [1, 0, 0], tau=0.5
+    )
+    assert rating == pytest.approx(1464.06, abs=0.01)
+    assert deviation == pytest.approx(151.52, abs=0.01)
+    assert volatility == pytest.approx(0.05999, abs=1e-5)
+
+    # aggregated games against one opponent rate like the individual games
+    assert glicko2_update(1500, 200, 0.06, [1400], [30], [2], [3]) == \
+        pytest.approx(glicko2_update(1500, 200, 0.06, [1400] * 3, [30] * 3, [1, 1, 0]))
+
+
+def test_policy_keys_follow_the_knob_values():
+    params = policy_params('RandomBiased')
+    assert set(params) == {'RANDOM_BIASED_W_ATTACK', 'RANDOM_BIASED_W_DEFENSE', 'RANDOM_BIASED_W_DODGE', 'RANDOM_BIASED_W_HEAL'}
+    assert policy_key('RandomBiased') == policy_key('RandomBiased', params)
+    assert policy_key('RandomBiased', {**params, 'RANDOM_BIASED_W_HEAL': 0.4}) != policy_key('RandomBiased', params)
+
+
+def test_ledger_rates_periods_and_schedules_the_least_certain_players(tmp_path):
+    model = load_default_model()
+    report = evaluate_candidate(model, model, run_seed=2, opponents=['Aggressive', 'Healer'], max_games=40)
+
+    with RatingLedger(str(tmp_path / 'ratings.db')) as ledger:
+        candidate = ledger.register_model(2)
+        baseline = ledger.register_model(1)
+        idle = ledger.register_policy('Balanced')
+
+        assert ledger.record_evaluation(report, candidate, baseline) == 160
+        assert ledger.pending_games() == 160
+        assert ledger.close_period() == {'period': 1, 'outcomes': 4, 'games': 160, 'players': 5}
+        assert ledger.pending_games() == 0
+
+        # the same games give the same ratings
+        assert ledger.get_rating(candidate)['rating'] == pytest.approx(ledger.get_rating(baseline)['rating'])
+        assert ledger.get_rating(candidate)['deviation'] < INITIAL_DEVIATION
+        assert ledger.get_rating(policy_key('Healer'))['games'] == 80
+        assert ledger.get_rating(idle)['deviation'] == INITIAL_DEVIATION
+        assert ledger.get_rating(idle)['params'] == policy_params('Balanced')
+
+        schedule = ledger.schedule_matches(6)
+        assert len(schedule) == 6
+        # the unrated policy is the most informative to play, and models never meet each other
+        assert idle in schedule[0]
+        assert all(not (a.startswith('model:') and b.startswith('model:')) for a, b in schedule)
+        assert all(not a.startswith('model:') for a, _ in schedule)
+
+        with pytest.raises(ValueError):
+            ledger.record_outcomes([(candidate, idle, 3, 2)])
@@ -0,0 +1,54 @@
+import numpy as np
+
+from duel_game.core.replay import ReplayReader, ReplayWriter, rebuild_index, REPLAY_MAGIC
+from duel_game.dataset.generation import Pairing, iter_pairing_games, play_seeded_match
+
+
+def test_recorded_matches_read_back_with_random_access(tmp_path):
+    path = tmp_path / 'replays.dgr'
+    pairing = Pairing(2, 'Aggressive', 'Healer', 200)
+
+    # a small buffer so the log is flushed in the middle of the run
+    with ReplayWriter(path, buffer_bytes=64) as writer:
+        games = list(iter_pairing_games(pairing, 30, 11, writer))
+
+    with ReplayReader(path) as replays:
+        assert len(replays) == len(games)
+
+        for game_index in (len(games) - 1, 0, 3):
+            replay = replays[game_index]
+            samples = games[game_index]
+            assert replay.run_seed == 11 and replay.match_key == (2, game_index)
+            assert replay.player_labels == ('Aggressive', 'Healer')
+            assert replay.rules.attack_damage == 20 and replay.rules.dodge_probability == 0.5
+            # one sample per turn, labelled with player 1's action
+            assert replay.turns == len(samples)
+            assert replay.player_1_actions.tolist() == [int(sample.label) for sample in samples]
+
+        assert sum(replay.turns for replay in replays) == sum(len(samples) for samples in games)
+        # a few bytes per turn
+        assert path.stat().st_size < 64 * len(games) + 2 * sum(len(samples) for samples in games)
+
+
+def test_appending_reopened_logs_and_rebuilding_a_lost_index(tmp_path):
+    path = tmp_path / 'replays.dgr'
+    with ReplayWriter(path) as writer:
+        play_seeded_match('Balanced', 'Opportunist', 40, 5, 0, replay_writer=writer)
+    with ReplayWriter(path) as writer:
+        tracker = play_seeded_match('Defensive', 'RandomBiased', 40, 5, 1, replay_writer=writer)
+
+    assert path.read_bytes().count(REPLAY_MAGIC) == 1
+    with ReplayReader(path) as replays:
+        expected = [replay.codes for replay in replays]
+        assert replays[1].player_2_actions.tolist() == [int(state.player_2.action_in_turn) for state in tracker.records]
+
+    (tmp_path / 'replays.dgr.idx').unlink()
+    # a record cut short by a crash is left out of the index
+    with open(path, 'ab') as log:
+        log.write(b'\x40\x00\x00\x00truncated')
+    assert rebuild_index(path) == 2
+
+    with ReplayReader(path) as replays:
+        assert all(np.array_equal(replay.codes, codes) for replay, codes in zip(replays, expected))
+        winners = {replay.winner for replay in replays}
+        assert winners <= {0, 1, 2}
@@ -217,3 +217,41 @@ def test_can_attack_can_heal_can_dodge_thresholds(mock_game_obj):
 #     # should be in [0,1] and non-zero
 #     assert 0.0 <= val <= 1.0
 #     assert val > 0.0
+
+
+def test_attack_likelihood_is_shared_within_a_turn():
+    from duel_game.core.helpers import compute_imminent_attack_likely, estimate_attack_likelihood
+    from duel_game.dataset.generation import play_seeded_match
+
+    tracker = play_seeded_match('Aggressive', 'Defensive', 20, 3, 0)
+    game = tracker.game_ref
+    # decision phase of the next turn
+    game.turn += 1
+    player = game.player_1
+    enemy_actions = [record.player_2.action_in_turn for record in tracker.records[-5:]]
+
+    expected = estimate_attack_likelihood(
+        enemy_actions.count(Action.ATTACK), 5,
+        player.opponent.stamina, player.opponent.health,
+        player.health, player.is_shield_available, player.opponent.action_in_turn
+    )
+
+    with patch('duel_game.dataset.data_processor.estimate_attack_likelihood', wraps=estimate_attack_likelihood) as estimate:
+        assert compute_imminent_attack_likely(player, 5) == pytest.approx(expected)
+        assert compute_imminent_attack_likely(player, 5.0) == pytest.approx(expected)
+        assert estimate.call_count == 1
+
+        compute_imminent_attack_likely(game.player_2, 5)
+        compute_imminent_attack_likely(player, 3)
+        assert estimate.call_count == 3
+
+
+def test_attack_likelihood_cache_is_reset_by_new_records():
+    from duel_game.dataset.generation import play_seeded_match
+
+    tracker = play_seeded_match('Aggressive', 'Aggressive', 20, 3, 0)
+    tracker.attack_likelihood(tracker.game_ref.player_1, 5)
+    assert tracker._threat_cache
+
+    tracker.record(make_gs(turn=tracker.game_ref.turn, p1_action=Action.DODGE, p2_action=Action.ATTACK))
+    assert list(tracker._threat_cache) == [(tracker.game_ref.turn, 1, tracker.HISTORY_LEN)]